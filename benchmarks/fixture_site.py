@@ -0,0 +1,99 @@
+"""Generierte Test-Website für Benchmarks, ausgeliefert von einem lokalen HTTP-Server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class FixtureSite:
+    """
+    Erzeugt `pages` Seiten mit je `links_per_page` internen Links und etwa
+    `dom_kb` Kilobyte HTML (Header/Nav, Formular, Tabelle mit Füllzeilen,
+    Skripte und Styles) und liefert sie auf 127.0.0.1 aus.
+
+    Inhalte sind deterministisch: gleiche Parameter ergeben dieselbe Site.
+    """
+
+    def __init__(self, pages: int = 20, links_per_page: int = 5, dom_kb: int = 50):
+        self.pages = max(1, pages)
+        self.links_per_page = links_per_page
+        self.dom_kb = dom_kb
+        self.html: Dict[str, str] = {self.path(i): self._render(i) for i in range(self.pages)}
+        self.requests = 0
+
+        self._server: ThreadingHTTPServer = None
+        self._thread: threading.Thread = None
+
+    @staticmethod
+    def path(index: int) -> str:
+        return "/" if index == 0 else f"/page-{index}"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureSite":
+        """Startet den Server auf einem freien Port (Hintergrund-Thread)."""
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests += 1
+                body = site.html.get(self.path.split("?")[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _render(self, index: int) -> str:
+        links = "\n".join(
+            f'<a id="nav-{n}" href="{self.path((index + n) % self.pages)}">Page {(index + n) % self.pages}</a>'
+            for n in range(1, self.links_per_page + 1)
+        )
+        head = f"""<!DOCTYPE html>
+<html><head><title>Fixture page {index}</title>
+<style>body {{ font-family: sans-serif; }} .row {{ padding: 2px; }}</style>
+<script>window.analytics = {{ page: {index} }};</script>
+</head><body>
+<header><a id="home" href="/">Home</a><nav>{links}</nav></header>
+<main>
+<h1>Fixture page {index}</h1>
+<form id="form-{index}" action="/submit" method="post">
+  <label for="email-{index}">Email</label><input id="email-{index}" name="email" type="email" placeholder="you@example.com">
+  <label for="query-{index}">Search</label><input id="query-{index}" name="q" type="search">
+  <select id="sort-{index}" name="sort"><option>Newest</option><option>Oldest</option></select>
+  <button id="submit-{index}" type="submit">Send</button>
+</form>
+<table id="data-{index}"><tbody>
+"""
+        tail = f"""</tbody></table>
+</main>
+<footer><a id="imprint" href="/">Imprint</a></footer>
+</body></html>"""
+        # Tabellenzeilen füllen bis zur gewünschten Größe (wird im DOM-Reducer zusammengefasst)
+        rows, size, row = [], len(head) + len(tail), 0
+        while size < self.dom_kb * 1024:
+            line = f'<tr class="row"><td>Item {row}</td><td>{"lorem ipsum " * 4}</td><td><a href="#row-{row}">Details</a></td></tr>\n'
+            rows.append(line)
+            size += len(line)
+            row += 1
+        return head + "".join(rows) + tail
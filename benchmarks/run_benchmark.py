@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Offline-Benchmark für AndisMCP.
+
+Startet eine generierte Fixture-Site auf 127.0.0.1, ersetzt das LLM durch einen
+deterministischen Stub mit einstellbarer Latenz und misst die komplette Pipeline
+(kalt und inkrementell) sowie jedes Tool einzeln. Ausgabe als JSON:
+Zeit pro Schritt, Seiten/Minute, Peak-RSS und Browser-Starts.
+
+Beispiel:
+    python benchmarks/run_benchmark.py --pages 20 --llm-latency 0.2 --output bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixture_site import FixtureSite
+
+from src.core.browser_pool import BrowserPool
+from src.core.capture_cache import CaptureCache
+from src.core.config import TestGenerationConfig
+from src.core.manifest import RunManifest
+from src.core.pipeline import PlaywrightPipeline
+from src.core.stub_llm import StubLLM
+from src.tools.crawl_links import crawl_links
+from src.tools.scan_site import scan_site
+from src.tools.extract_model import aextract_model
+from src.tools.generate_pom import agenerate_pom
+from src.tools.generate_tests_ts import generate_tests_ts
+from src.tools.verify_pom import verify_poms
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmark with a local fixture site and a stub LLM")
+    parser.add_argument("--pages", type=int, default=20, help="Pages of the fixture site")
+    parser.add_argument("--links-per-page", type=int, default=5, help="Internal links per page")
+    parser.add_argument("--dom-kb", type=int, default=50, help="Approximate HTML size per page in KB")
+    parser.add_argument("--max-pages", type=int, default=0, help="Pages processed by the pipeline (0 = all)")
+    parser.add_argument("--crawl-depth", type=int, default=2, help="Crawl depth of the pipeline")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM latency per call in seconds")
+    parser.add_argument("--llm-latency-per-1k", type=float, default=0.0, help="Additional stub latency per 1000 prompt chars")
+    parser.add_argument("--sequential", action="store_true", help="Disable concurrent page processing")
+    parser.add_argument("--typecheck", action="store_true", help="Run tsc on the generated specs (needs tsc on PATH)")
+    parser.add_argument("--skip-tools", action="store_true", help="Only benchmark the pipeline")
+    parser.add_argument("--workdir", help="Directory for out/ and caches (default: fresh temp dir)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def peak_rss_mb() -> dict:
+    """Peak-RSS des Prozesses und der beendeten Kindprozesse (z.B. Chromium) in MB (Linux: ru_maxrss in KB)."""
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def stage_seconds(marks: list, end: float) -> dict:
+    """Dauer pro Schritt aus den Fortschrittsmeldungen (Beginn eines Schritts bis Beginn des nächsten)."""
+    starts = []
+    for at, stage in marks:
+        if not starts or starts[-1][1] != stage:
+            starts.append((at, stage))
+    durations = {}
+    for i, (at, stage) in enumerate(starts):
+        if stage in ("done", "cancelled"):
+            continue
+        until = starts[i + 1][0] if i + 1 < len(starts) else end
+        durations[stage] = round(durations.get(stage, 0.0) + until - at, 3)
+    return durations
+
+
+async def bench_pipeline(site: FixtureSite, args: argparse.Namespace, llm: StubLLM, force: bool) -> dict:
+    """Ein kompletter Pipeline-Lauf mit frischem Browser-Pool."""
+    config = TestGenerationConfig(
+        use_llm_cache=False,
+        open_ui=False,
+        typecheck_tests=args.typecheck,
+        tsconfig_path=str(ROOT / "tsconfig.json"),
+        concurrent_pages=not args.sequential,
+        crawl_depth=args.crawl_depth,
+    )
+    pool = BrowserPool()
+    pipeline = PlaywrightPipeline(
+        config, browser_pool=pool, capture_cache=CaptureCache(), manifest=RunManifest(), llm=llm,
+    )
+    calls_before = sum(llm.calls.values())
+    marks = []
+
+    async def progress(done, total, message):
+        marks.append((time.perf_counter(), message.split(":", 1)[0]))
+
+    start = time.perf_counter()
+    try:
+        result = await pipeline.execute(site.base_url, args.max_pages or site.pages, progress=progress, force=force)
+    finally:
+        end = time.perf_counter()
+        browser = pool.stats()
+        await pool.close()
+
+    seconds = end - start
+    return {
+        "seconds": round(seconds, 3),
+        "stages": stage_seconds(marks, end),
+        "pages": len(result.jobs),
+        "processed": result.total_processed,
+        "reused": result.total_reused,
+        "errors": result.total_errors,
+        "pages_per_minute": round(result.total_processed / seconds * 60, 2) if seconds else 0.0,
+        "llm_calls": sum(llm.calls.values()) - calls_before,
+        "browser_launches": browser["browser_launches"],
+        "browser": browser,
+        # Nur die erste Zeile (Playwright hängt lange Hinweise an)
+        "run_errors": [e.splitlines()[0][:200] for e in result.errors[:5] + [e for j in result.jobs.values() for e in j.errors][:5]],
+    }
+
+
+async def timed(results: dict, name: str, work):
+    """Misst ein einzelnes Tool; Fehler landen im Bericht statt den Benchmark abzubrechen."""
+    start = time.perf_counter()
+    try:
+        value = await work
+        results[name] = {"seconds": round(time.perf_counter() - start, 3)}
+        return value
+    except Exception as e:
+        results[name] = {"seconds": round(time.perf_counter() - start, 3), "error": (str(e).splitlines() or [""])[0][:200]}
+        return None
+
+
+async def bench_tools(site: FixtureSite, args: argparse.Namespace, llm: StubLLM) -> dict:
+    """Jedes Tool einzeln gegen die erste Fixture-Seite (bzw. die ganze Site beim Crawl)."""
+    results: dict = {}
+    pool = BrowserPool()
+    cache = CaptureCache(directory="out/.cache/bench-tools")
+    url = site.base_url + "/"
+    try:
+        await timed(results, "crawl_links", crawl_links(site.base_url, pool=pool, max_depth=args.crawl_depth))
+        capture = await timed(results, "scan_site_cold", scan_site(url, pool=pool, cache=cache))
+        await timed(results, "scan_site_warm", scan_site(url, pool=pool, cache=cache))
+
+        # Ohne Browser direkt mit dem HTML der Fixture weitermachen
+        dom = (capture or {}).get("dom") or site.html["/"]
+        model = await timed(results, "extract_model", aextract_model(url, dom, llm=llm, use_cache=False))
+        model = model or {"url": url, "elements": []}
+        pom_path = await timed(results, "generate_pom", agenerate_pom("BenchPage", model, llm=llm, use_cache=False))
+        if pom_path:
+            await timed(results, "generate_tests_ts", generate_tests_ts(
+                pom_path, llm=llm, pool=pool, cache=cache, use_cache=False,
+            ))
+            await timed(results, "verify_pom", asyncio.to_thread(verify_poms, [pom_path]))
+        results["extract_model"]["dom_stats"] = model.get("dom_stats")
+    finally:
+        results["browser_launches"] = pool.stats()["browser_launches"]
+        await pool.close()
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict:
+    site = FixtureSite(args.pages, args.links_per_page, args.dom_kb).start()
+    llm = StubLLM(args.llm_latency, args.llm_latency_per_1k)
+    try:
+        report = {
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "workdir")},
+            "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            # Kalter Lauf (alles neu) und inkrementeller Lauf (unveränderte Seiten aus dem Manifest)
+            "pipeline_cold": await bench_pipeline(site, args, llm, force=True),
+            "pipeline_warm": await bench_pipeline(site, args, llm, force=False),
+        }
+        if not args.skip_tools:
+            report["tools"] = await bench_tools(site, args, llm)
+        report["llm"] = llm.stats()
+        report["fixture_requests"] = site.requests
+        report["peak_rss_mb"] = peak_rss_mb()
+        return report
+    finally:
+        site.stop()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    output = Path(args.output).resolve() if args.output else None
+    # Eigenes Arbeitsverzeichnis, damit out/ und Caches des Projekts unberührt bleiben
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="andismcp-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+
+    # Log-Ausgaben der Pipeline nach stderr, stdout bleibt reines JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report = asyncio.run(run(args))
+    report["workdir"] = str(workdir)
+    text = json.dumps(report, indent=2)
+    if output:
+        output.write_text(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Geteilter Chromium-Pool für alle Playwright-basierten Tools."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+
+class BrowserPool:
+    """
+    Langlebiger Headless-Chromium, der isolierte BrowserContexts verleiht.
+
+    - Der Browser wird beim ersten Lease gestartet und bleibt bis close() offen
+    - Jeder Lease bekommt exklusiv einen Context und darin eine neue Page
+    - Nach `pages_per_context` Seiten wird ein Context geschlossen und ersetzt
+    - Maximal `max_contexts` Leases laufen gleichzeitig
+    """
+
+    def __init__(self, max_contexts: int = 4, pages_per_context: int = 20, headless: bool = True):
+        """Initialisiere den Pool (der Browser startet erst beim ersten Lease)."""
+        self.max_contexts = max_contexts
+        self.pages_per_context = pages_per_context
+        self.headless = headless
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: List[Tuple[BrowserContext, int]] = []  # (Context, bisher genutzte Seiten)
+        self._active = 0
+
+        # Statistiken über Starts und Leases
+        self._launches = 0
+        self._launch_seconds = 0.0
+        self._last_launch_seconds = 0.0
+        self._contexts_created = 0
+        self._contexts_recycled = 0
+        self._leases = 0
+        self._lease_wait_total = 0.0
+        self._lease_wait_max = 0.0
+
+    async def _ensure_started(self) -> None:
+        """Startet Playwright und Chromium, falls noch nicht (oder nicht mehr) verbunden."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Neuer Event-Loop (z.B. erneutes asyncio.run): alte Objekte sind dort nicht nutzbar
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+            self._playwright = None
+            self._browser = None
+            self._idle = []
+            self._active = 0
+
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+
+            start = time.perf_counter()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._idle = []
+
+            self._last_launch_seconds = time.perf_counter() - start
+            self._launch_seconds += self._last_launch_seconds
+            self._launches += 1
+
+    async def _checkout(self) -> Tuple[BrowserContext, int]:
+        """Holt einen freien Context oder erstellt einen neuen."""
+        while self._idle:
+            context, used = self._idle.pop()
+            if self._browser is not None and self._browser.is_connected():
+                return context, used
+        context = await self._browser.new_context()
+        self._contexts_created += 1
+        return context, 0
+
+    async def _checkin(self, context: BrowserContext, used: int) -> None:
+        """Gibt einen Context zurück oder recycelt ihn nach zu vielen Seiten."""
+        if used >= self.pages_per_context or not self._browser or not self._browser.is_connected():
+            self._contexts_recycled += 1
+            try:
+                await context.close()
+            except Exception:
+                pass
+            return
+
+        try:
+            # Cookies nicht zwischen Leases weitergeben
+            await context.clear_cookies()
+            self._idle.append((context, used))
+        except Exception:
+            self._contexts_recycled += 1
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """
+        Verleiht eine neue Page in einem exklusiven Context.
+
+        Beispiel:
+            async with pool.page() as page:
+                await page.goto(url)
+        """
+        await self._ensure_started()
+
+        wait_start = time.perf_counter()
+        async with self._semaphore:
+            context, used = await self._checkout()
+            waited = time.perf_counter() - wait_start
+            self._leases += 1
+            self._lease_wait_total += waited
+            self._lease_wait_max = max(self._lease_wait_max, waited)
+
+            self._active += 1
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                self._active -= 1
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+                await self._checkin(context, used + 1)
+
+    def stats(self) -> dict:
+        """Gibt Pool-Größe sowie Start- und Lease-Latenzen zurück."""
+        return {
+            "browser_running": bool(self._browser and self._browser.is_connected()),
+            "max_contexts": self.max_contexts,
+            "pool_size": self._active + len(self._idle),
+            "active_contexts": self._active,
+            "idle_contexts": len(self._idle),
+            "browser_launches": self._launches,
+            "launch_seconds_total": round(self._launch_seconds, 3),
+            "last_launch_seconds": round(self._last_launch_seconds, 3),
+            "contexts_created": self._contexts_created,
+            "contexts_recycled": self._contexts_recycled,
+            "leases": self._leases,
+            "lease_wait_avg_ms": round(self._lease_wait_total / self._leases * 1000, 2) if self._leases else 0.0,
+            "lease_wait_max_ms": round(self._lease_wait_max * 1000, 2),
+        }
+
+    async def close(self) -> None:
+        """Schließt alle Contexts, den Browser und den Playwright-Treiber."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for context, _ in self._idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._idle = []
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+# Prozessweiter Standard-Pool für Tools, die ohne eigenen Pool aufgerufen werden
+_default_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Gibt den prozessweiten Standard-Pool zurück (wird bei Bedarf erstellt)."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BrowserPool()
+    return _default_pool
@@ -0,0 +1,231 @@
+"""Persistenter Cache für Seiten-Captures (DOM, Accessibility-Snapshot, Rollen-Listen)."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.core.crawler import canonicalize_url
+
+
+class CaptureCache:
+    """
+    On-Disk-Cache für Seiten-Captures, Schlüssel ist die kanonische URL.
+
+    - Ein Eintrag pro Seite (und Lade-Variante) als gzip-JSON unter `directory`
+    - Einträge älter als `ttl_seconds` gelten als abgelaufen (0 = nie)
+    - Überschreitet der Cache `max_bytes`, werden die am längsten nicht
+      genutzten Einträge gelöscht (LRU über die mtime der Dateien)
+    - Gleichzeitige Anfragen für dieselbe URL teilen sich eine Navigation
+    - Lesen und Schreiben (gzip, JSON, Dateizugriffe) laufen in get_or_capture
+      im Worker-Thread, damit der Event-Loop nicht blockiert
+    """
+
+    def __init__(self, directory: str = "out/.cache/captures", ttl_seconds: float = 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """Initialisiere den Cache (das Verzeichnis wird beim ersten Schreiben angelegt)."""
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}   # Wartende Aufrufer pro laufender Navigation
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.RLock()   # Dateien und _total_bytes (Zugriffe aus Worker-Threads)
+
+        # Zähler
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(url: str, variant: str = "") -> str:
+        """Berechnet den Cache-Schlüssel aus der kanonischen URL (und optional der Lade-Variante)."""
+        canonical = canonicalize_url(url) or url
+        if variant:
+            canonical = f"{canonical}\x00{variant}"
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json.gz"
+
+    def _current_bytes(self) -> int:
+        """Gesamtgröße des Caches (wird beim ersten Zugriff einmal ermittelt)."""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(f.stat().st_size for f in self.directory.glob("*.json.gz")) \
+                    if self.directory.exists() else 0
+            return self._total_bytes
+
+    def _remove(self, path: Path) -> None:
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                self._total_bytes = self._current_bytes() - size
+            except FileNotFoundError:
+                pass
+
+    def get(self, url: str, variant: str = "") -> Optional[Dict[str, Any]]:
+        """Liest einen gültigen Capture von der Platte (ohne Hit/Miss-Zähler zu verändern)."""
+        capture, expired = self._load(self.key_for(url, variant))
+        self.expired += expired
+        return capture
+
+    def put(self, url: str, capture: Dict[str, Any], variant: str = "") -> None:
+        """Schreibt einen Capture atomar auf die Platte und räumt bei Bedarf auf."""
+        self.evictions += self._store(self.key_for(url, variant), url, capture)
+
+    def _load(self, key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Liest und entpackt einen Eintrag (threadsicher, Zähler bleiben beim Aufrufer).
+
+        Returns:
+            (Capture oder None, True wenn der Eintrag abgelaufen war)
+        """
+        path = self._path(key)
+        try:
+            entry = json.loads(gzip.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            return None, False
+        except Exception:
+            # Kaputte Datei wie einen Miss behandeln
+            self._remove(path)
+            return None, False
+
+        if self.ttl_seconds and time.time() - entry.get("captured_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None, True
+
+        # Zugriffszeit für die LRU-Reihenfolge aktualisieren
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry["capture"], False
+
+    def _store(self, key: str, url: str, capture: Dict[str, Any]) -> int:
+        """Schreibt einen Eintrag (threadsicher) und gibt die Anzahl verdrängter Einträge zurück."""
+        data = gzip.compress(json.dumps({
+            "url": url,
+            "captured_at": time.time(),
+            "capture": capture,
+        }).encode("utf-8"))
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            current = self._current_bytes()
+            if path.exists():
+                current -= path.stat().st_size
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self._total_bytes = current + len(data)
+
+            if self._total_bytes > self.max_bytes:
+                return self._evict()
+        return 0
+
+    def _evict(self) -> int:
+        """Löscht die ältesten Einträge bis der Cache unter 90% von max_bytes liegt."""
+        evicted = 0
+        with self._lock:
+            files = sorted(self.directory.glob("*.json.gz"), key=lambda f: f.stat().st_mtime)
+            for file in files:
+                if self._current_bytes() <= self.max_bytes * 0.9:
+                    break
+                self._remove(file)
+                evicted += 1
+        return evicted
+
+    async def get_or_capture(self, url: str, capture: Callable[[], Awaitable[Dict[str, Any]]],
+                             refresh: bool = False, variant: str = "") -> Dict[str, Any]:
+        """
+        Liefert den Capture aus dem Cache oder erstellt ihn über `capture()`.
+
+        Args:
+            url: Seiten-URL
+            capture: Coroutine-Factory, die die Seite tatsächlich lädt
+            refresh: Cache ignorieren und neu laden (Ergebnis wird trotzdem gespeichert)
+            variant: Lade-Variante (z.B. Lade-Profil), Captures verschiedener Varianten sind getrennt
+        """
+        key = self.key_for(url, variant)
+        task = self._inflight.get(key)
+        if task is not None:
+            # Dieselbe Seite wird gerade schon geladen
+            self.hits += 1
+            return await self._wait(task)
+
+        if not refresh:
+            cached, expired = await asyncio.to_thread(self._load, key)
+            self.expired += expired
+            if cached is not None:
+                self.hits += 1
+                return cached
+            # Während des Lesens kann eine andere Anfrage dieselbe Seite gestartet haben
+            task = self._inflight.get(key)
+            if task is not None:
+                self.hits += 1
+                return await self._wait(task)
+
+        self.misses += 1
+
+        async def capture_and_store():
+            result = await capture()
+            self.evictions += await asyncio.to_thread(self._store, key, url, result)
+            return result
+
+        task = asyncio.ensure_future(capture_and_store())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await self._wait(task)
+
+    async def _wait(self, task: asyncio.Future) -> Dict[str, Any]:
+        """
+        Wartet auf eine geteilte Navigation. Der Abbruch eines Aufrufers beendet
+        sie nicht, solange andere warten; bricht der letzte ab, wird auch die
+        Navigation abgebrochen (kein Laden mehr nur für den Cache).
+        """
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        """Gibt Trefferquote, Größe und Anzahl der Einträge zurück."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": len(list(self.directory.glob("*.json.gz"))) if self.directory.exists() else 0,
+            "bytes": self._current_bytes(),
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Prozessweiter Standard-Cache, damit alle Tools dieselben Captures sehen
+_default_cache: Optional[CaptureCache] = None
+
+
+def get_capture_cache() -> CaptureCache:
+    """Gibt den prozessweiten Capture-Cache zurück (wird bei Bedarf erstellt)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CaptureCache()
+    return _default_cache
@@ -0,0 +1,250 @@
+"""Persistente LangGraph-Checkpoints und Seiten-Journal in einer SQLite-Datei (fortsetzbare Läufe)."""
+
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.core.schemas import PageJob
+
+
+# Eigene Typen im State, die beim Laden wiederhergestellt werden dürfen
+STATE_TYPES = [("src.core.schemas", "PageJob"), ("src.core.schemas", "Diagnostic")]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, parent_id TEXT,
+    checkpoint_type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT, checkpoint_ns TEXT, channel TEXT, version TEXT, type TEXT, value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, task_id TEXT, idx INTEGER,
+    channel TEXT, type TEXT, value BLOB, task_path TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id TEXT, url TEXT, job TEXT, updated_at REAL,
+    PRIMARY KEY (run_id, url)
+);
+"""
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    LangGraph-Checkpointer auf SQLite (Standardbibliothek, eine Datei).
+
+    Nach jedem Node speichert LangGraph den Zustand des Laufs (thread_id =
+    run_id). Zusätzlich hält das Seiten-Journal jede fertig verarbeitete Seite
+    fest, sobald sie fertig ist: ein fortgesetzter Lauf übernimmt diese Seiten
+    und verarbeitet nur die übrigen.
+
+    Die Datei wird im WAL-Modus geschrieben; jeder Schreibzugriff ist eine
+    eigene Transaktion, ein Absturz verliert höchstens die gerade laufende Seite.
+    """
+
+    def __init__(self, path: str = "out/.checkpoints.sqlite", serde=None):
+        """Öffnet (bzw. erzeugt) die Datei."""
+        super().__init__(serde=serde or JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES))
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Schließt die Verbindung."""
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(sql, rows)
+
+    # --- Seiten-Journal ---
+
+    def record_page(self, run_id: str, job: PageJob) -> None:
+        """Hält eine fertig verarbeitete Seite fest (überschreibt einen älteren Eintrag)."""
+        self._write(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            [(run_id, job.url, job.model_dump_json(exclude={"dom"}), time.time())],
+        )
+
+    def pages(self, run_id: str) -> Dict[str, PageJob]:
+        """Alle festgehaltenen Seiten eines Laufs (URL -> PageJob)."""
+        return {
+            url: PageJob.model_validate_json(job)
+            for url, job in self._query("SELECT url, job FROM pages WHERE run_id = ?", (run_id,))
+        }
+
+    def has_run(self, run_id: str) -> bool:
+        """True, wenn es für den Lauf einen Checkpoint gibt."""
+        return bool(self._query("SELECT 1 FROM checkpoints WHERE thread_id = ? LIMIT 1", (run_id,)))
+
+    # --- LangGraph BaseCheckpointSaver ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        sql = "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        params: List[Any] = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            sql += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        rows = self._query(sql + " ORDER BY checkpoint_id DESC LIMIT 1", params)
+        return self._tuple(rows[0]) if rows else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        sql, params = "SELECT * FROM checkpoints WHERE 1 = 1", []
+        if config:
+            sql += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                sql += " AND checkpoint_ns = ?"
+                params.append(config["configurable"]["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                sql += " AND checkpoint_id = ?"
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            sql += " AND checkpoint_id < ?"
+            params.append(before_id)
+        for row in self._query(sql + " ORDER BY checkpoint_id DESC", params):
+            if limit is not None and limit <= 0:
+                break
+            metadata = self.serde.loads_typed((row[6], row[7]))
+            if filter and not all(metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield self._tuple(row)
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+        # Kanalwerte getrennt und nur bei neuer Version speichern (unveränderte Kanäle kosten nichts)
+        self._write("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", [
+            (thread_id, checkpoint_ns, channel, str(version),
+             *(self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")))
+            for channel, version in new_versions.items()
+        ])
+        self._write("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [(
+            thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+            *self.serde.dumps_typed(c), *self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+        )])
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                 "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            # Spezielle Kanäle (Fehler, Interrupts) ersetzen, normale Writes nur einmal speichern
+            rows.append((
+                "REPLACE" if WRITES_IDX_MAP.get(channel, idx) < 0 else "IGNORE",
+                (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+                 channel, *self.serde.dumps_typed(value), task_path),
+            ))
+        for mode in ("REPLACE", "IGNORE"):
+            self._write(f"INSERT OR {mode} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [row for m, row in rows if m == mode])
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for table in ("checkpoints", "blobs", "writes"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+                self._conn.execute("DELETE FROM pages WHERE run_id = ?", (thread_id,))
+
+    # Lokale SQLite-Zugriffe sind kurz: die Async-Varianten rufen direkt die synchronen auf
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Wie InMemorySaver: aufsteigende Nummer plus Zufallsanteil (als Text sortierbar)
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def _tuple(self, row: tuple) -> CheckpointTuple:
+        """CheckpointTuple aus einer Zeile der Tabelle checkpoints (mit Kanalwerten und offenen Writes)."""
+        thread_id, checkpoint_ns, checkpoint_id, parent_id = row[:4]
+        checkpoint: Checkpoint = self.serde.loads_typed((row[4], row[5]))
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob = self._query(
+                "SELECT type, value FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            )
+            if blob and blob[0][0] != "empty":
+                values[channel] = self.serde.loads_typed(blob[0])
+        writes = self._query(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND checkpoint_id = ? ORDER BY task_path, task_id, idx",   # Reihenfolge wie writes_sort_key
+            (thread_id, checkpoint_ns, checkpoint_id),
+        )
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                     "checkpoint_id": checkpoint_id}},
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((row[6], row[7])),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((kind, value)))
+                            for task_id, channel, kind, value in writes],
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+        )
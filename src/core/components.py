@@ -0,0 +1,219 @@
+"""Erkennung gemeinsamer Seiten-Komponenten (Header, Navigation, Footer, Cookie-Banner) über mehrere Seiten."""
+
+import asyncio
+import hashlib
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from html import escape
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.dom_reducer import TEST_ID_ATTRS, VOID_TAGS, DomNode, is_interactive, parse_html
+
+
+# Komponenten-Art nach ARIA-Rolle bzw. Tag
+ROLE_KINDS = {"banner": "header", "navigation": "nav", "contentinfo": "footer", "complementary": "sidebar"}
+TAG_KINDS = {"header": "header", "nav": "nav", "footer": "footer", "aside": "sidebar"}
+CONSENT = re.compile(r"cookie|consent|gdpr", re.I)
+# Innerhalb dieser Elemente gehören Header/Nav/Footer zum Seiteninhalt
+CONTENT_TAGS = {"main", "article"}
+# Attribute, die in den Fingerabdruck eingehen (class, style, aria-current u.ä. wechseln pro Seite)
+IDENTITY_ATTRS = ("id", "role", "aria-label", "href", "name", "type", "placeholder", "for", "action", *TEST_ID_ATTRS)
+
+
+@dataclass
+class SharedComponent:
+    """Eine auf den meisten Seiten identische Komponente (bekommt ein eigenes POM)."""
+    name: str            # Attributname im Seiten-POM, z.B. "header", "nav2"
+    class_name: str      # Klassenname des Komponenten-POMs, z.B. "HeaderComponent"
+    kind: str            # header, nav, footer, sidebar, cookieBanner
+    fingerprint: str
+    html: str            # HTML des Teilbaums (erste Fundstelle)
+    url: str             # Seite der ersten Fundstelle (goto() des Komponenten-POMs)
+    pages: int           # Anzahl Seiten der Stichprobe mit dieser Komponente
+    texts: Set[str] = field(default_factory=set)   # Texte der interaktiven Elemente
+
+
+def find_components(dom: str) -> List[Tuple[str, str, DomNode, Tuple[str, ...]]]:
+    """
+    Kandidaten einer Seite: Header-, Nav-, Footer-, Sidebar- und Cookie-Banner-
+    Teilbäume außerhalb von <main>/<article> mit mindestens einem interaktiven
+    Element. Verschachtelte Kandidaten (Nav im Header) zählen ebenfalls, damit
+    eine gleiche Navigation auch in seitenspezifischen Headern erkannt wird.
+
+    Returns:
+        Liste von (Art, Fingerabdruck, Knoten, Fingerabdrücke der umschließenden Kandidaten)
+        in Dokument-Reihenfolge
+    """
+    found: List[Tuple[str, str, DomNode, Tuple[str, ...]]] = []
+
+    def walk(node: DomNode, ancestors: Tuple[str, ...]):
+        for child in node.children:
+            if child.tag in CONTENT_TAGS:
+                continue
+            kind = _kind(child)
+            if kind and any(is_interactive(n) for n in child.iter()):
+                print_ = fingerprint(child)
+                found.append((kind, print_, child, ancestors))
+                walk(child, ancestors + (print_,))
+            else:
+                walk(child, ancestors)
+
+    walk(parse_html(dom), ())
+    return found
+
+
+def fingerprint(node: DomNode) -> str:
+    """Fingerabdruck eines Teilbaums aus Tags, identifizierenden Attributen und Text."""
+    digest = hashlib.sha256()
+
+    def walk(current: DomNode):
+        attrs = ",".join(f"{k}={current.attrs[k]}" for k in IDENTITY_ATTRS if k in current.attrs)
+        text = re.sub(r"\s+", " ", " ".join(current.text)).strip()
+        digest.update(f"<{current.tag} {attrs}>{text}".encode("utf-8"))
+        for child in current.children:
+            walk(child)
+        digest.update(b"</>")
+
+    walk(node)
+    return digest.hexdigest()[:16]
+
+
+def to_html(node: DomNode) -> str:
+    """Serialisiert einen (vereinfachten) Teilbaum zurück in HTML (Text bleibt zwischen den Kindern)."""
+    # node.text = Text vor dem ersten Kind, danach die Tail-Texte der Kinder in Reihenfolge
+    lead = len(node.text) - sum(len(c.tail) for c in node.children)
+    inner = "".join(escape(t) for t in node.text[:lead]) + "".join(
+        to_html(c) + "".join(escape(t) for t in c.tail) for c in node.children
+    )
+    if node.tag == "#document":
+        return inner
+    attrs = "".join(f' {k}="{escape(v)}"' if v else f" {k}" for k, v in node.attrs.items())
+    if node.tag in VOID_TAGS:
+        return f"<{node.tag}{attrs}>"
+    return f"<{node.tag}{attrs}>{inner}</{node.tag}>"
+
+
+def _kind(node: DomNode) -> Optional[str]:
+    role = node.attrs.get("role")
+    if role in ROLE_KINDS:
+        return ROLE_KINDS[role]
+    if node.tag in TAG_KINDS:
+        return TAG_KINDS[node.tag]
+    if CONSENT.search(f"{node.attrs.get('id', '')} {node.attrs.get('class', '')}"):
+        return "cookieBanner"
+    return None
+
+
+def _texts(node: DomNode) -> Set[str]:
+    """Texte bzw. aria-labels der interaktiven Elemente eines Teilbaums."""
+    return {
+        text for n in node.iter() if is_interactive(n)
+        for text in [n.attrs.get("aria-label") or n.text_content()] if text
+    }
+
+
+class ComponentDetector:
+    """
+    Findet Komponenten, die auf den meisten Seiten identisch vorkommen.
+
+    Die ersten `sample_pages` gescannten Seiten bilden die Stichprobe; eine
+    Komponente gilt als gemeinsam, wenn sie auf mindestens `min_share` der
+    Stichprobe (und mindestens zwei Seiten) vorkommt. Bis zur Entscheidung
+    wartet die LLM-Stufe (wait); close() entscheidet mit den bisherigen Seiten.
+    """
+
+    def __init__(self, sample_pages: int = 3, min_share: float = 0.6):
+        self.sample_pages = max(2, sample_pages)
+        self.min_share = min_share
+        self.shared: Dict[str, SharedComponent] = {}   # Fingerabdruck -> Komponente
+        self.texts: Set[str] = set()                    # Texte aller gemeinsamen Komponenten
+        self._counts: Counter = Counter()
+        self._first: Dict[str, Tuple[str, DomNode, str, Tuple[str, ...]]] = {}
+        self._observed = 0
+        self._ready = asyncio.Event()
+
+    @property
+    def decided(self) -> bool:
+        return self._ready.is_set()
+
+    def observe(self, url: str, dom: str) -> None:
+        """
+        Nimmt eine gescannte Seite in die Stichprobe auf (nach der Entscheidung wirkungslos).
+        Seiten ohne DOM (Scan-Fehler) zählen mit, sonst bliebe die Entscheidung aus.
+        """
+        if self.decided:
+            return
+        page_prints = set()   # Jede Komponente zählt einmal pro Seite
+        for kind, print_, node, ancestors in find_components(dom) if dom else []:
+            if print_ in page_prints:
+                continue
+            page_prints.add(print_)
+            self._first.setdefault(print_, (kind, node, url, ancestors))
+            self._counts[print_] += 1
+        self._observed += 1
+        if self._observed >= self.sample_pages:
+            self.close()
+
+    def close(self) -> None:
+        """Entscheidet mit den bisher beobachteten Seiten und gibt wartende Stufen frei."""
+        if self.decided:
+            return
+        needed = max(2, math.ceil(self.min_share * self._observed))
+        names: Counter = Counter()
+        # Dokument-Reihenfolge: umschließende Kandidaten werden vor ihren Kindern entschieden
+        for print_, (kind, node, url, ancestors) in self._first.items():
+            count = self._counts[print_]
+            if count < needed or any(a in self.shared for a in ancestors):
+                continue
+            names[kind] += 1
+            suffix = str(names[kind]) if names[kind] > 1 else ""
+            component = SharedComponent(
+                name=kind + suffix, class_name=kind[0].upper() + kind[1:] + "Component" + suffix,
+                kind=kind, fingerprint=print_, html=to_html(node), url=url, pages=count, texts=_texts(node),
+            )
+            self.shared[print_] = component
+            self.texts |= component.texts
+        self._first.clear()
+        self._ready.set()
+
+    async def wait(self) -> None:
+        """Wartet, bis feststeht, welche Komponenten gemeinsam sind."""
+        await self._ready.wait()
+
+    def strip(self, dom: str) -> Tuple[str, List[SharedComponent]]:
+        """
+        Entfernt die gemeinsamen Komponenten aus dem DOM einer Seite.
+
+        Returns:
+            (DOM ohne gemeinsame Teilbäume, auf der Seite vorhandene Komponenten)
+            – ohne gemeinsame Komponenten das unveränderte DOM
+        """
+        if not self.shared:
+            return dom, []
+        root = parse_html(dom)
+        used: List[SharedComponent] = []
+
+        def walk(node: DomNode):
+            kept = []
+            for child in node.children:
+                component = None
+                if child.tag not in CONTENT_TAGS and _kind(child):
+                    component = self.shared.get(fingerprint(child))
+                if component is not None:
+                    if all(c.fingerprint != component.fingerprint for c in used):
+                        used.append(component)
+                    # Text nach der Komponente gehört nun zum vorherigen Geschwister (bzw. vor das erste Kind)
+                    if kept:
+                        kept[-1].tail.extend(child.tail)
+                    continue
+                if child.tag not in CONTENT_TAGS:
+                    walk(child)
+                kept.append(child)
+            node.children = kept
+
+        walk(root)
+        if not used:
+            return dom, []
+        return to_html(root), used
@@ -1,7 +1,29 @@
 """Konfigurations-Klasse für die Qualität der Test-Generierung."""
 
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional
+
+
+# LLM-Stufen der Pipeline, jede kann auf ein eigenes Modell geroutet werden
+LLM_STAGES = ("extract", "scenarios", "pom", "tests", "repair")
+
+
+@dataclass
+class LLMRoute:
+    """Modell und Endpoint für eine LLM-Stufe."""
+    provider: str = "openai"               # "azure", "openai" oder "stub" (lokal, ohne Netzwerk)
+    model: str = "gpt-4o-mini"             # Modell- bzw. Deployment-Name
+    temperature: Optional[float] = None    # None = Standard des Modells
+    endpoint: Optional[str] = None         # Abweichender Endpoint (z.B. OpenAI-kompatibler lokaler Server)
+
+
+# Starkes Modell für Code (Azure-Deployment, nur Standard-Temperatur)
+STRONG_ROUTE = LLMRoute(provider="azure", model="gpt-5")
+
+
+def _standard_routes() -> Dict[str, LLMRoute]:
+    """Test-Code und Reparatur auf dem starken Modell, alles andere auf `model`."""
+    return {"tests": STRONG_ROUTE, "repair": STRONG_ROUTE}
 
 
 @dataclass
@@ -25,15 +47,85 @@ class TestGenerationConfig:
     enhance_pom: bool = True   # POMs automatisch mit KI verbessern
     enhance_tests: bool = True # Tests mit KI-Power generieren
     
-    # Welches KI-Modell nutzen?
+    # Welches KI-Modell nutzen? (schnelles Modell für alle Stufen ohne eigene Route)
+    llm_provider: str = "openai"
     model: str = "gpt-4o-mini"
     temperature: float = 0.1   # Niedrige Temperatur = deterministischer
+    # Abweichende Modelle pro Stufe (extract, scenarios, pom, tests, repair)
+    llm_routes: Dict[str, LLMRoute] = field(default_factory=_standard_routes)
+    use_llm_cache: bool = True # Antworten für identische Prompts wiederverwenden
+    dom_token_budget: int = 3000  # Max. geschätzte Tokens des reduzierten DOM pro Extraktions-Aufruf
+    extract_max_chunks: int = 4   # Große Seiten in bis zu N Landmark-Abschnitte teilen (parallel, 1 = kürzen)
+    # UI-Extraktion: "heuristic" (nur Regeln, kein LLM), "hybrid" (Regeln, LLM verbessert
+    # nur Namen/Zweck), "llm" (LLM liest die DOM-Gliederung)
+    extractor: Literal["heuristic", "hybrid", "llm"] = "hybrid"
+    # Gemeinsame Komponenten (Header, Navigation, Footer, Cookie-Banner) einmal als eigenes POM
+    # mit Spec generieren und aus Extraktion und Tests der einzelnen Seiten herausnehmen
+    shared_components: bool = True
+    component_sample_pages: int = 3     # Die ersten N gescannten Seiten bilden die Stichprobe
+    component_min_share: float = 0.6    # Anteil der Stichprobe, auf dem eine Komponente identisch sein muss
     
     # Code-Style-Einstellungen
     use_type_hints: bool = True  # Type-Hints in generiertem Code
     use_async: bool = True       # Async/await nutzen
     max_tests_per_page: int = 5  # Maximale Anzahl Tests pro Seite
+
+    # Test-Generierung: Szenarien und Code in einem LLM-Aufruf statt zwei
+    single_call_tests: bool = True
+    # Kleine Seiten bündeln (nur bei concurrent_pages): eine Anfrage für bis zu N Specs
+    tests_batch_size: int = 3            # 1 = nicht bündeln
+    tests_batch_max_elements: int = 12   # Größere Seiten laufen einzeln
+    tests_batch_wait: float = 0.5        # Sekunden, die ein Bündel auf weitere Seiten wartet
+
+    # Typprüfung der generierten Specs (ein tsc-Lauf für alle, inkrementell)
+    typecheck_tests: bool = True
+    tsconfig_path: str = "tsconfig.json"  # Basis-tsconfig, deren Optionen übernommen werden
+    tsc_timeout: int = 300                # Sekunden
+
+    # Reparatur fehlerhafter Dateien (nur die betroffenen Zeilen, danach erneut prüfen)
+    repair_workers: int = 4        # Parallel reparierte Dateien
+    repair_max_attempts: int = 3   # Versuche pro Datei; der letzte repariert die ganze Datei
+    repair_context_lines: int = 10 # Kontextzeilen um jeden Befund (verdoppelt sich pro Versuch)
+
+    # Playwright-UI nach erfolgreicher Generierung öffnen
+    open_ui: bool = True
+
+    # Nebenläufige Verarbeitung der Seiten (Scan und LLM-Stufen überlappen)
+    concurrent_pages: bool = True  # False = streng sequentiell wie früher
+    scan_workers: int = 2          # Parallele Browser-Scans
+    llm_workers: int = 4           # Parallele LLM-Stufen (Extraktion, POM, Tests)
+    queue_size: int = 8            # Maximale Länge der Queues zwischen den Stufen
+
+    # Hintergrund-Jobs (generate_tests_full mit background=true)
+    job_workers: int = 1                      # Gleichzeitig laufende Jobs
+    job_store_path: str = "out/.jobs.json"    # Persistenter Job-Zustand
+
+    # Checkpoints (LangGraph-Zustand nach jedem Schritt, fertige Seiten sofort) für resume_run
+    checkpoint_path: Optional[str] = "out/.checkpoints.sqlite"   # None = nicht fortsetzbar
+
+    # Tracing: Spans pro Schritt/Tool und Kennzahlen pro Seite (Ctx.metrics, PageJob.metrics)
+    trace_export: Optional[str] = None   # "jsonl", "otlp" (OpenTelemetry OTLP/JSON) oder None
+    trace_dir: str = "out/traces"        # Eine Datei pro Lauf (Dateiname = Trace-ID)
+
+    # Laden der Seiten: "full" (alles, networkidle), "fast" (ohne Medien/Tracker, DOM-Ruhephase),
+    # "minimal" (zusätzlich ohne Styles und Fremd-Hosts)
+    load_profile: str = "fast"
+
+    # Crawling (Breitensuche über mehrere Ebenen)
+    crawl_depth: int = 2                  # 1 = nur Links der Startseite
+    crawl_host_concurrency: int = 2       # Gleichzeitige Seitenaufrufe pro Host
+    crawl_include: List[str] = field(default_factory=list)  # Glob-Muster, z.B. "/docs/*"
+    crawl_exclude: List[str] = field(default_factory=list)  # Glob-Muster, z.B. "*/logout*"
+    # URL-Quelle: "crawl" (Links im Browser), "sitemap" (robots.txt/sitemap.xml, ohne Browser),
+    # "auto" (Sitemap, ohne Treffer Crawl)
+    crawl_source: Literal["crawl", "sitemap", "auto"] = "crawl"
     
+    def route_for(self, stage: str) -> LLMRoute:
+        """Modell für eine LLM-Stufe: eigene Route oder das schnelle Standard-Modell."""
+        if stage not in LLM_STAGES:
+            raise ValueError(f"Unknown LLM stage: {stage}")
+        return self.llm_routes.get(stage) or LLMRoute(self.llm_provider, self.model, self.temperature)
+
     @classmethod
     def basic(cls):
         """Basic test generation - only happy path, no AI enhancement."""
@@ -44,6 +136,8 @@ class TestGenerationConfig:
             enhance_pom=False,  # Skip AI enhancement for speed
             enhance_tests=False,  # Use templates for speed
             model="gpt-4o-mini",
+            llm_routes={},  # Alle Stufen auf dem schnellen Modell
+            extractor="heuristic",  # UI-Modell ohne LLM-Aufruf
         )
     
     @classmethod
@@ -56,8 +150,15 @@ class TestGenerationConfig:
             enhance_tests=True,
             model="gpt-4o",
             max_tests_per_page=10,
+            # Alles, was Code schreibt, auf dem starken Modell
+            llm_routes={"pom": STRONG_ROUTE, "tests": STRONG_ROUTE, "repair": STRONG_ROUTE},
         )
 
+    @classmethod
+    def offline(cls):
+        """All stages on the local stub model (no network, deterministic output)."""
+        return cls(llm_provider="stub", model="stub", llm_routes={}, open_ui=False)
+
 
 # Default configuration
 DEFAULT_CONFIG = TestGenerationConfig()
@@ -0,0 +1,246 @@
+"""Breitensuche-Crawler mit Frontier, Tiefenlimit und URL-Kanonisierung."""
+
+import asyncio
+import re
+from collections import deque
+from contextlib import aclosing
+from fnmatch import fnmatchcase
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+
+from src.core.browser_pool import BrowserPool, get_browser_pool
+from src.core.sitemap import sitemap_urls
+
+
+# Woher die URLs kommen: Links verfolgen, Sitemaps lesen oder Sitemaps mit Crawl als Fallback
+CRAWL_SOURCES = ("crawl", "sitemap", "auto")
+
+
+# Query-Parameter, die nur Tracking sind und die Seite nicht verändern
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "igshid", "ref_src", "spm",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """
+    Bringt eine URL in eine kanonische Form, damit Duplikate erkannt werden.
+
+    - Schema und Host klein, Standard-Ports und Zugangsdaten entfernt
+    - Fragment (#...) und Tracking-Parameter (utm_*, gclid, ...) entfernt
+    - Query-Parameter sortiert
+    - Doppelte Slashes zusammengefasst, abschließender Slash entfernt (außer bei "/")
+
+    Returns:
+        Kanonische URL oder None für Nicht-HTTP-Links (mailto:, javascript:, ...)
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return None
+
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = (parts.hostname or "").lower()
+    if not netloc:
+        return None
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        netloc = f"{netloc}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+class SiteCrawler:
+    """
+    Mehrstufiger Crawler (Breitensuche) über eine Website.
+
+    Tiefe 0 ist die Start-URL, deren Links haben Tiefe 1 usw. Seiten bis
+    `max_depth - 1` werden geladen, Links bis `max_depth` werden gemeldet.
+    Gefundene URLs werden als Async-Generator gestreamt, in stabiler
+    Reihenfolge (Frontier-Reihenfolge, dann Dokument-Reihenfolge).
+
+    Mit source="sitemap" kommen die URLs aus robots.txt/sitemap.xml (ohne
+    Browser), mit "auto" ebenso, solange die Sitemaps erlaubte URLs liefern.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool: Optional[BrowserPool] = None,
+        max_depth: int = 1,
+        max_pages: int = 0,
+        per_host_concurrency: int = 2,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        same_host: bool = True,
+        cache=None,
+        load_profile=None,
+        source: str = "crawl",
+    ):
+        """
+        Args:
+            base_url: Start-URL
+            pool: Browser-Pool (Standard: prozessweiter Pool)
+            max_depth: Maximale Link-Tiefe (1 = nur Links der Startseite)
+            max_pages: Maximale Anzahl gemeldeter URLs (0 = unbegrenzt)
+            per_host_concurrency: Gleichzeitige Seitenaufrufe pro Host
+            include: Glob-Muster; wenn gesetzt, muss URL oder Pfad eines davon treffen
+            exclude: Glob-Muster für URLs oder Pfade, die ignoriert werden
+            same_host: Nur Links auf dem Host der Start-URL verfolgen
+            cache: Capture-Cache (Standard: prozessweiter Cache)
+            load_profile: Lade-Profil für die Seitenaufrufe (Standard: "fast")
+            source: "crawl" (Links verfolgen), "sitemap" (nur Sitemaps) oder
+                "auto" (Sitemaps, ohne Treffer Crawl)
+        """
+        if source not in CRAWL_SOURCES:
+            raise ValueError(f"Unknown crawl source: {source} (expected one of {', '.join(CRAWL_SOURCES)})")
+        self.base_url = base_url
+        self.pool = pool or get_browser_pool()
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.per_host_concurrency = per_host_concurrency
+        self.include = include or []
+        self.exclude = exclude or []
+        self.same_host = same_host
+        self.cache = cache
+        self.load_profile = load_profile
+        self.source = source
+
+        self.errors: List[str] = []
+        self.pages_fetched = 0
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _allowed(self, url: str, seed_host: str) -> bool:
+        """Prüft Host- und Include/Exclude-Regeln für eine kanonische URL."""
+        parts = urlsplit(url)
+        if self.same_host and parts.netloc != seed_host:
+            return False
+
+        def matches(patterns: List[str]) -> bool:
+            return any(fnmatchcase(url, p) or fnmatchcase(parts.path, p) for p in patterns)
+
+        if self.exclude and matches(self.exclude):
+            return False
+        if self.include and not matches(self.include):
+            return False
+        return True
+
+    async def _fetch_links(self, url: str) -> List[str]:
+        """Lädt eine Seite und gibt alle absoluten Link-Ziele in Dokument-Reihenfolge zurück."""
+        # Import hier, da scan_site selbst auf canonicalize_url aufbaut
+        from src.tools.scan_site import scan_site
+
+        host = urlsplit(url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+
+        # Über den Capture-Cache laden, damit die spätere Verarbeitung die Seite nicht erneut lädt
+        async with limit:
+            capture = await scan_site(url, pool=self.pool, cache=self.cache, load_profile=self.load_profile)
+        self.pages_fetched += 1
+
+        # Im Browser gesammelte, bereits aufgelöste Link-Ziele
+        if capture.get("hrefs") is not None:
+            return capture["hrefs"]
+
+        # Ältere Cache-Einträge ohne "hrefs": HTML parsen
+        html = capture.get("dom", "")
+        base = capture.get("final_url") or url  # Nach Redirects relativ zur echten URL auflösen
+        soup = BeautifulSoup(html, "html.parser")
+        return [
+            urljoin(base, a["href"])
+            for a in soup.find_all("a", href=True)
+            if a["href"] and not a["href"].startswith("#")
+        ]
+
+    async def crawl(self) -> AsyncIterator[str]:
+        """Streamt neu entdeckte, kanonische URLs Ebene für Ebene."""
+        seed = canonicalize_url(self.base_url)
+        if seed is None:
+            raise ValueError(f"Not an http(s) URL: {self.base_url}")
+        seed_host = urlsplit(seed).netloc
+
+        reported = set()   # Bereits gemeldete URLs
+        if self.source != "crawl":
+            # Bei "auto" ist eine fehlende Sitemap kein Fehler, dann wird gecrawlt
+            sitemap_errors: List[str] = []
+            try:
+                async with aclosing(sitemap_urls(seed, errors=sitemap_errors)) as pages:
+                    async for page in pages:
+                        canonical = canonicalize_url(page)
+                        if canonical is None or canonical in reported or not self._allowed(canonical, seed_host):
+                            continue
+                        reported.add(canonical)
+                        yield canonical
+                        if self.max_pages and len(reported) >= self.max_pages:
+                            return
+            finally:
+                if reported or self.source == "sitemap":
+                    self.errors.extend(sitemap_errors)
+            if reported or self.source == "sitemap":
+                return
+
+        fetched = {seed}   # Bereits geladene (oder eingeplante) Seiten
+        frontier = [seed]
+        window = max(1, self.per_host_concurrency * 2)
+
+        for depth in range(self.max_depth):
+            next_frontier: List[str] = []
+            pending = deque()
+            todo = iter(frontier)
+
+            def refill():
+                # Nur ein Fenster an Seiten gleichzeitig einplanen
+                while len(pending) < window:
+                    url = next(todo, None)
+                    if url is None:
+                        return
+                    pending.append((url, asyncio.ensure_future(self._fetch_links(url))))
+
+            try:
+                refill()
+                while pending:
+                    url, task = pending.popleft()
+                    try:
+                        links = await task
+                    except Exception as e:
+                        self.errors.append(f"{url}: {e}")
+                        links = []
+                    refill()
+
+                    for link in links:
+                        canonical = canonicalize_url(link)
+                        if canonical is None or canonical in reported:
+                            continue
+                        if not self._allowed(canonical, seed_host):
+                            continue
+
+                        reported.add(canonical)
+                        yield canonical
+                        if self.max_pages and len(reported) >= self.max_pages:
+                            return
+
+                        if canonical not in fetched and depth + 1 < self.max_depth:
+                            fetched.add(canonical)
+                            next_frontier.append(canonical)
+            finally:
+                for _, task in pending:
+                    task.cancel()
+
+            frontier = next_frontier
+            if not frontier:
+                break
@@ -0,0 +1,414 @@
+"""DOM-Reduktion: kompakte Gliederung der interaktiven und Landmark-Elemente einer Seite."""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+
+# Teilbäume, die für die UI-Extraktion keinen Wert haben
+DROP_TAGS = {"script", "style", "noscript", "template", "svg", "canvas", "object", "math"}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+# Tags, die ein offenes gleichnamiges Element implizit schließen
+IMPLICIT_CLOSE = {"li": {"li"}, "option": {"option"}, "p": {"p"}, "tr": {"tr"}, "td": {"td", "th"}, "th": {"td", "th"}}
+
+INTERACTIVE_TAGS = {"a", "button", "input", "select", "textarea", "label", "summary", "iframe"}
+LANDMARK_TAGS = {"header", "nav", "main", "aside", "footer", "form", "section", "article", "dialog", "table", "fieldset"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Top-Level-Landmarks, an denen die Gliederung in Abschnitte geteilt wird
+SECTION_TAGS = {"header", "nav", "main", "aside", "footer", "form", "section", "article", "dialog"}
+
+# Attribute mit Bedeutung für Locator und Zweck (Reihenfolge = Ausgabe-Reihenfolge)
+KEEP_ATTRS = (
+    "name", "type", "role", "href", "for", "placeholder", "aria-label", "title", "alt",
+    "data-testid", "data-test", "data-test-id", "data-cy", "data-qa",
+    "action", "method", "disabled", "required", "checked",
+)
+TEST_ID_ATTRS = ("data-testid", "data-test", "data-test-id", "data-cy", "data-qa")
+
+MAX_TEXT = 80          # Maximale Textlänge pro Element
+KEEP_REPEATS = 2       # Wie viele gleichartige Geschwister erhalten bleiben
+CHARS_PER_TOKEN = 4    # Grobe Schätzung für Token-Budgets
+
+
+@dataclass
+class DomNode:
+    """Element im vereinfachten DOM-Baum."""
+    tag: str
+    attrs: Dict[str, str] = field(default_factory=dict)
+    children: List["DomNode"] = field(default_factory=list)
+    text: List[str] = field(default_factory=list)   # Direkte Text-Stücke (in Reihenfolge)
+    tail: List[str] = field(default_factory=list)   # Davon im Elternelement direkt nach diesem Element
+    collapsed: int = 0                               # Anzahl zusammengefasster Geschwister danach
+
+    def text_content(self) -> str:
+        """Normalisierter Text des Elements inklusive aller Nachfahren."""
+        parts: List[str] = []
+
+        def walk(node: "DomNode"):
+            parts.extend(node.text)
+            for child in node.children:
+                walk(child)
+
+        walk(self)
+        return re.sub(r"\s+", " ", " ".join(parts)).strip()
+
+    def iter(self):
+        """Iteriert über das Element und alle Nachfahren (Tiefensuche)."""
+        yield self
+        for child in self.children:
+            yield from child.iter()
+
+
+class _TreeBuilder(HTMLParser):
+    """Toleranter Parser, der direkt den vereinfachten Baum aufbaut."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = DomNode("#document")
+        self.stack: List[DomNode] = [self.root]
+        self.skip_tag: Optional[str] = None
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        if tag in DROP_TAGS:
+            self.skip_tag, self.skip_depth = tag, 1
+            return
+
+        closes = IMPLICIT_CLOSE.get(tag)
+        if closes and self.stack[-1].tag in closes:
+            self.stack.pop()
+
+        node = DomNode(tag, {k: (v or "") for k, v in attrs})
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.skip_tag or tag in DROP_TAGS:
+            return
+        self.stack[-1].children.append(DomNode(tag, {k: (v or "") for k, v in attrs}))
+
+    def handle_endtag(self, tag):
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+                if self.skip_depth == 0:
+                    self.skip_tag = None
+            return
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if not self.skip_tag and data.strip():
+            parent = self.stack[-1]
+            parent.text.append(data)
+            # Position merken, damit Text und Kinder wieder verschachtelt serialisiert werden können
+            if parent.children:
+                parent.children[-1].tail.append(data)
+
+
+def parse_html(html: str) -> DomNode:
+    """Parst HTML in einen vereinfachten Baum (Kommentare, Skripte, Styles, SVG entfernt)."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# Attribute, die interaktive Elemente unterscheiden (gleiche Struktur, anderes Feld bzw. Ziel)
+IDENTITY_ATTRS = ("id", "name", "type", "href", "for", "placeholder", "aria-label", "value", *TEST_ID_ATTRS)
+
+
+def _signature(node: DomNode) -> str:
+    """
+    Signatur zum Erkennen gleichartiger Geschwister: Tag-Struktur (3 Ebenen) plus
+    Attribute und Text aller interaktiven Nachfahren. Formularzeilen und Nav-Einträge
+    mit anderem Label, Namen oder Ziel gelten damit nicht als Wiederholung.
+    """
+    interactive = [
+        n.tag + "".join(f"[{k}={n.attrs[k]}]" for k in IDENTITY_ATTRS if k in n.attrs) + n.text_content()
+        for n in node.iter() if is_interactive(n)
+    ]
+    return _shape(node, 3) + "|" + "|".join(interactive)
+
+
+def _shape(node: DomNode, depth: int) -> str:
+    """Strukturelle Signatur (Tags ohne Text/Werte)."""
+    if depth == 0 or not node.children:
+        return node.tag
+    return node.tag + "(" + ",".join(_shape(c, depth - 1) for c in node.children) + ")"
+
+
+def collapse_repeats(node: DomNode, keep: int = KEEP_REPEATS) -> None:
+    """Fasst Folgen gleichartiger Geschwister (Listen-, Tabellenzeilen) auf `keep` Exemplare zusammen."""
+    if node.tag in ("select", "datalist"):
+        return  # Optionen werden in describe() selbst gekürzt
+    kept: List[DomNode] = []
+    run_sig, run_len = None, 0
+    for child in node.children:
+        collapse_repeats(child, keep)
+        sig = _signature(child)
+        if sig == run_sig:
+            run_len += 1
+            if run_len > keep:
+                kept[-1].collapsed += 1
+                continue
+        else:
+            run_sig, run_len = sig, 1
+        kept.append(child)
+    node.children = kept
+
+
+def is_interactive(node: DomNode) -> bool:
+    """Interaktive Elemente (inkl. ARIA-Rollen, Test-IDs, tabindex, contenteditable)."""
+    a = node.attrs
+    if node.tag in INTERACTIVE_TAGS:
+        return not (node.tag == "input" and a.get("type") == "hidden")
+    return (
+        "role" in a or "tabindex" in a or "onclick" in a or "contenteditable" in a
+        or any(t in a for t in TEST_ID_ATTRS)
+    )
+
+
+def is_landmark(node: DomNode) -> bool:
+    """Landmark- und Container-Elemente, die Struktur für die Extraktion liefern."""
+    return node.tag in LANDMARK_TAGS
+
+
+def describe(node: DomNode) -> str:
+    """Einzeilige Beschreibung: tag#id[attr=wert ...] "Text"."""
+    out = node.tag
+    if node.attrs.get("id"):
+        out += f"#{node.attrs['id']}"
+    attrs = []
+    for key in KEEP_ATTRS:
+        if key in node.attrs:
+            value = node.attrs[key][:MAX_TEXT]
+            attrs.append(key if value == "" else f"{key}={value}")
+    if node.tag == "input" and node.attrs.get("type") in ("submit", "button", "reset") and node.attrs.get("value"):
+        attrs.append(f"value={node.attrs['value'][:MAX_TEXT]}")
+    if attrs:
+        out += "[" + " ".join(attrs) + "]"
+
+    if node.tag == "select":
+        options = [o.text_content() for o in node.iter() if o.tag == "option"]
+        shown = ", ".join(o[:30] for o in options[:5])
+        more = f", +{len(options) - 5}" if len(options) > 5 else ""
+        out += f" options=[{shown}{more}]"
+    elif is_interactive(node) or node.tag in HEADING_TAGS:
+        text = node.text_content()
+        if text:
+            out += f' "{text[:MAX_TEXT]}"'
+    return out
+
+
+@dataclass
+class OutlineLine:
+    """Eine Zeile der Gliederung."""
+    depth: int
+    text: str
+    section: int   # Index des Top-Level-Abschnitts bzw. Abschnitts in <main> (für Chunking)
+
+
+@dataclass
+class ReducedDom:
+    """Ergebnis der DOM-Reduktion inklusive Kennzahlen."""
+    text: str
+    title: str
+    lines: List[OutlineLine]
+    original_chars: int
+    reduced_chars: int
+    element_count: int
+    truncated: bool = False
+
+    @property
+    def ratio(self) -> float:
+        """Reduzierte Größe relativ zum Original (0.05 = 95% gespart)."""
+        return round(self.reduced_chars / self.original_chars, 4) if self.original_chars else 1.0
+
+    @property
+    def est_tokens(self) -> int:
+        """Geschätzte Token-Anzahl des reduzierten DOM."""
+        return self.reduced_chars // CHARS_PER_TOKEN + 1
+
+    def stats(self) -> dict:
+        """Kennzahlen für Logging und Antworten."""
+        return {
+            "original_chars": self.original_chars,
+            "reduced_chars": self.reduced_chars,
+            "reduction_ratio": self.ratio,
+            "est_tokens": self.est_tokens,
+            "elements": self.element_count,
+            "truncated": self.truncated,
+        }
+
+
+def _outline(root: DomNode) -> List[OutlineLine]:
+    """Erzeugt die Gliederung: nur interaktive, Überschriften- und Landmark-Elemente."""
+    lines: List[OutlineLine] = []
+    section = 0
+
+    def walk(node: DomNode, depth: int, top_level: bool):
+        nonlocal section
+        for child in node.children:
+            if child.tag in ("head", "title"):
+                continue
+            emit = is_interactive(child) or is_landmark(child) or child.tag in HEADING_TAGS
+            if emit:
+                if top_level and child.tag in SECTION_TAGS:
+                    section += 1
+                lines.append(OutlineLine(depth, describe(child), section))
+                # Innerhalb interaktiver Elemente reicht die eine Zeile (Text ist bereits enthalten),
+                # nur Labels können selbst Eingabefelder umschließen
+                if not is_interactive(child) or child.tag == "label":
+                    # Landmarks direkt in <main> (Abschnitte, Formulare) sind eigene Abschnitte
+                    walk(child, depth + 1, child.tag == "main")
+            else:
+                walk(child, depth, top_level)
+            if child.collapsed:
+                lines.append(OutlineLine(depth, f"… +{child.collapsed} more similar <{child.tag}>", section))
+
+    walk(root, 0, True)
+    return lines
+
+
+def reduce_dom(html: str, token_budget: int = 3000) -> ReducedDom:
+    """
+    Reduziert rohes HTML auf eine kompakte Gliederung für LLM-Prompts.
+
+    - Entfernt Skripte, Styles, SVG, Kommentare und nicht-semantische Attribute
+    - Fasst wiederholte Geschwister-Strukturen (Listen-/Tabellenzeilen) zusammen
+    - Behält interaktive Elemente, Überschriften und Landmarks mit Einrückung
+    - Kürzt auf `token_budget` (geschätzt) und markiert die Kürzung
+
+    Args:
+        html: Kompletter HTML-Inhalt der Seite
+        token_budget: Maximal geschätzte Tokens der Ausgabe
+
+    Returns:
+        ReducedDom mit Text und Kennzahlen (u.a. Reduktions-Verhältnis)
+    """
+    root = parse_html(html)
+    collapse_repeats(root)
+
+    title = next((n.text_content() for n in root.iter() if n.tag == "title"), "")
+    lines = _outline(root)
+    element_count = len(lines)
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    rendered: List[str] = []
+    used = 0
+    truncated = False
+    for i, line in enumerate(lines):
+        row = "  " * line.depth + line.text
+        if used + len(row) + 1 > budget_chars:
+            rendered.append(f"… truncated {len(lines) - i} more elements")
+            lines = lines[:i]
+            truncated = True
+            break
+        rendered.append(row)
+        used += len(row) + 1
+
+    header = f"title \"{title[:MAX_TEXT]}\"\n" if title else ""
+    text = header + "\n".join(rendered)
+    return ReducedDom(
+        text=text,
+        title=title,
+        lines=lines,
+        original_chars=len(html),
+        reduced_chars=len(text),
+        element_count=element_count,
+        truncated=truncated,
+    )
+
+
+@dataclass
+class OutlineChunk:
+    """Zusammenhängender Teil der Gliederung für einen Extraktions-Aufruf."""
+    label: str       # Landmark des ersten Abschnitts, z.B. "header" oder "form#login"
+    text: str
+    sections: int    # Anzahl enthaltener Top-Level-Abschnitte
+
+    @property
+    def est_tokens(self) -> int:
+        return len(self.text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_outline(reduced: ReducedDom, token_budget: int) -> List[OutlineChunk]:
+    """
+    Teilt die Gliederung an Landmark-Grenzen (header, nav, main, form, footer, ...)
+    in Stücke von höchstens `token_budget` geschätzten Tokens.
+
+    Benachbarte kleine Abschnitte werden zusammengefasst; zu große Abschnitte
+    werden zeilenweise geteilt, jede Fortsetzung beginnt mit der Landmark-Zeile
+    des Abschnitts als Kontext.
+    """
+    budget = max(1, token_budget) * CHARS_PER_TOKEN
+    header = f"title \"{reduced.title[:MAX_TEXT]}\"" if reduced.title else ""
+
+    sections: List[List[OutlineLine]] = []
+    for line in reduced.lines:
+        if not sections or sections[-1][0].section != line.section:
+            sections.append([])
+        sections[-1].append(line)
+
+    chunks: List[OutlineChunk] = []
+    rows: List[str] = []
+    label, count = "", 0
+
+    def flush():
+        nonlocal rows, label, count
+        if rows:
+            chunks.append(OutlineChunk(label, "\n".join(([header] if header else []) + rows), count))
+        rows, label, count = [], "", 0
+
+    def used() -> int:
+        return len(header) + sum(len(r) + 1 for r in rows)
+
+    for lines in sections:
+        section_rows = ["  " * line.depth + line.text for line in lines]
+        section_label = lines[0].text.split("[", 1)[0].split(" ", 1)[0]
+        if used() + sum(len(r) + 1 for r in section_rows) > budget:
+            flush()
+        if not rows:
+            label = section_label
+        count += 1
+        for row in section_rows:
+            if rows and used() + len(row) + 1 > budget:
+                flush()
+                label, count = section_label, 1
+                rows.append(section_rows[0] + "  (continued)")
+            rows.append(row)
+    flush()
+    return chunks
+
+
+def structure_fingerprint(html: str) -> str:
+    """
+    Struktureller Fingerabdruck einer Seite für inkrementelle Läufe.
+
+    Basiert auf dem Titel und der vollständigen Gliederung ohne Zusammenfassung
+    gleichartiger Zeilen und ohne Token-Budget, damit jedes zusätzliche oder
+    umbenannte Feld bzw. jeder Link eine Neugenerierung auslöst. Nur in
+    Überschriften werden Ziffern normalisiert (Zähler, Datumsangaben).
+    """
+    root = parse_html(html)
+    title = next((n.text_content() for n in root.iter() if n.tag == "title"), "")
+    digest = hashlib.sha256(f"title:{title}\n".encode("utf-8"))
+    for line in _outline(root):
+        text = line.text
+        if re.match(r"h[1-6](?![\w-])", text):
+            text = re.sub(r"[0-9]+", "#", text)
+        digest.update(f"{line.depth}:{text}\n".encode("utf-8"))
+    return digest.hexdigest()
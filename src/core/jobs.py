@@ -0,0 +1,162 @@
+"""Hintergrund-Jobs: Warteschlange für lange Pipeline-Läufe mit persistentem Zustand."""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.core.schemas import BackgroundJob, Ctx
+
+
+# Führt einen Job aus: (params, progress, cancel_event) -> Zusammenfassung
+JobRunner = Callable[
+    [Dict[str, Any], Callable[[float, Optional[float], str], Awaitable[None]], asyncio.Event],
+    Awaitable[Dict[str, Any]],
+]
+FINISHED = ("done", "failed", "cancelled")
+
+
+def run_summary(result: Ctx) -> Dict[str, Any]:
+    """Kompakte, JSON-fähige Zusammenfassung eines Pipeline-Laufs."""
+    return {
+        "run_id": result.run_id,
+        "processed": result.total_processed,
+        "regenerated": result.total_processed - result.total_reused,
+        "reused": result.total_reused,
+        "errors": result.total_errors,
+        "cancelled": result.cancelled,
+        "pages": {
+            url: {"pom_path": job.pom_path, "test_path": job.test_path, "errors": job.errors}
+            for url, job in result.jobs.items()
+        },
+        "run_errors": result.errors,
+        "metrics": result.metrics,
+    }
+
+
+class JobQueue:
+    """
+    In-Process-Warteschlange für Pipeline-Läufe.
+
+    - submit() gibt sofort eine Job-ID zurück, `workers` Jobs laufen gleichzeitig
+    - Der Zustand aller Jobs liegt in `path` und wird bei jeder Statusänderung
+      atomar geschrieben
+    - Beim Start werden wartende und beim Beenden unterbrochene Jobs erneut
+      eingereiht (mit "run_id" setzt die Pipeline den Lauf ab der letzten fertigen Seite fort)
+    - Es bleiben höchstens `keep` abgeschlossene Jobs gespeichert
+    """
+
+    def __init__(self, runner: JobRunner, workers: int = 1, path: str = "out/.jobs.json", keep: int = 100):
+        """Initialisiere die Queue (Worker starten erst mit start())."""
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.path = Path(path)
+        self.keep = keep
+
+        self.jobs: Dict[str, BackgroundJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._cancel_events: Dict[str, asyncio.Event] = {}
+
+    async def start(self) -> None:
+        """Lädt den gespeicherten Zustand und startet die Worker."""
+        self._queue = asyncio.Queue()
+        self._load()
+        pending = sorted((j for j in self.jobs.values() if j.status not in FINISHED), key=lambda j: j.created_at)
+        for job in pending:
+            job.status, job.started_at = "queued", None
+            self._queue.put_nowait(job.id)
+        self._save()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        """Stoppt die Worker. Laufende Jobs bleiben als "running" gespeichert und starten beim nächsten Mal neu."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, params: Dict[str, Any]) -> BackgroundJob:
+        """Reiht einen Lauf ein und gibt den Job (mit ID) sofort zurück."""
+        if self._queue is None:
+            raise RuntimeError("JobQueue not started")
+        job = BackgroundJob(params=params)
+        self.jobs[job.id] = job
+        self._save()
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[BackgroundJob]:
+        """Job nach ID (None wenn unbekannt)."""
+        return self.jobs.get(job_id)
+
+    def list(self) -> List[BackgroundJob]:
+        """Alle Jobs, neueste zuerst."""
+        return sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[BackgroundJob]:
+        """
+        Bricht einen Job ab.
+
+        Wartende Jobs werden sofort verworfen, laufende liefern ihr Teilergebnis.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if job.status == "queued":
+            job.status, job.finished_at = "cancelled", time.time()
+            self._save()
+        elif job_id in self._cancel_events:
+            self._cancel_events[job_id].set()
+            job.message = "cancelling"
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = self.jobs.get(await self._queue.get())
+            if job is None or job.status != "queued":
+                continue  # Inzwischen abgebrochen
+            await self._run(job)
+
+    async def _run(self, job: BackgroundJob) -> None:
+        job.status, job.started_at = "running", time.time()
+        self._save()
+        cancel_event = self._cancel_events[job.id] = asyncio.Event()
+
+        async def progress(done: float, total: Optional[float], message: str):
+            job.progress, job.total, job.message = done, total, message
+
+        timeout = job.params.get("timeout_seconds")
+        timer = asyncio.get_running_loop().call_later(timeout, cancel_event.set) if timeout else None
+        try:
+            job.result = await self.runner(job.params, progress, cancel_event)
+            job.status = "cancelled" if job.result.get("cancelled") else "done"
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._cancel_events.pop(job.id, None)
+        job.finished_at = time.time()
+        self._save()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+            self.jobs = {j["id"]: BackgroundJob(**j) for j in data.get("jobs", [])}
+        except (FileNotFoundError, ValueError):
+            self.jobs = {}
+
+    def _save(self) -> None:
+        """Schreibt alle Jobs atomar (älteste abgeschlossene über `keep` hinaus werden verworfen)."""
+        finished = sorted((j for j in self.jobs.values() if j.status in FINISHED), key=lambda j: j.created_at)
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self.jobs[job.id]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(
+            {"version": 1, "jobs": [j.model_dump() for j in self.jobs.values()]}, indent=2
+        ))
+        os.replace(tmp, self.path)
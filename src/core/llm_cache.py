@@ -0,0 +1,232 @@
+"""SQLite-Cache für LLM-Antworten, geteilt von allen LLM-Aufrufen der Tools."""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.core.tracing import record, span
+
+
+class LLMCache:
+    """
+    Persistenter Antwort-Cache, Schlüssel ist ein Hash aus Modell, Temperatur und Prompt.
+
+    - Speicherung in einer lokalen SQLite-Datei
+    - LRU-Verdrängung, sobald `max_entries` oder `max_bytes` überschritten sind
+    - Thread-sicher (Tools laufen teils in Worker-Threads)
+    """
+
+    def __init__(self, path: str = "out/.cache/llm_cache.sqlite", max_entries: int = 10000,
+                 max_bytes: int = 200 * 1024 * 1024):
+        """Initialisiere den Cache (die Datenbank wird beim ersten Zugriff angelegt)."""
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # Zähler für diesen Prozess
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def _db(self) -> sqlite3.Connection:
+        """Öffnet die Datenbank und legt die Tabelle bei Bedarf an."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, temperature: Optional[float], prompt: str) -> str:
+        """Hash über Modellname, Temperatur und den vollständig gerenderten Prompt."""
+        material = f"{model}\x00{temperature}\x00{prompt}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Liest eine Antwort und markiert sie als zuletzt genutzt."""
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Speichert eine Antwort und verdrängt bei Bedarf die ältesten Einträge."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Löscht am längsten nicht genutzte Einträge bis beide Limits eingehalten sind."""
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            # In Blöcken löschen, damit große Überschreitungen schnell abgebaut werden
+            batch = max(1, count // 10)
+            rows = db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT ?", (batch,)
+            ).fetchall()
+            if not rows:
+                break
+            db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key, _ in rows])
+            count -= len(rows)
+            total -= sum(size for _, size in rows)
+            self.evictions += len(rows)
+
+    def clear(self) -> None:
+        """Leert den Cache komplett."""
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses")
+            db.commit()
+
+    def stats(self) -> dict:
+        """Gibt Trefferquote, Anzahl Einträge und Größe zurück."""
+        with self._lock:
+            count, total = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "path": str(self.path),
+        }
+
+
+# Prozessweiter Standard-Cache
+_default_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Gibt den prozessweiten LLM-Cache zurück (wird bei Bedarf erstellt)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+    return _default_cache
+
+
+def describe_llm(llm) -> Tuple[str, Optional[float]]:
+    """Ermittelt Modell (Client-Typ, Name, Endpoint) und Temperatur für den Cache-Schlüssel."""
+    name = (
+        getattr(llm, "deployment_name", None)
+        or getattr(llm, "model_name", None)
+        or getattr(llm, "model", None)
+        or ""
+    )
+    # Azure-Deployments unterscheiden sich oft nur über den Endpoint
+    endpoint = getattr(llm, "openai_api_base", None) or getattr(llm, "azure_endpoint", None) or ""
+    model = "|".join(str(part) for part in (type(llm).__name__, name, endpoint) if part)
+    return model, getattr(llm, "temperature", None)
+
+
+def invoke_llm(llm, prompt: str, use_cache: bool = True) -> str:
+    """
+    Ruft das LLM synchron auf und nutzt den Antwort-Cache.
+
+    Args:
+        llm: LangChain-Chat-Client
+        prompt: Vollständig gerenderter Prompt
+        use_cache: False = Cache für diesen Aufruf umgehen
+
+    Returns:
+        Antworttext des Modells
+    """
+    with span("llm", prompt_chars=len(prompt)):
+        cache = get_llm_cache()
+        if not use_cache:
+            cache.bypassed += 1
+            return _call(llm, prompt)
+
+        model, temperature = describe_llm(llm)
+        key = cache.make_key(model, temperature, prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            record(llm_cache_hits=1)
+            return cached
+
+        content = _call(llm, prompt)
+        cache.put(key, model, content)
+        return content
+
+
+async def ainvoke_llm(llm, prompt: str, use_cache: bool = True) -> str:
+    """Async-Variante von invoke_llm auf Basis von ainvoke."""
+    with span("llm", prompt_chars=len(prompt)):
+        cache = get_llm_cache()
+        if not use_cache:
+            cache.bypassed += 1
+            return await _acall(llm, prompt)
+
+        model, temperature = describe_llm(llm)
+        key = cache.make_key(model, temperature, prompt)
+        # Festplattenzugriff im Worker-Thread, damit der Event-Loop nicht blockiert
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            record(llm_cache_hits=1)
+            return cached
+
+        content = await _acall(llm, prompt)
+        await asyncio.to_thread(cache.put, key, model, content)
+        return content
+
+
+def _call(llm, prompt: str) -> str:
+    start = time.perf_counter()
+    response = llm.invoke(prompt)
+    _record_usage(response, time.perf_counter() - start)
+    return response.content
+
+
+async def _acall(llm, prompt: str) -> str:
+    start = time.perf_counter()
+    response = await llm.ainvoke(prompt)
+    _record_usage(response, time.perf_counter() - start)
+    return response.content
+
+
+def _record_usage(response, seconds: float) -> None:
+    """Zählt Aufruf, Latenz und Token-Verbrauch (usage_metadata bzw. token_usage des Providers)."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if not usage:
+        token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        usage = {"input_tokens": token_usage.get("prompt_tokens"), "output_tokens": token_usage.get("completion_tokens")}
+    record(llm_calls=1, llm_seconds=seconds,
+           prompt_tokens=usage.get("input_tokens"), completion_tokens=usage.get("output_tokens"))
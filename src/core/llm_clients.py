@@ -0,0 +1,168 @@
+"""Prozessweite Registry für LLM-Clients mit gemeinsamen HTTP-Verbindungspools."""
+
+import os
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+# Standard-Modell der Pipeline (Azure-Deployment)
+DEFAULT_PROVIDER = "azure"
+DEFAULT_MODEL = "gpt-5"
+AZURE_ENDPOINT = "https://api.competence-centre-cc-genai-prod.enbw-az.cloud/openai/deployments"
+AZURE_API_VERSION = "2024-10-21"
+
+
+# Schlüssel eines Clients: (Provider, Modell, Temperatur, Endpoint)
+ClientKey = Tuple[str, str, Optional[float], Optional[str]]
+
+
+class LLMClientRegistry:
+    """
+    Baut pro (Provider, Modell, Temperatur, Endpoint) genau einen Client und gibt ihn wieder aus.
+
+    - Alle Clients eines Providers teilen sich einen HTTP-Client mit Keep-Alive
+      (synchron und async), statt pro Aufruf neue Verbindungen aufzubauen
+    - Zählt Erstellungen und Abrufe pro Schlüssel
+    """
+
+    def __init__(self, max_connections: int = 20, keepalive_expiry: float = 60.0, timeout: float = 120.0):
+        """Initialisiere die Registry (Clients werden beim ersten Abruf erstellt)."""
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+
+        self._clients: Dict[ClientKey, object] = {}
+        self._http: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+
+        # Zähler
+        self.created: Counter = Counter()
+        self.lookups: Counter = Counter()
+
+    def _http_clients(self, provider: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """Gemeinsame HTTP-Clients (Verbindungspools) pro Provider."""
+        if provider not in self._http:
+            self._http[provider] = (
+                httpx.Client(limits=self.limits, timeout=self.timeout),
+                httpx.AsyncClient(limits=self.limits, timeout=self.timeout),
+            )
+        return self._http[provider]
+
+    def _build(self, provider: str, model: str, temperature: Optional[float], endpoint: Optional[str]):
+        """Erstellt einen neuen LangChain-Chat-Client."""
+        if provider == "stub":
+            # Lokaler, deterministischer Client ohne Netzwerk (Offline-Betrieb)
+            from src.core.stub_llm import StubLLM
+            return StubLLM(latency=0.0, model_name=model)
+
+        http_client, http_async_client = self._http_clients(provider)
+        # Temperatur nur setzen, wenn angegeben (manche Modelle erlauben nur den Standardwert)
+        extra = {"temperature": temperature} if temperature is not None else {}
+
+        if provider == "azure":
+            from langchain_openai import AzureChatOpenAI
+            endpoint = (endpoint or os.environ.get("AZURE_OPENAI_ENDPOINT", AZURE_ENDPOINT)).rstrip("/")
+            return AzureChatOpenAI(
+                base_url=f"{endpoint}/{model}",
+                openai_api_version=AZURE_API_VERSION,
+                api_key=os.environ.get("api_key", ""),
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **extra,
+            )
+
+        if provider == "openai":
+            from langchain_openai import ChatOpenAI
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key and not endpoint:
+                raise ValueError("OPENAI_API_KEY not set")
+            # Mit endpoint: beliebiger OpenAI-kompatibler Server (z.B. lokales vLLM oder Ollama)
+            if endpoint:
+                extra["base_url"] = endpoint
+            return ChatOpenAI(
+                model=model,
+                api_key=api_key or "local",
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **extra,
+            )
+
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    def get(self, provider: str = DEFAULT_PROVIDER, model: str = DEFAULT_MODEL,
+            temperature: Optional[float] = None, endpoint: Optional[str] = None):
+        """
+        Gibt den Client für (Provider, Modell, Temperatur, Endpoint) zurück.
+
+        Args:
+            provider: "azure", "openai" oder "stub" (lokal, ohne Netzwerk)
+            model: Modell- bzw. Deployment-Name
+            temperature: Temperatur (None = Standard des Modells)
+            endpoint: Abweichender Endpoint (None = Standard des Providers)
+
+        Returns:
+            Wiederverwendbarer LangChain-Chat-Client
+        """
+        key = (provider, model, temperature, endpoint)
+        with self._lock:
+            self.lookups[key] += 1
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(provider, model, temperature, endpoint)
+                self._clients[key] = client
+                self.created[key] += 1
+            return client
+
+    def stats(self) -> dict:
+        """Gibt Anzahl Erstellungen und Abrufe pro Client zurück."""
+        with self._lock:
+            clients = [
+                {
+                    "provider": provider,
+                    "model": model,
+                    "temperature": temperature,
+                    "endpoint": endpoint,
+                    "created": self.created[(provider, model, temperature, endpoint)],
+                    "lookups": self.lookups[(provider, model, temperature, endpoint)],
+                }
+                for provider, model, temperature, endpoint in self._clients
+            ]
+        return {
+            "clients": clients,
+            "total_created": sum(self.created.values()),
+            "total_lookups": sum(self.lookups.values()),
+            "http_pools": len(self._http),
+        }
+
+    async def aclose(self) -> None:
+        """Schließt alle HTTP-Verbindungen; Clients werden beim nächsten Abruf neu erstellt."""
+        with self._lock:
+            http, self._http = self._http, {}
+            self._clients.clear()
+        for client, async_client in http.values():
+            client.close()
+            await async_client.aclose()
+
+
+# Prozessweite Registry, damit Pipeline und alle Tools dieselben Clients nutzen
+_default_registry: Optional[LLMClientRegistry] = None
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """Gibt die prozessweite Client-Registry zurück (wird bei Bedarf erstellt)."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = LLMClientRegistry()
+    return _default_registry
+
+
+def get_llm(provider: str = DEFAULT_PROVIDER, model: str = DEFAULT_MODEL, temperature: Optional[float] = None,
+            endpoint: Optional[str] = None):
+    """Kurzform für get_llm_registry().get(...)."""
+    return get_llm_registry().get(provider, model, temperature, endpoint)
@@ -0,0 +1,179 @@
+"""Lade-Profile für Seiten-Scans: Ressourcen-Blockierung und Bereitschafts-Erkennung."""
+
+import time
+from dataclasses import dataclass
+from typing import FrozenSet, Literal, Union
+from urllib.parse import urlsplit
+
+from src.core.tracing import record
+
+
+# Bekannte Tracking-/Werbe-Hosts (Treffer auch für Subdomains)
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "facebook.net", "hotjar.com", "hotjar.io",
+    "segment.io", "segment.com", "mixpanel.com", "nr-data.net", "newrelic.com", "clarity.ms",
+    "scorecardresearch.com", "criteo.com", "criteo.net", "taboola.com", "outbrain.com",
+    "optimizely.com", "fullstory.com", "intercom.io", "sentry.io", "bat.bing.com",
+)
+
+# Wartet, bis `quiet` ms keine DOM-Mutation mehr kam (spätestens nach `max` ms)
+DOM_STABLE_JS = """([quiet, max]) => new Promise(resolve => {
+    const start = performance.now();
+    let timer;
+    const done = (stable) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(cap);
+        resolve({stable, waited: performance.now() - start});
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => done(true), quiet);
+    });
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    timer = setTimeout(() => done(true), quiet);
+    const cap = setTimeout(() => done(false), max);
+})"""
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """
+    Beschreibt, wie eine Seite für einen Scan geladen wird.
+
+    Für die Extraktion wird nur das DOM gebraucht; Bilder, Fonts, Videos und
+    Tracker kosten Zeit und halten `networkidle` bei Long-Polling offen.
+    """
+    name: str
+    # Ressourcen-Typen von Playwright (image, media, font, stylesheet, ...), die abgebrochen werden
+    block_resource_types: FrozenSet[str] = frozenset()
+    block_trackers: bool = False     # Bekannte Analytics-/Werbe-Hosts blockieren
+    block_third_party: bool = False  # Alle Anfragen an fremde Sites blockieren (Navigation ausgenommen)
+    # networkidle/load/domcontentloaded wie bei page.goto; dom_stable = Ruhephase ohne DOM-Mutationen
+    wait_until: Literal["networkidle", "load", "domcontentloaded", "dom_stable"] = "networkidle"
+    timeout_ms: int = 30000          # Timeout der Navigation
+    quiet_ms: int = 500              # dom_stable: benötigte Ruhephase
+    stable_timeout_ms: int = 5000    # dom_stable: spätestens dann gilt die Seite als bereit
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.block_resource_types or self.block_trackers or self.block_third_party)
+
+
+LOAD_PROFILES = {
+    # Bisheriges Verhalten: alles laden, auf networkidle warten
+    "full": LoadProfile("full"),
+    # Nur was das DOM beeinflusst: Skripte und Styles laden, Medien und Tracker nicht
+    "fast": LoadProfile(
+        "fast",
+        block_resource_types=frozenset({"image", "media", "font"}),
+        block_trackers=True,
+        wait_until="dom_stable",
+    ),
+    # Zusätzlich Styles und alle Fremd-Hosts blockieren (für reine Server-HTML-Seiten)
+    "minimal": LoadProfile(
+        "minimal",
+        block_resource_types=frozenset({"image", "media", "font", "stylesheet", "texttrack", "manifest", "other"}),
+        block_trackers=True,
+        block_third_party=True,
+        wait_until="dom_stable",
+        quiet_ms=300,
+        stable_timeout_ms=3000,
+    ),
+}
+DEFAULT_LOAD_PROFILE = "fast"
+
+
+def get_load_profile(profile: Union[str, LoadProfile, None] = None) -> LoadProfile:
+    """Löst einen Profil-Namen (oder None = Standard) in ein LoadProfile auf."""
+    if isinstance(profile, LoadProfile):
+        return profile
+    name = profile or DEFAULT_LOAD_PROFILE
+    if name not in LOAD_PROFILES:
+        raise ValueError(f"Unknown load profile: {name} (available: {', '.join(LOAD_PROFILES)})")
+    return LOAD_PROFILES[name]
+
+
+def site_of(host: str) -> str:
+    """Grobe registrierbare Domain (example.com, example.co.uk) ohne Public-Suffix-Liste."""
+    labels = host.lower().split(".")
+    if len(labels) >= 3 and len(labels[-2]) <= 3 and len(labels[-1]) == 2:
+        return ".".join(labels[-3:])  # z.B. co.uk, com.au
+    return ".".join(labels[-2:])
+
+
+def _is_tracker(host: str) -> bool:
+    return any(host == t or host.endswith("." + t) for t in TRACKER_HOSTS)
+
+
+async def apply_load_profile(page, profile: LoadProfile, url: str) -> dict:
+    """
+    Registriert das Request-Routing für eine Page.
+
+    Returns:
+        Zähler-Dict {"blocked": n}, wird während des Ladens aktualisiert
+    """
+    counters = {"blocked": 0}
+    if not profile.blocks_requests:
+        return counters
+
+    page_site = site_of(urlsplit(url).hostname or "")
+
+    async def handle(route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        # Navigationen (auch Redirects auf andere Hosts) nie blockieren
+        is_main_navigation = request.is_navigation_request() and request.frame == page.main_frame
+        blocked = not is_main_navigation and (
+            request.resource_type in profile.block_resource_types
+            or (profile.block_trackers and _is_tracker(host))
+            or (profile.block_third_party and site_of(host) != page_site)
+        )
+        if blocked:
+            counters["blocked"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle)
+    return counters
+
+
+async def load_page(page, url: str, profile: LoadProfile) -> dict:
+    """
+    Navigiert zur URL gemäß Profil und wartet, bis die Seite bereit ist.
+
+    Returns:
+        Lade-Infos: profile, time_to_ready_ms, ready ("networkidle", "dom_stable",
+        "stable_timeout", ...) und blocked_requests
+    """
+    counters = await apply_load_profile(page, profile, url)
+    start = time.perf_counter()
+
+    if profile.wait_until != "dom_stable":
+        await page.goto(url, wait_until=profile.wait_until, timeout=profile.timeout_ms)
+        ready = profile.wait_until
+    else:
+        await page.goto(url, wait_until="domcontentloaded", timeout=profile.timeout_ms)
+        ready = await _wait_dom_stable(page, profile)
+
+    return {
+        "profile": profile.name,
+        "ready": ready,
+        "time_to_ready_ms": round((time.perf_counter() - start) * 1000, 1),
+        "blocked_requests": counters["blocked"],
+    }
+
+
+async def _wait_dom_stable(page, profile: LoadProfile) -> str:
+    """Wartet auf eine Ruhephase ohne DOM-Mutationen (mit einem Versuch nach Client-Redirects)."""
+    args = [profile.quiet_ms, profile.stable_timeout_ms]
+    try:
+        result = await page.evaluate(DOM_STABLE_JS, args)
+    except Exception:
+        # Kontext wurde durch eine Navigation (z.B. JS-Redirect) zerstört: neue Seite abwarten
+        record(retries=1)
+        await page.wait_for_load_state("domcontentloaded", timeout=profile.timeout_ms)
+        result = await page.evaluate(DOM_STABLE_JS, args)
+    return "dom_stable" if result.get("stable") else "stable_timeout"
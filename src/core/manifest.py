@@ -0,0 +1,82 @@
+"""Manifest der generierten Artefakte für inkrementelle Pipeline-Läufe."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.core.schemas import PageJob
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """SHA-256 einer Datei oder None, falls sie nicht existiert."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+class RunManifest:
+    """
+    Merkt sich pro URL, woraus POM und Tests zuletzt generiert wurden.
+
+    Ein Eintrag enthält den strukturellen Fingerabdruck des DOM, einen Hash der
+    Generierungs-Einstellungen, das extrahierte UI-Modell sowie Pfade und Hashes
+    der erzeugten Dateien. Stimmen Fingerabdruck und Einstellungen überein und
+    liegen die Dateien unverändert auf der Platte, kann die Seite übersprungen werden.
+    """
+
+    def __init__(self, path: str = "out/.manifest.json"):
+        """Initialisiere das Manifest (die Datei wird beim ersten Zugriff gelesen)."""
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text()).get("pages", {})
+            except (FileNotFoundError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def lookup(self, url: str, fingerprint: str, settings: str) -> Optional[Dict[str, Any]]:
+        """
+        Gibt den Eintrag zurück, wenn die Seite nicht neu generiert werden muss.
+
+        Returns:
+            Eintrag mit model, pom_path, test_path oder None (neu generieren)
+        """
+        entry = self.entries.get(url)
+        if not entry or entry.get("fingerprint") != fingerprint or entry.get("settings") != settings:
+            return None
+        # Dateien müssen noch existieren und dürfen nicht überschrieben worden sein
+        for kind in ("pom", "test"):
+            path = entry.get(f"{kind}_path")
+            if not path or file_sha256(path) != entry.get(f"{kind}_sha256"):
+                return None
+        return entry
+
+    def record(self, job: PageJob, settings: str) -> None:
+        """Übernimmt einen erfolgreich verarbeiteten Job (mit den aktuellen Datei-Hashes)."""
+        if not job.fingerprint or not job.pom_path or not job.test_path:
+            return
+        self.entries[job.url] = {
+            "fingerprint": job.fingerprint,
+            "settings": settings,
+            "model": job.model,
+            "pom_path": job.pom_path,
+            "pom_sha256": file_sha256(job.pom_path),
+            "test_path": job.test_path,
+            "test_sha256": file_sha256(job.test_path),
+            "updated_at": time.time(),
+        }
+
+    def save(self) -> None:
+        """Schreibt das Manifest atomar auf die Platte."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 1, "pages": self.entries}, indent=2))
+        os.replace(tmp, self.path)
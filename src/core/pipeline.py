@@ -1,28 +1,77 @@
 """LangGraph Pipeline für Playwright Test-Generierung."""
 
 import asyncio
+import hashlib
+import json
+import re
 import subprocess
-import os
+import time
+from contextlib import aclosing
 from pathlib import Path
-from typing import Optional
+from urllib.parse import urlparse
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
-from langchain_openai import AzureChatOpenAI
 
 
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
 
-from src.core.schemas import Ctx, PageJob
+from src.core.schemas import Ctx, Diagnostic, PageJob
 from src.core.colors import print_info, print_success, print_error, print_section, print_header
-from src.core.config import TestGenerationConfig, DEFAULT_CONFIG
-from src.tools.crawl_links import crawl_links
+from src.core.config import LLM_STAGES, TestGenerationConfig, DEFAULT_CONFIG
+from src.core.browser_pool import BrowserPool
+from src.core.capture_cache import CaptureCache, get_capture_cache
+from src.core.checkpoint import SqliteCheckpointer
+from src.core.components import ComponentDetector, SharedComponent
+from src.core.crawler import SiteCrawler
+from src.core.llm_cache import describe_llm
+from src.core.llm_clients import get_llm
+from src.core.dom_reducer import structure_fingerprint
+from src.core.manifest import RunManifest
+from src.core.tracing import Tracer, aggregate, current_tracer, page_metrics, record, span, use_tracer
 from src.tools.scan_site import scan_site
-from src.tools.extract_model import extract_model
-from src.tools.generate_pom import generate_pom
-from src.tools.generate_tests_ts import generate_tests_ts
-from src.tools.verify_pom import verify_pom
-from src.tools.repair import repair_file
+from src.tools.extract_model import aextract_model
+from src.tools.generate_pom import agenerate_pom
+from src.tools.generate_tests_ts import TestBatcher, generate_tests_ts
+from src.tools.template_tests_ts import generate_template_tests
+from src.tools.verify_pom import is_valid, verify_poms
+from src.tools.verify_tests_ts import verify_tests_ts
+from src.tools.repair import arepair_region
+
+
+# Fehlermeldungen der Prüf-Schritte; nach erfolgreicher Reparatur werden sie entfernt
+VERIFY_ERRORS = ("Verification failed", "Type check failed")
+
+# Fortschritts-Callback: (fortschritt, gesamt, nachricht), z.B. für MCP-Progress-Notifications
+ProgressCallback = Callable[[float, Optional[float], str], Awaitable[None]]
+# Gemeldete Schritte außer den Seiten: crawling, processing, verifying, type-checking, repairing, done
+STAGE_STEPS = 6
+
+
+@dataclass
+class _RunState:
+    """Laufzeit-Objekte eines Pipeline-Laufs, die nicht in den LangGraph-State gehören."""
+    link_stream: Optional[asyncio.Queue] = None   # Links aus dem Hintergrund-Crawl
+    crawl_task: Optional[asyncio.Task] = None     # Hintergrund-Crawl
+    crawl_done: bool = False                      # Stream vollständig gelesen oder Limit erreicht
+    progress: Optional[ProgressCallback] = None   # Fortschrittsmeldungen an den Aufrufer
+    cancel: Optional[asyncio.Event] = None        # Gesetzt = Lauf abbrechen, Teilergebnis liefern
+    steps: int = 0                                # Bisher gemeldete Schritte
+    pages_done: int = 0                           # Fertig verarbeitete Seiten
+    processing_started: Optional[float] = None    # Start der Seitenverarbeitung (für ETA)
+
+
+@dataclass
+class _ComponentRun:
+    """Gemeinsame Komponenten eines Laufs: Erkennung und einmalige Generierung pro Komponente."""
+    detector: ComponentDetector
+    tasks: Dict[str, asyncio.Task] = field(default_factory=dict)   # Fingerabdruck -> Generierung (PageJob)
+
+    def jobs(self) -> List[PageJob]:
+        """Fertig generierte Komponenten-Jobs."""
+        return [t.result() for t in self.tasks.values() if t.done() and not t.cancelled()]
 
 
 class PlaywrightPipeline:
@@ -33,18 +82,41 @@ class PlaywrightPipeline:
     1. Crawling → 2. Processing → 3. Verify → 4. Repair → 5. Summary → 6. UI öffnen
     """
 
-    def __init__(self, config: TestGenerationConfig = None):
-        """Initialisiere die Pipeline mit optionaler Konfiguration."""
+    def __init__(self, config: TestGenerationConfig = None, browser_pool: Optional[BrowserPool] = None,
+                 capture_cache: Optional[CaptureCache] = None, manifest: Optional[RunManifest] = None,
+                 llm=None, checkpointer: Optional[SqliteCheckpointer] = None):
+        """Initialisiere die Pipeline mit optionaler Konfiguration, Browser-Pool, Capture-Cache, Manifest, LLM und Checkpointer."""
         self.config = config or DEFAULT_CONFIG
-        
-        self.llm_gpt5 = AzureChatOpenAI(
-            base_url="https://api.competence-centre-cc-genai-prod.enbw-az.cloud/openai/deployments/gpt-5",
-            openai_api_version="2024-10-21",
-            api_key=os.environ.get("api_key", ""),
-        )
+
+        # Fester LLM-Client für alle Stufen (z.B. Stub für Benchmarks), sonst Routing laut Config
+        self._llm = llm
+
+        # Ein langlebiger Browser für alle Scans statt eines Kaltstarts pro Aufruf
+        self.browser_pool = browser_pool or BrowserPool()
+
+        # Jede Seite wird höchstens einmal geladen; Crawl, Scan und Tests lesen aus dem Cache
+        self.capture_cache = capture_cache or get_capture_cache()
+
+        # Unveränderte Seiten werden bei erneuten Läufen nicht neu generiert
+        self.manifest = manifest or RunManifest()
+
+        # Zustand nach jedem Schritt und fertige Seiten auf der Platte: abgebrochene Läufe sind fortsetzbar
+        self.checkpointer = checkpointer
+        if self.checkpointer is None and self.config.checkpoint_path:
+            self.checkpointer = SqliteCheckpointer(self.config.checkpoint_path)
+
+        # Laufzeit-Zustand pro laufender Ausführung (run_id -> _RunState)
+        self._runs: Dict[str, _RunState] = {}
         
         self.graph = self._build_graph()
 
+    def llm_for(self, stage: str):
+        """Übergebener LLM-Client oder der Client der Stufe laut config.route_for (aus der Registry)."""
+        if self._llm is not None:
+            return self._llm
+        route = self.config.route_for(stage)
+        return get_llm(route.provider, route.model, route.temperature, route.endpoint)
+
     def _build_graph(self):
         """Baut den LangGraph Workflow mit allen Nodes und Edges."""
 
@@ -53,12 +125,32 @@ class PlaywrightPipeline:
             SCHRITT 1: Crawle Basis-URL und finde alle Links.
             
             Nutzt Playwright um alle Links auf der Startseite zu finden.
+            Im nebenläufigen Modus läuft der Crawl im Hintergrund weiter und
+            der Node kehrt zurück, sobald die ersten Links vorliegen.
             """
             print_section("Crawling")
+            if await self._stage(state, "crawling"):
+                return state
+            run = self._runs.get(state.run_id)
+            if self.config.concurrent_pages and run is not None:
+                run.link_stream = asyncio.Queue()
+                run.crawl_task = asyncio.create_task(self._crawl_into(state, run.link_stream))
+                if await self._until_cancelled(state, self._take_links(state, run, block=True)):
+                    return state
+                print_success(f"Found {len(state.links)} links (crawl continues in background)")
+                return state
+
             try:
-                result = await crawl_links(state.base_url)
-                all_links = result.get("links", [])
-                state.links = all_links[:state.max_pages] if state.max_pages else all_links
+                crawler = self._make_crawler(state)
+
+                async def collect():
+                    async with aclosing(crawler.crawl()) as links:
+                        async for link in links:
+                            state.links.append(link)
+
+                if await self._until_cancelled(state, collect()):
+                    return state
+                state.errors.extend(f"Crawl error: {e}" for e in crawler.errors)
                 print_success(f"Found {len(state.links)} links")
                 return state
             except Exception as e:
@@ -75,87 +167,130 @@ class PlaywrightPipeline:
             - Generiere POM (mit optionaler KI-Verbesserung)
             - Generiere TypeScript-Tests
             """
-            if not state.links:
+            run = self._runs.get(state.run_id)
+            streaming = run is not None and run.link_stream is not None and not run.crawl_done
+            if state.cancelled or (not state.links and not streaming):
                 return state
 
             print_section("Processing")
-            for idx, url in enumerate(state.links, 1):
-                job = PageJob(url=url)
-                
-                try:
-                    # 2.1: Scanne die Seite und hole DOM
-                    page_data = await scan_site(url)
-                    job.dom = page_data.get("dom", "")
-                    
-                    # 2.2: Extrahiere UI-Modell mit LLM
-                    model = extract_model(url, job.dom, state.stories)
-                    job.model = model
-                    
-                    # 2.3: Generiere Klassennamen aus URL
-                    url_part = url.split("/")[-1] or url.split("/")[-2]
-                    class_name = "".join(
-                        word.capitalize() for word in url_part.replace("-", "_").split("_")
-                    ) or "HomePage"
-                    
-                    # 2.4: Generiere POM (mit KI-Enhancement je nach Config)
-                    pom_path = generate_pom(class_name, model, use_ai=self.config.enhance_pom)
-                    job.pom_path = pom_path
-                    
-                    # 2.5: Generiere TypeScript Tests
-                    test_path = generate_tests_ts(pom_path, state.stories)
-                    job.test_path = test_path
-                    
-                    print_success(f"[{idx}/{len(state.links)}] {class_name}")
-                    state.total_processed += 1
-                    
-                except Exception as e:
-                    job.errors.append(str(e))
-                    state.total_errors += 1
-                    print_error(f"[{idx}/{len(state.links)}] Error: {str(e)[:60]}")
+            await self._stage(state, "processing")
+            if run is not None:
+                run.processing_started = time.perf_counter()
+            # Bei Abbruch enthält results nur die fertig verarbeiteten Seiten
+            results: Dict[int, PageJob] = {}
+            # Beim Fortsetzen: schon fertige Seiten aus dem Journal übernehmen
+            done = self.checkpointer.pages(state.run_id) if self.checkpointer is not None else {}
+            if done:
+                print_info(f"Resuming: {len(done)} pages already done")
+            components = self._make_components()
+            if self.config.concurrent_pages:
+                work = self._process_concurrent(state, run if streaming else None, results, components, done)
+            else:
+                work = self._process_sequential(state, results, components, done)
+            await self._until_cancelled(state, work)
 
-                state.jobs[url] = job
+            # Jobs in Link-Reihenfolge übernehmen, damit beide Modi dasselbe Ergebnis liefern
+            for idx in sorted(results):
+                job = results[idx]
+                state.jobs[job.url] = job
+                if job.errors:
+                    state.total_errors += 1
+                else:
+                    state.total_processed += 1
+                    if job.reused:
+                        state.total_reused += 1
+            # Komponenten-POMs und -Specs werden wie Seiten geprüft und repariert
+            for job in components.jobs() if components is not None else []:
+                state.jobs[job.url] = job
 
             return state
 
-        def verify_node(state: Ctx) -> Ctx:
+        async def verify_node(state: Ctx) -> Ctx:
             """
             SCHRITT 3: Verifiziere alle generierten POMs.
             
             Prüft ob die POMs syntaktisch korrekt sind.
             """
+            await self._stage(state, "verifying")
             if not state.jobs:
                 return state
                 
             print_section("Verifying")
-            for url, job in state.jobs.items():
-                if job.pom_path:
-                    try:
-                        ok, msg = verify_pom(job.pom_path)
-                        if not ok:
-                            job.errors.append("Verification failed")
-                    except Exception as e:
-                        job.errors.append(str(e))
+            # Übernommene POMs wurden bereits im Lauf ihrer Generierung geprüft
+            jobs = [job for job in state.jobs.values() if job.pom_path and not job.reused]
+            try:
+                # Alle POMs in einem Durchlauf im selben Prozess prüfen
+                results = await asyncio.to_thread(verify_poms, [job.pom_path for job in jobs])
+            except Exception as e:
+                state.errors.append(f"Verify error: {str(e)}")
+                return state
+
+            for job in jobs:
+                job.diagnostics = results.get(job.pom_path, [])
+                if not is_valid(job.diagnostics):
+                    job.errors.append("Verification failed")
+            print_success(f"Verified {len(jobs)} POMs, {sum(1 for j in jobs if j.errors)} with errors")
             return state
 
-        def repair_node(state: Ctx) -> Ctx:
+        async def verify_ts_node(state: Ctx) -> Ctx:
+            """
+            SCHRITT 3b: Typprüfung aller generierten TypeScript-Specs.
+
+            Ein einziger inkrementeller tsc-Lauf; Befunde werden den Jobs zugeordnet.
             """
-            SCHRITT 4: Repariere fehlerhafte POMs.
+            # Nach einem Abbruch keine langen Schritte mehr starten
+            if await self._stage(state, "type-checking"):
+                return state
+            jobs = [job for job in state.jobs.values() if job.test_path and not job.reused]
+            if not self.config.typecheck_tests or not jobs:
+                return state
+
+            print_section("Type-checking specs")
+            try:
+                result = await verify_tests_ts(
+                    [job.test_path for job in jobs],
+                    base_tsconfig=self.config.tsconfig_path,
+                    timeout=self.config.tsc_timeout,
+                )
+            except Exception as e:
+                state.errors.append(f"Type check error: {str(e)}")
+                return state
+
+            if not result["checked"]:
+                print_info(result["message"])
+                return state
+            for job in jobs:
+                diagnostics = result["files"].get(job.test_path, [])
+                job.diagnostics.extend(diagnostics)
+                if not is_valid(diagnostics):
+                    job.errors.append("Type check failed")
+            # Befunde außerhalb der Specs (z.B. fehlende @types) betreffen keinen einzelnen Job
+            state.errors.extend(f"tsc: {d}" for d in result["other"] if d.severity == "error")
+            print_success(result["message"])
+            return state
+
+        async def repair_node(state: Ctx) -> Ctx:
+            """
+            SCHRITT 4: Repariere fehlerhafte POMs und Specs.
             
-            Nutzt LLM um Syntax-Fehler automatisch zu beheben.
+            Nur die betroffenen Zeilen gehen an das LLM; danach wird erneut geprüft
+            und bei Bedarf mit mehr Kontext wiederholt (siehe _repair_jobs).
             """
-            has_errors = any(job.errors for job in state.jobs.values())
-            if not has_errors:
+            if await self._stage(state, "repairing"):
+                return state
+            # Nur Dateien mit Befunden reparieren (POM und/oder Spec)
+            broken: Dict[str, Dict[str, List[Diagnostic]]] = {}
+            for url, job in state.jobs.items():
+                if not job.errors:
+                    continue
+                for d in job.diagnostics:
+                    if d.severity == "error":
+                        broken.setdefault(url, {}).setdefault(d.file, []).append(d)
+            if not broken:
                 return state
                 
             print_section("Repairing")
-            for url, job in state.jobs.items():
-                if job.errors and job.pom_path:
-                    try:
-                        repair_file(job.pom_path)
-                        job.errors.clear()
-                        print_success("Repaired")
-                    except Exception as e:
-                        pass
+            await self._until_cancelled(state, self._repair_jobs(state, broken))
             return state
 
         def summary_node(state: Ctx) -> Ctx:
@@ -165,10 +300,27 @@ class PlaywrightPipeline:
             Gibt Statistiken über erfolgreiche/fehlgeschlagene Jobs aus.
             """
             print_section("Summary")
-            successful = len([j for j in state.jobs.values() if not j.errors])
-            failed = len([j for j in state.jobs.values() if j.errors])
-            
-            print_success(f"Processed: {len(state.jobs)}, Success: {successful}, Failed: {failed}")
+            # Komponenten-Jobs (Header, Nav, ...) sind keine Seiten und werden getrennt gezählt
+            pages = [j for j in state.jobs.values() if not j.component]
+            successful = len([j for j in pages if not j.errors])
+            failed = len([j for j in pages if j.errors])
+            components = len([j for j in state.jobs.values() if j.component and not j.errors])
+
+            # Erfolgreiche Seiten (nach Reparatur) für den nächsten Lauf merken
+            settings = self._generation_settings(state)
+            for job in state.jobs.values():
+                if not job.errors:
+                    self.manifest.record(job, settings)
+            try:
+                self.manifest.save()
+            except OSError as e:
+                state.errors.append(f"Manifest error: {str(e)}")
+
+            print_success(f"Processed: {len(pages)}, Success: {successful}, Failed: {failed}")
+            shared = f", Shared components: {components}" if components else ""
+            print_info(f"Regenerated: {successful - state.total_reused}, Reused: {state.total_reused}{shared}")
+            if state.cancelled:
+                print_info("Run cancelled: partial result, finished pages were kept")
             return state
         
         def open_playwright_ui_node(state: Ctx) -> Ctx:
@@ -179,7 +331,7 @@ class PlaywrightPipeline:
             """
             # Öffne nur wenn wir erfolgreiche Tests haben
             successful = len([j for j in state.jobs.values() if not j.errors])
-            if successful > 0:
+            if successful > 0 and not state.cancelled and self.config.open_ui:
                 print_section("Opening Playwright UI")
                 try:
                     # Ensure we're in the out directory where tests are
@@ -202,27 +354,583 @@ class PlaywrightPipeline:
         workflow = StateGraph(Ctx)
         
         # Füge alle Nodes (Schritte) hinzu
-        workflow.add_node("crawl", crawl_node)              # 1. Crawling
-        workflow.add_node("process", process_pages_node)    # 2. Processing
-        workflow.add_node("verify", verify_node)            # 3. Verification
-        workflow.add_node("repair", repair_node)            # 4. Reparatur
-        workflow.add_node("summary", summary_node)          # 5. Zusammenfassung
-        workflow.add_node("open_ui", open_playwright_ui_node)  # 6. UI öffnen
+        workflow.add_node("crawl", self._traced("crawl", crawl_node))              # 1. Crawling
+        workflow.add_node("process", self._traced("process", process_pages_node))  # 2. Processing
+        workflow.add_node("verify", self._traced("verify", verify_node))           # 3. Verification
+        workflow.add_node("verify_ts", self._traced("verify_ts", verify_ts_node))  # 3b. TypeScript-Typprüfung
+        workflow.add_node("repair", self._traced("repair", repair_node))           # 4. Reparatur
+        workflow.add_node("summary", self._traced("summary", summary_node))        # 5. Zusammenfassung
+        workflow.add_node("open_ui", self._traced("open_ui", open_playwright_ui_node))  # 6. UI öffnen
         
         # Definiere die Workflow-Reihenfolge (Edges = Pfeile zwischen Nodes)
         workflow.set_entry_point("crawl")          # Start bei "crawl"
         workflow.add_edge("crawl", "process")      # crawl → process
         workflow.add_edge("process", "verify")     # process → verify
-        workflow.add_edge("verify", "repair")      # verify → repair
+        workflow.add_edge("verify", "verify_ts")   # verify → verify_ts
+        workflow.add_edge("verify_ts", "repair")   # verify_ts → repair
         workflow.add_edge("repair", "summary")     # repair → summary
         workflow.add_edge("summary", "open_ui")    # summary → open_ui
         workflow.add_edge("open_ui", END)          # open_ui → ENDE
         
-        # Kompiliere den Graphen zu einem ausführbaren Workflow
-        return workflow.compile()
+        # Kompiliere den Graphen zu einem ausführbaren Workflow (Checkpoint nach jedem Node)
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    @staticmethod
+    def _traced(name: str, node: Callable) -> Callable:
+        """Umhüllt einen Node mit einem Span "node.<name>" (sync und async)."""
+        if asyncio.iscoroutinefunction(node):
+            async def traced(state: Ctx) -> Ctx:
+                with span(f"node.{name}"):
+                    return await node(state)
+        else:
+            def traced(state: Ctx) -> Ctx:
+                with span(f"node.{name}"):
+                    return node(state)
+        traced.__name__ = node.__name__
+        return traced
+
+    def _make_crawler(self, state: Ctx) -> SiteCrawler:
+        """Erstellt den Crawler mit den Crawl-Einstellungen aus der Config."""
+        return SiteCrawler(
+            state.base_url,
+            pool=self.browser_pool,
+            max_depth=self.config.crawl_depth,
+            max_pages=state.max_pages,
+            per_host_concurrency=self.config.crawl_host_concurrency,
+            include=self.config.crawl_include,
+            exclude=self.config.crawl_exclude,
+            cache=self.capture_cache,
+            load_profile=self.config.load_profile,
+            source=self.config.crawl_source,
+        )
+
+    async def _crawl_into(self, state: Ctx, stream: asyncio.Queue) -> None:
+        """Crawlt im Hintergrund und schreibt Links, Fehler und am Ende None in den Stream."""
+        crawler = self._make_crawler(state)
+        try:
+            async with aclosing(crawler.crawl()) as links:
+                async for link in links:
+                    stream.put_nowait(link)
+        except Exception as e:
+            stream.put_nowait(e)
+        finally:
+            for error in crawler.errors:
+                stream.put_nowait(RuntimeError(error))
+            stream.put_nowait(None)
+
+    async def _take_links(self, state: Ctx, run: _RunState, block: bool) -> bool:
+        """
+        Übernimmt neue Links aus dem Crawl-Stream in state.links.
+
+        Mit block=True wird auf mindestens einen Eintrag gewartet, danach wird
+        nur noch übernommen was bereits vorliegt.
+
+        Returns:
+            True wenn noch weitere Links kommen können, sonst False
+        """
+        while not state.max_pages or len(state.links) < state.max_pages:
+            if block:
+                item = await run.link_stream.get()
+                block = False
+            else:
+                try:
+                    item = run.link_stream.get_nowait()
+                except asyncio.QueueEmpty:
+                    return True
+
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                state.errors.append(f"Crawl error: {str(item)}")
+                continue
+            # Ein fortgesetzter Lauf crawlt erneut (aus dem Capture-Cache), bekannte Links kommen doppelt
+            if item not in state.links:
+                state.links.append(item)
+
+        run.crawl_done = True
+        return False
+
+    @staticmethod
+    def _class_name_for(url: str) -> str:
+        """Generiert den POM-Klassennamen aus dem letzten Pfadsegment der URL (Startseite: HomePage)."""
+        url_part = urlparse(url).path.rstrip("/").split("/")[-1]
+        name = "".join(word.capitalize() for word in re.split(r"[^A-Za-z0-9]+", url_part))
+        if name[:1].isdigit():
+            name = "Page" + name
+        return name or "HomePage"
+
+    async def _scan_stage(self, job: PageJob) -> None:
+        """Browser-Stufe: Scanne die Seite und hole das DOM."""
+        with page_metrics(job.metrics), span("tool.scan_site", url=job.url):
+            page_data = await scan_site(
+                job.url, pool=self.browser_pool, cache=self.capture_cache, load_profile=self.config.load_profile
+            )
+            job.dom = page_data.get("dom", "")
+            # Ladezeit stammt aus dem Capture (auch wenn der Crawl die Seite geladen hat)
+            load = page_data.get("load") or {}
+            record(nav_seconds=(load.get("time_to_ready_ms") or 0) / 1000, dom_bytes=len(job.dom.encode("utf-8")))
+
+    def _generation_settings(self, state: Ctx) -> str:
+        """Hash aller Einstellungen, die den Inhalt von POM und Tests beeinflussen."""
+        c = self.config
+        # Routen statt Clients hashen (kein Client-Aufbau nur für den Vergleich)
+        llm = list(describe_llm(self._llm)) if self._llm is not None else {
+            stage: asdict(c.route_for(stage)) for stage in LLM_STAGES
+        }
+        settings = {
+            "llm": llm,
+            "stories": state.stories,
+            "quality": [c.quality, c.include_happy_path, c.include_error_cases, c.include_edge_cases,
+                        c.include_accessibility, c.max_tests_per_page],
+            "enhance": [c.enhance_pom, c.enhance_tests],
+            "tests_mode": [c.single_call_tests, c.tests_batch_size],
+            "dom_token_budget": [c.dom_token_budget, c.extract_max_chunks],
+            "extractor": c.extractor,
+            "components": [c.shared_components, c.component_sample_pages, c.component_min_share],
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _reuse_from_manifest(self, job: PageJob, state: Ctx) -> bool:
+        """
+        Prüft vor jedem LLM-Aufruf, ob die Seite seit dem letzten Lauf unverändert ist.
+
+        Returns:
+            True wenn Modell, POM und Tests aus dem Manifest übernommen wurden
+        """
+        job.fingerprint = structure_fingerprint(job.dom)
+        if state.force:
+            return False
+        entry = self.manifest.lookup(job.url, job.fingerprint, self._generation_settings(state))
+        if entry is None:
+            return False
+        job.model = entry.get("model")
+        job.pom_path = entry["pom_path"]
+        job.test_path = entry["test_path"]
+        job.reused = True
+        return True
+
+    async def _llm_stage(self, job: PageJob, stories: str, batcher: Optional[TestBatcher] = None,
+                         components: Optional[_ComponentRun] = None) -> str:
+        """
+        LLM-Stufe: UI-Modell, POM und TypeScript-Tests für eine gescannte Seite.
+
+        Mit `batcher` werden die Tests kleiner Seiten gebündelt mit anderen Seiten erzeugt.
+        Mit `components` fehlen gemeinsame Komponenten in Extraktion und Test-Prompt;
+        das POM der Seite verweist stattdessen auf deren POMs.
+
+        Returns:
+            Klassenname des generierten POMs
+        """
+        with page_metrics(job.metrics):
+            dom, refs, shared_texts = job.dom, {}, ()
+            if components is not None:
+                dom, refs = await self._use_components(job, stories, components)
+                shared_texts = components.detector.texts if refs else ()
+
+            # Extrahiere UI-Modell (Regeln und/oder LLM je nach Config)
+            with span("tool.extract_model", url=job.url, extractor=self.config.extractor):
+                job.model = await aextract_model(
+                    job.url, dom, stories,
+                    llm=self.llm_for("extract") if self.config.extractor != "heuristic" else None,
+                    use_cache=self.config.use_llm_cache, token_budget=self.config.dom_token_budget,
+                    max_chunks=self.config.extract_max_chunks, extractor=self.config.extractor,
+                )
+
+            # Generiere POM (mit KI-Enhancement je nach Config)
+            class_name = self._class_name_for(job.url)
+            with span("tool.generate_pom", url=job.url):
+                job.pom_path = await agenerate_pom(
+                    class_name, job.model, use_ai=self.config.enhance_pom, llm=self.llm_for("pom"),
+                    use_cache=self.config.use_llm_cache, components=refs,
+                )
+
+            # Generiere TypeScript Tests (ohne enhance_tests aus Templates)
+            with span("tool.generate_tests_ts", url=job.url, template=not self.config.enhance_tests):
+                if not self.config.enhance_tests:
+                    job.test_path = self._template_tests(job)
+                elif batcher is not None:
+                    job.test_path = await batcher.generate(job.pom_path)
+                else:
+                    job.test_path = await generate_tests_ts(
+                        job.pom_path, stories, llm=self.llm_for("tests"), pool=self.browser_pool,
+                        cache=self.capture_cache, use_cache=self.config.use_llm_cache,
+                        load_profile=self.config.load_profile, scenario_llm=self.llm_for("scenarios"),
+                        single_call=self.config.single_call_tests, exclude_texts=shared_texts,
+                    )
+        return class_name
+
+    def _template_tests(self, job: PageJob) -> str:
+        """Spec aus dem UI-Modell ohne LLM und ohne erneuten Seiten-Scan."""
+        c = self.config
+        return generate_template_tests(
+            Path(job.pom_path).stem, job.model or {}, include_happy_path=c.include_happy_path,
+            include_error_cases=c.include_error_cases, max_tests=c.max_tests_per_page,
+        )
+
+    def _make_components(self) -> Optional[_ComponentRun]:
+        """Komponenten-Erkennung laut Config (None = jede Seite vollständig)."""
+        c = self.config
+        if not c.shared_components:
+            return None
+        # Die LLM-Worker warten auf die Stichprobe: nie mehr Seiten verlangen, als vor ihnen Platz haben
+        sample = c.component_sample_pages
+        if c.concurrent_pages:
+            sample = min(sample, c.queue_size + c.llm_workers)
+        return _ComponentRun(ComponentDetector(sample, c.component_min_share))
+
+    async def _use_components(self, job: PageJob, stories: str, components: _ComponentRun):
+        """
+        Entfernt die gemeinsamen Komponenten aus dem DOM der Seite und stellt
+        sicher, dass ihre POMs (einmal pro Lauf) generiert sind.
+
+        Returns:
+            (DOM für die Extraktion, Attributname -> Komponenten-Klasse fürs Seiten-POM);
+            schlägt eine Komponente fehl, bleibt die Seite vollständig
+        """
+        await components.detector.wait()
+        dom, used = components.detector.strip(job.dom)
+        if not used:
+            return job.dom, {}
+        for component in used:
+            if component.fingerprint not in components.tasks:
+                components.tasks[component.fingerprint] = asyncio.ensure_future(
+                    self._component_stage(component, stories)
+                )
+        generated = await asyncio.gather(*(components.tasks[c.fingerprint] for c in used))
+        if any(g.errors for g in generated):
+            return job.dom, {}
+        record(shared_components=len(used), shared_dom_bytes=len(job.dom) - len(dom))
+        return dom, {c.name: c.class_name for c in used}
+
+    async def _component_stage(self, component: SharedComponent, stories: str) -> PageJob:
+        """Modell, POM und Spec einer gemeinsamen Komponente (einmal pro Lauf)."""
+        job = PageJob(url=f"{component.url}#{component.class_name}", dom=component.html,
+                      component=component.class_name)
+        c = self.config
+        try:
+            with page_metrics(job.metrics), span("tool.component", component=component.class_name):
+                job.model = await aextract_model(
+                    component.url, component.html, stories,
+                    llm=self.llm_for("extract") if c.extractor != "heuristic" else None,
+                    use_cache=c.use_llm_cache, token_budget=c.dom_token_budget, extractor=c.extractor,
+                )
+                # generate_pom setzt den Klassennamen aus "_"-getrennten Wörtern zusammen
+                job.pom_path = await agenerate_pom(
+                    re.sub(r"(?<!^)(?=[A-Z0-9])", "_", component.class_name), job.model,
+                    use_ai=c.enhance_pom, llm=self.llm_for("pom"),
+                    use_cache=c.use_llm_cache,
+                )
+                if not c.enhance_tests:
+                    job.test_path = self._template_tests(job)
+                else:
+                    job.test_path = await generate_tests_ts(
+                        job.pom_path, stories, llm=self.llm_for("tests"), pool=self.browser_pool,
+                        cache=self.capture_cache, use_cache=c.use_llm_cache, load_profile=c.load_profile,
+                        scenario_llm=self.llm_for("scenarios"), single_call=c.single_call_tests,
+                    )
+            print_success(f"Shared {component.kind}: {component.class_name} (on {component.pages} sampled pages)")
+        except Exception as e:
+            job.errors.append(str(e))
+            print_error(f"Shared {component.kind} {component.class_name}: {str(e)[:60]}")
+        job.dom = ""
+        return job
+
+    async def _process_sequential(self, state: Ctx, results: Dict[int, PageJob],
+                                  components: Optional[_ComponentRun] = None,
+                                  done: Optional[Dict[str, PageJob]] = None) -> None:
+        """
+        Verarbeitet alle Seiten streng nacheinander (Ergebnisse nach Index in `results`).
+        Seiten aus `done` (Journal eines fortgesetzten Laufs) werden übernommen.
+        """
+        done = done or {}
+        if components is not None:
+            # Stichprobe vorab scannen (landet im Capture-Cache, die Seiten werden nicht erneut geladen)
+            for url in [u for u in state.links if u not in done][:components.detector.sample_pages]:
+                try:
+                    capture = await scan_site(url, pool=self.browser_pool, cache=self.capture_cache,
+                                              load_profile=self.config.load_profile)
+                    dom = capture.get("dom", "")
+                except Exception:
+                    dom = ""  # Fehler meldet der eigentliche Scan der Seite
+                components.detector.observe(url, dom)
+            components.detector.close()
+
+        for idx, url in enumerate(state.links, 1):
+            if url in done:
+                results[idx] = done[url]
+                continue
+            job = PageJob(url=url)
+            try:
+                await self._scan_stage(job)
+                if self._reuse_from_manifest(job, state):
+                    print_info(f"[{idx}/{len(state.links)}] Unchanged, reused {job.pom_path}")
+                else:
+                    class_name = await self._llm_stage(job, state.stories, components=components)
+                    print_success(f"[{idx}/{len(state.links)}] {class_name}")
+            except Exception as e:
+                job.errors.append(str(e))
+                print_error(f"[{idx}/{len(state.links)}] Error: {str(e)[:60]}")
+            results[idx] = job
+            await self._page_done(state, job)
+
+    async def _process_concurrent(self, state: Ctx, run: Optional[_RunState], results: Dict[int, PageJob],
+                                  components: Optional[_ComponentRun] = None,
+                                  done: Optional[Dict[str, PageJob]] = None) -> None:
+        """
+        Verarbeitet Seiten als Producer/Consumer-Pipeline.
+
+        Producer (Links) → scan_queue → Scan-Worker → llm_queue → LLM-Worker.
+        Beide Worker-Pools sind unabhängig dimensioniert, sodass Seite N+1
+        gescannt wird während Seite N noch auf das LLM wartet. Mit `run`
+        werden zusätzlich Links aus dem laufenden Crawl nachgeladen. Seiten
+        landen erst nach Abschluss in `results`. Mit `components` bilden die
+        ersten gescannten Seiten die Stichprobe für gemeinsame Komponenten.
+        Seiten aus `done` (Journal eines fortgesetzten Laufs) werden übernommen.
+        """
+        done = done or {}
+        scan_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.queue_size)
+        llm_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.queue_size)
+        batcher = self._make_batcher(state, components)
+
+        async def produce():
+            queued = 0
+            more = run is not None
+            while True:
+                # Alle bekannten Links einreihen, dann auf neue aus dem Crawl warten
+                while queued < len(state.links):
+                    queued += 1
+                    url = state.links[queued - 1]
+                    if url in done:
+                        results[queued] = done[url]
+                    else:
+                        await scan_queue.put((queued, url))
+                if not more:
+                    break
+                more = await self._take_links(state, run, block=True)
+            for _ in range(self.config.scan_workers):
+                await scan_queue.put(None)
+
+        async def scan_worker():
+            while (item := await scan_queue.get()) is not None:
+                idx, url = item
+                job = PageJob(url=url)
+                try:
+                    await self._scan_stage(job)
+                except Exception as e:
+                    job.errors.append(str(e))
+                    print_error(f"[{idx}/{len(state.links)}] Error: {str(e)[:60]}")
+                if components is not None:
+                    components.detector.observe(job.url, job.dom)
+                await llm_queue.put((idx, job))
+
+        async def llm_worker():
+            while (item := await llm_queue.get()) is not None:
+                idx, job = item
+                try:
+                    if job.errors:
+                        pass
+                    elif self._reuse_from_manifest(job, state):
+                        print_info(f"[{idx}/{len(state.links)}] Unchanged, reused {job.pom_path}")
+                    else:
+                        class_name = await self._llm_stage(job, state.stories, batcher, components)
+                        print_success(f"[{idx}/{len(state.links)}] {class_name}")
+                except Exception as e:
+                    job.errors.append(str(e))
+                    print_error(f"[{idx}/{len(state.links)}] Error: {str(e)[:60]}")
+                results[idx] = job
+                await self._page_done(state, job)
+
+        scan_tasks = [asyncio.create_task(scan_worker()) for _ in range(self.config.scan_workers)]
+        llm_tasks = [asyncio.create_task(llm_worker()) for _ in range(self.config.llm_workers)]
+        try:
+            await produce()
+            await asyncio.gather(*scan_tasks)
+            if components is not None:
+                components.detector.close()   # Weniger Seiten als die Stichprobe
+            for _ in llm_tasks:
+                await llm_queue.put(None)
+            await asyncio.gather(*llm_tasks)
+        finally:
+            for task in scan_tasks + llm_tasks:
+                task.cancel()
+            if batcher is not None:
+                batcher.cancel()
+
+    def _make_batcher(self, state: Ctx, components: Optional[_ComponentRun] = None) -> Optional[TestBatcher]:
+        """Bündelt die Test-Generierung kleiner Seiten (nur mit mehreren LLM-Workern sinnvoll)."""
+        c = self.config
+        if c.tests_batch_size <= 1 or c.llm_workers <= 1 or not c.single_call_tests or not c.enhance_tests:
+            return None
+        return TestBatcher(
+            state.stories, batch_size=min(c.tests_batch_size, c.llm_workers), max_wait=c.tests_batch_wait,
+            max_elements=c.tests_batch_max_elements, llm=self.llm_for("tests"), pool=self.browser_pool,
+            cache=self.capture_cache, use_cache=c.use_llm_cache, load_profile=c.load_profile,
+            # Wird bei der Komponenten-Entscheidung befüllt (vor der ersten Test-Generierung)
+            exclude_texts=components.detector.texts if components is not None else (),
+        )
+
+    async def _report(self, state: Ctx, stage: str, detail: str = "") -> None:
+        """
+        Meldet einen Schritt an den Fortschritts-Callback des Laufs.
+
+        Fortschritt zählt die gemeldeten Schritte (Beginn jedes Schritts und
+        jede fertige Seite). Solange der Crawl läuft, ist die
+        Gesamtzahl eine Obergrenze aus max_pages.
+        """
+        run = self._runs.get(state.run_id)
+        if run is None or run.progress is None:
+            return
+        run.steps += 1
+        crawling = not run.crawl_done and (run.link_stream is not None or not state.links)
+        expected = max(state.max_pages, len(state.links)) if crawling else len(state.links)
+        # Die letzte Meldung schließt den Fortschritt ab (progress == total)
+        total = run.steps if stage in ("done", "cancelled") else max(expected + STAGE_STEPS, run.steps)
+        message = f"{stage}: {run.pages_done}/{expected} pages"
+        if stage == "processing" and run.processing_started and 0 < run.pages_done < expected:
+            elapsed = time.perf_counter() - run.processing_started
+            message += f", ETA {round(elapsed / run.pages_done * (expected - run.pages_done))}s"
+        if detail:
+            message += f" ({detail})"
+        try:
+            await run.progress(run.steps, total, message)
+        except Exception:
+            pass  # Fortschrittsmeldungen dürfen den Lauf nie abbrechen
+
+    async def _stage(self, state: Ctx, stage: str) -> bool:
+        """Meldet den Beginn eines Schritts. Returns: True wenn der Lauf abgebrochen wurde."""
+        run = self._runs.get(state.run_id)
+        if run is not None and run.cancel is not None and run.cancel.is_set():
+            state.cancelled = True
+        await self._report(state, stage)
+        return state.cancelled
+
+    async def _page_done(self, state: Ctx, job: PageJob) -> None:
+        """Zählt eine fertig verarbeitete Seite und meldet den Fortschritt."""
+        run = self._runs.get(state.run_id)
+        if run is not None:
+            run.pages_done += 1
+        # Das rohe HTML wird nach der Extraktion nicht mehr gebraucht und bliebe sonst in jedem Checkpoint
+        job.dom = ""
+        # Journal: eine fertige Seite geht bei Absturz oder Abbruch nicht verloren
+        if self.checkpointer is not None and not job.errors:
+            self.checkpointer.record_page(state.run_id, job)
+        await self._report(state, "processing", job.url)
+
+    async def _until_cancelled(self, state: Ctx, work: Awaitable) -> bool:
+        """
+        Führt `work` aus und bricht es ab, sobald das Cancel-Event des Laufs gesetzt wird.
+
+        Laufende Browser- und LLM-Aufrufe werden per Task-Abbruch sofort beendet.
+
+        Returns:
+            True wenn abgebrochen wurde (state.cancelled ist dann gesetzt)
+        """
+        run = self._runs.get(state.run_id)
+        task = asyncio.ensure_future(work)
+        if run is None or run.cancel is None:
+            await task
+            return False
+
+        stop = asyncio.ensure_future(run.cancel.wait())
+        try:
+            await asyncio.wait({task, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if task.cancelled():
+            state.cancelled = True
+            print_info("Cancelled, stopping in-flight work")
+            return True
+        task.result()
+        return False
+
+    async def _repair_jobs(self, state: Ctx, broken: Dict[str, Dict[str, List[Diagnostic]]]) -> None:
+        """
+        Repariert fehlerhafte Dateien in Runden mit begrenzter Parallelität.
+
+        Pro Runde werden alle noch fehlerhaften Dateien parallel (höchstens
+        `repair_workers` gleichzeitig) lokal repariert und anschließend gemeinsam
+        erneut geprüft. Der Kontext um die Befunde verdoppelt sich pro Runde, der
+        letzte Versuch repariert die ganze Datei. Ab dem zweiten Versuch wird der
+        LLM-Cache umgangen, damit nicht dieselbe falsche Antwort zurückkommt.
+        """
+        c = self.config
+        semaphore = asyncio.Semaphore(max(1, c.repair_workers))
+        started = time.perf_counter()
+        failures: Dict[str, str] = {}
+
+        async def repair(url: str, path: str, diagnostics: List[Diagnostic], context: Optional[int], use_cache: bool):
+            async with semaphore:
+                try:
+                    with page_metrics(state.jobs[url].metrics), span("tool.repair", url=url, path=path):
+                        if not use_cache:
+                            record(retries=1)
+                        await arepair_region(path, diagnostics, llm=self.llm_for("repair"),
+                                             context_lines=context, use_cache=use_cache)
+                except Exception as e:
+                    failures[url] = str(e)
+                    print_error(f"Repair error in {path}: {str(e)[:60]}")
+
+        attempts = max(1, c.repair_max_attempts)
+        for attempt in range(1, attempts + 1):
+            whole_file = attempt == attempts and attempts > 1
+            context = None if whole_file else c.repair_context_lines * 2 ** (attempt - 1)
+            await asyncio.gather(*(
+                repair(url, path, diagnostics, context, c.use_llm_cache and attempt == 1)
+                for url, files in broken.items() for path, diagnostics in files.items()
+            ))
+
+            results = await self._reverify(state, [path for files in broken.values() for path in files])
+            remaining: Dict[str, Dict[str, List[Diagnostic]]] = {}
+            for url, files in broken.items():
+                job = state.jobs[url]
+                job.repair_attempts = attempt
+                for path, previous in files.items():
+                    diagnostics = results.get(path, previous)
+                    job.diagnostics = [d for d in job.diagnostics if d.file != path] + diagnostics
+                    if not is_valid(diagnostics):
+                        remaining.setdefault(url, {})[path] = [d for d in diagnostics if d.severity == "error"]
+                if url not in remaining:
+                    job.errors = [e for e in job.errors if e not in VERIFY_ERRORS]
+                    job.repair_seconds = round(time.perf_counter() - started, 2)
+                    print_success(f"Repaired {url} ({attempt} attempt{'s' if attempt > 1 else ''})")
+            broken = remaining
+            if not broken:
+                return
+
+        for url in broken:
+            job = state.jobs[url]
+            job.repair_seconds = round(time.perf_counter() - started, 2)
+            reason = failures.get(url) or next(str(d) for files in broken[url].values() for d in files)
+            job.errors.append(f"Repair failed after {attempts} attempt{'s' if attempts > 1 else ''}: {reason}")
+            print_error(f"Repair failed for {url}")
+
+    async def _reverify(self, state: Ctx, paths: List[str]) -> Dict[str, List[Diagnostic]]:
+        """Prüft reparierte Dateien erneut (POMs im Prozess, Specs mit einem tsc-Lauf)."""
+        results: Dict[str, List[Diagnostic]] = {}
+        poms = [p for p in paths if p.endswith(".py")]
+        specs = [p for p in paths if not p.endswith(".py")]
+        try:
+            if poms:
+                results.update(await asyncio.to_thread(verify_poms, poms))
+            if specs and self.config.typecheck_tests:
+                result = await verify_tests_ts(
+                    specs, base_tsconfig=self.config.tsconfig_path, timeout=self.config.tsc_timeout,
+                )
+                if result["checked"]:
+                    results.update(result["files"])
+        except Exception as e:
+            # Ohne neues Ergebnis gelten die alten Befunde weiter
+            state.errors.append(f"Re-verify error: {str(e)}")
+        return results
 
     async def execute(self, base_url: str, max_pages: int = 10, stories: Optional[str] = None, 
-                     config: TestGenerationConfig = None) -> Ctx:
+                     config: TestGenerationConfig = None, force: bool = False,
+                     progress: Optional[ProgressCallback] = None,
+                     cancel_event: Optional[asyncio.Event] = None,
+                     run_id: Optional[str] = None) -> Ctx:
         """
         Führt die komplette Pipeline aus.
         
@@ -231,6 +939,11 @@ class PlaywrightPipeline:
             max_pages: Maximale Anzahl zu verarbeitender Seiten
             stories: Optionale User Stories für Test-Generierung
             config: Optionale Konfiguration (überschreibt Standard)
+            force: Alle Seiten neu generieren, auch wenn sie unverändert sind
+            progress: Optionaler Callback für Fortschrittsmeldungen pro Schritt und Seite
+            cancel_event: Gesetzt = laufende Arbeit abbrechen und das Teilergebnis
+                (fertige Seiten, im Manifest gespeichert) mit cancelled=True zurückgeben
+            run_id: Eigene ID des Laufs (Standard: neu erzeugt), z.B. für resume_run
         
         Returns:
             Finaler Context mit allen Ergebnissen
@@ -248,8 +961,98 @@ class PlaywrightPipeline:
             base_url=base_url,
             max_pages=max_pages,
             stories=stories or "",
+            force=force,
+            **({"run_id": run_id} if run_id else {}),
         )
         
         # Führe den Workflow aus und gib Ergebnis zurück
-        result_dict = await self.graph.ainvoke(initial_state.model_dump())
-        return Ctx(**result_dict)
+        run = _RunState(progress=progress, cancel=cancel_event)
+        return await self._invoke(initial_state, initial_state.model_dump(), self._graph_config(initial_state.run_id), run)
+
+    async def resume_run(self, run_id: str, progress: Optional[ProgressCallback] = None,
+                         cancel_event: Optional[asyncio.Event] = None) -> Ctx:
+        """
+        Setzt einen abgestürzten oder abgebrochenen Lauf fort.
+
+        Nach einem Absturz geht es beim unterbrochenen Schritt weiter, nach
+        einem Abbruch beim letzten Schritt vor dem Abbruch. Schon fertige Seiten
+        kommen aus dem Journal, Crawl und Scans aus dem Capture-Cache; nur die
+        übrigen Seiten laufen erneut durch Browser und LLM.
+
+        Checkpoints eines vollständig beendeten Laufs werden gelöscht; er ist
+        danach nicht mehr bekannt.
+
+        Returns:
+            Finaler Context
+        """
+        if self.checkpointer is None:
+            raise ValueError("Checkpoints are disabled (config.checkpoint_path)")
+        if not self.checkpointer.has_run(run_id):
+            raise ValueError(f"Unknown or already completed run: {run_id}")
+        graph_config = self._graph_config(run_id)
+        snapshot = await self.graph.aget_state(graph_config)
+        state = Ctx(**snapshot.values)
+        if not snapshot.next:
+            if not state.cancelled:
+                print_info(f"Run {run_id} is already complete")
+                return state
+            # Abgebrochen: vom letzten Checkpoint vor dem Abbruch aus erneut verzweigen
+            async for earlier in self.graph.aget_state_history(graph_config):
+                if earlier.next and not earlier.values.get("cancelled"):
+                    snapshot, graph_config = earlier, earlier.config
+                    break
+            else:
+                raise ValueError(f"Run {run_id} has no checkpoint before its cancellation")
+            state = Ctx(**snapshot.values)
+
+        print_header("PLAYWRIGHT TEST GENERATOR")
+        print_info(f"Resuming run {run_id} at {', '.join(snapshot.next)} | URL: {state.base_url}")
+        run = _RunState(progress=progress, cancel=cancel_event)
+        if self.config.concurrent_pages and "process" in snapshot.next:
+            # Der Hintergrund-Crawl des ersten Versuchs ist weg: erneut crawlen (aus dem Capture-Cache)
+            run.link_stream = asyncio.Queue()
+            run.crawl_task = asyncio.create_task(self._crawl_into(state, run.link_stream))
+        return await self._invoke(state, None, graph_config, run)
+
+    @staticmethod
+    def _graph_config(run_id: str) -> dict:
+        """LangGraph-Config eines Laufs (Thread = run_id im Checkpointer)."""
+        return {"configurable": {"thread_id": run_id}}
+
+    async def _invoke(self, state: Ctx, graph_input: Optional[dict], graph_config: dict, run: _RunState) -> Ctx:
+        """Führt den Graphen für einen neuen (graph_input) oder fortgesetzten Lauf (None) aus."""
+        self._runs[state.run_id] = run
+        # Innerhalb eines Tool-Aufrufs gehört der Lauf zu dessen Trace (Export dort), sonst eigener Trace
+        outer = current_tracer()
+        tracer = outer or Tracer(state.run_id)
+        try:
+            with use_tracer(tracer), span("pipeline", url=state.base_url, max_pages=state.max_pages):
+                result = Ctx(**await self.graph.ainvoke(graph_input, graph_config))
+            self._collect_metrics(result, tracer, export=outer is None)
+            if self.checkpointer is not None and not result.cancelled:
+                # Nur unvollständige Läufe bleiben fortsetzbar, die Datei wächst nicht über Läufe hinweg
+                self.checkpointer.delete_thread(state.run_id)
+            await self._report(result, "cancelled" if result.cancelled else "done")
+        finally:
+            # Hintergrund-Crawl beenden, falls max_pages vorher erreicht wurde
+            if run.crawl_task is not None:
+                run.crawl_task.cancel()
+            self._runs.pop(state.run_id, None)
+        return result
+
+    def _collect_metrics(self, state: Ctx, tracer: Tracer, export: bool = True) -> None:
+        """Summiert die Seiten-Kennzahlen, ergänzt die Dauer pro Node und exportiert den Trace."""
+        state.metrics = aggregate([job.metrics for job in state.jobs.values()])
+        for name, seconds in tracer.stage_seconds().items():
+            if name.startswith("node.") or name == "pipeline":
+                state.metrics[f"seconds.{name}"] = seconds
+        if not export:
+            return
+        try:
+            state.trace_path = tracer.export(self.config.trace_export, self.config.trace_dir)
+        except (OSError, ValueError) as e:
+            state.errors.append(f"Trace export error: {str(e)}")
+
+    async def aclose(self) -> None:
+        """Schließt den Browser-Pool der Pipeline."""
+        await self.browser_pool.close()
@@ -31,6 +31,7 @@ Du verbesserst das Python Page Object Model. Tests werden später automatisch in
 - All existing elements and methods
 - The class name and structure
 - The goto() method with the URL
+- Component imports and attributes (e.g. self.header = HeaderComponent(page))
 
 ## Add:
 - Helper methods for common operations
@@ -85,6 +86,21 @@ Return JSON with this structure:
 Return ONLY JSON, no markdown, no explanations.
 """
 
+# Namen und Zweck regelbasiert extrahierter Elemente verbessern (Locators bleiben unverändert)
+REFINE_ELEMENTS_PROMPT = """Refine the names and purposes of these UI elements of {url}.
+
+The elements were extracted by rules from the DOM; their locators are correct and stay unchanged.
+For each element return:
+- "name": a short, descriptive camelCase identifier (unique on this page, ending in Button/Link/Input/... like the original)
+- "purpose": one sentence describing what the element does for the user
+
+## Elements (index, current name, locator, current purpose):
+{elements}
+
+Return JSON: {{"elements": [{{"index": 0, "name": "...", "purpose": "..."}}, ...]}}
+Return ONLY JSON, no markdown, no explanations.
+"""
+
 # Test Scenario Extraction (imported from test_prompts_ts.py)
 EXTRACT_TEST_SCENARIOS_PROMPT = """Analyze this page and identify key test scenarios.
 
@@ -265,3 +281,56 @@ CRITICAL:
 - Use EXACT element text from "Real Page Structure"
 - Create realistic tests based on what the page actually does
 """
+
+# Szenarien und Test-Code in einem Aufruf (gleicher Kontext, strukturierte Antwort)
+GENERATE_SCENARIOS_AND_TESTS_PROMPT_TS = GENERATE_TEST_PROMPT_TS.split("## Output Requirements")[0] + """## Output Format
+First plan 3-5 realistic scenarios from the page structure, then write the spec that implements exactly
+those scenarios (one test per scenario). Answer in exactly this structure:
+
+<scenarios>
+{{"scenarios": [{{"name": "scenario_name", "type": "happy_path|validation|edge_case|navigation|accessibility", "expected": "expected outcome"}}]}}
+</scenarios>
+<code>
+import {{ test, expect }} from '@playwright/test';
+
+test.describe('{page_name} Page', () => {{
+  // One test per scenario
+}});
+</code>
+
+CRITICAL:
+- NO ``` code fences, NO text outside the two blocks
+- ONLY valid TypeScript inside <code>
+- Use EXACT element text from "Real Page Structure"
+"""
+
+# Specs für mehrere kleine Seiten in einem Aufruf
+GENERATE_TESTS_BATCH_PROMPT_TS = """You are an expert Playwright test engineer. Generate TypeScript tests for each of the {count} pages below.
+
+## ⚙️ ARCHITEKTUR (FEST KONFIGURIERT - NICHT ÄNDERBAR)
+✅ **POMs werden IMMER in Python generiert** (out/POMS/*.py)
+✅ **Tests werden IMMER in TypeScript generiert** (out/TESTS/*.spec.ts)
+
+## CRITICAL RULES
+1. **ONLY test elements that actually exist on that page** (see its "Real Page Structure")
+2. **Use the EXACT element text** and proper selectors: page.getByRole(), page.getByText(), page.locator()
+3. 2-4 independent tests per page, each starting with page.goto(<page URL>) and using expect() assertions
+4. **DO NOT test forms if forms count is 0**
+5. Every page gets its own spec; never mix elements of different pages
+{user_stories_section}
+## Pages
+{pages}
+
+## Output Format
+One block per page, in the same order, with the page name exactly as given:
+
+<spec page="PageName">
+import {{ test, expect }} from '@playwright/test';
+
+test.describe('PageName Page', () => {{
+  // tests
+}});
+</spec>
+
+NO ``` code fences, NO text outside the blocks.
+"""
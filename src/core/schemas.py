@@ -1,9 +1,25 @@
 """Pydantic-Schemas für Datenstrukturen in der Pipeline."""
 
-from pydantic import BaseModel
+import time
+from uuid import uuid4
+from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional
 
 
+class Diagnostic(BaseModel):
+    """Befund einer Prüfung (Syntax, statische Checks, TypeScript-Compiler)."""
+    file: str                      # Geprüfte Datei
+    line: int = 0                  # Zeile (1-basiert, 0 = unbekannt)
+    column: int = 0                # Spalte (1-basiert, 0 = unbekannt)
+    code: str                      # Art des Befunds, z.B. "syntax" oder "undefined-attribute"
+    message: str                   # Beschreibung
+    severity: str = "error"        # "error" oder "warning"
+
+    def __str__(self) -> str:
+        location = f"{self.file}:{self.line}:{self.column}: " if self.file else ""
+        return f"{location}{self.severity} [{self.code}] {self.message}"
+
+
 class PageJob(BaseModel):
     """
     Repräsentiert einen einzelnen Seiten-Job in der Pipeline.
@@ -19,6 +35,13 @@ class PageJob(BaseModel):
     pom_path: Optional[str] = None          # Pfad zum generierten POM
     test_path: Optional[str] = None         # Pfad zu generierten Tests
     errors: List[str] = []                  # Liste von Fehlern
+    diagnostics: List[Diagnostic] = []      # Befunde der Verifikation
+    fingerprint: Optional[str] = None       # Struktureller Fingerabdruck des DOM
+    reused: bool = False                    # Unverändert, Artefakte aus dem letzten Lauf übernommen
+    repair_attempts: int = 0                # Reparatur-Versuche (LLM-Runden) für diese Seite
+    repair_seconds: float = 0.0             # Dauer der Reparatur bis zum Ergebnis
+    metrics: Dict[str, float] = {}          # Kennzahlen (nav_seconds, dom_bytes, prompt_tokens, llm_seconds, ...)
+    component: Optional[str] = None         # Klassenname, wenn der Job eine gemeinsame Komponente ist
 
 
 class Ctx(BaseModel):
@@ -31,11 +54,37 @@ class Ctx(BaseModel):
     - Alle Jobs (PageJob pro URL)
     - Statistiken (verarbeitete Seiten, Fehler)
     """
+    run_id: str = Field(default_factory=lambda: uuid4().hex)  # Eindeutige ID des Laufs
     base_url: str                       # Start-URL für Crawling
     max_pages: int = 10                 # Maximale Anzahl zu verarbeitender Seiten
     stories: str = ""                   # Optionale User Stories für Tests
+    force: bool = False                 # Alle Seiten neu generieren (Manifest ignorieren)
+    cancelled: bool = False             # Lauf wurde abgebrochen (Teilergebnis)
     links: List[str] = []               # Alle gefundenen Links
     jobs: Dict[str, PageJob] = {}       # URL -> PageJob Mapping
     total_processed: int = 0            # Anzahl erfolgreich verarbeiteter Seiten
+    total_reused: int = 0               # Davon unverändert übernommene Seiten
     total_errors: int = 0               # Anzahl Fehler
     errors: List[str] = []              # Globale Fehlerliste
+    metrics: Dict[str, float] = {}      # Summe der Seiten-Kennzahlen und Dauer pro Schritt ("seconds.node.crawl", ...)
+    trace_path: Optional[str] = None    # Exportierter Trace (bei config.trace_export)
+
+
+class BackgroundJob(BaseModel):
+    """
+    Ein im Hintergrund laufender Pipeline-Auftrag.
+
+    Wird von der JobQueue verwaltet und nach jeder Statusänderung auf die
+    Platte geschrieben, damit wartende und fertige Jobs einen Neustart überstehen.
+    """
+    id: str = Field(default_factory=lambda: uuid4().hex[:12])  # Job-ID für job_status/job_result/job_cancel
+    params: Dict[str, Any] = {}         # Argumente des Laufs (url, max_pages, stories, force, ...)
+    status: str = "queued"              # queued, running, done, failed, cancelled
+    created_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: float = 0                 # Letzte Fortschrittsmeldung der Pipeline
+    total: Optional[float] = None
+    message: str = ""
+    result: Optional[Dict[str, Any]] = None  # Zusammenfassung des Laufs (auch bei Abbruch)
+    error: Optional[str] = None         # Fehlermeldung bei status == "failed"
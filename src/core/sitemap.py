@@ -0,0 +1,130 @@
+"""Seiten-URLs aus robots.txt und sitemap.xml (auch Sitemap-Index und gzip) ohne Browser."""
+
+import asyncio
+import io
+import zlib
+from collections import deque
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urljoin, urlsplit
+from xml.etree.ElementTree import ParseError, iterparse
+
+import httpx
+
+
+MAX_SITEMAPS = 50                   # Maximal geladene Sitemap-Dateien pro Lauf
+MAX_SITEMAP_BYTES = 50 * 1024 ** 2  # Limit des Sitemap-Protokolls (entpackt)
+PREFETCH = 4                        # Gleichzeitig geladene Sitemaps
+
+
+async def sitemap_urls(base_url: str, errors: Optional[List[str]] = None, timeout: float = 10.0,
+                       max_sitemaps: int = MAX_SITEMAPS) -> AsyncIterator[str]:
+    """
+    Streamt die Seiten-URLs aller Sitemaps einer Website.
+
+    Die Sitemaps stammen aus den "Sitemap:"-Zeilen der robots.txt, sonst wird
+    /sitemap.xml versucht. Sitemap-Indizes werden aufgelöst; gzip-Dateien
+    werden erkannt und entpackt.
+
+    Args:
+        base_url: Eine URL der Website (nur Schema und Host zählen)
+        errors: Optionale Liste, in die Ladefehler geschrieben werden
+        timeout: Timeout pro HTTP-Anfrage in Sekunden
+        max_sitemaps: Maximal geladene Sitemap-Dateien
+
+    Yields:
+        Seiten-URLs in der Reihenfolge der Sitemaps (ungeprüft, nicht kanonisiert)
+    """
+    errors = errors if errors is not None else []
+    parts = urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+
+    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
+        sitemaps = await _robots_sitemaps(client, origin) or [urljoin(origin, "/sitemap.xml")]
+        todo = deque(sitemaps[:max_sitemaps])
+        seen = set(todo)
+        pending = deque()
+
+        def refill():
+            while todo and len(pending) < PREFETCH:
+                url = todo.popleft()
+                pending.append((url, asyncio.ensure_future(_fetch(client, url))))
+
+        try:
+            refill()
+            while pending:
+                url, task = pending.popleft()
+                try:
+                    # Große Sitemaps (bis 50 MB) blockieren den Event-Loop nicht
+                    pages, children = await asyncio.to_thread(_parse, await task)
+                except Exception as e:
+                    errors.append(f"{url}: {e}")
+                    refill()
+                    continue
+
+                # Unter-Sitemaps eines Index einplanen (jede nur einmal)
+                for child in children:
+                    if child not in seen and len(seen) < max_sitemaps:
+                        seen.add(child)
+                        todo.append(child)
+                refill()
+
+                for page in pages:
+                    yield page
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+
+async def _robots_sitemaps(client: httpx.AsyncClient, origin: str) -> List[str]:
+    """Sitemap-URLs aus robots.txt (leer, wenn keine Datei oder keine Einträge)."""
+    try:
+        response = await client.get(urljoin(origin, "/robots.txt"))
+    except httpx.HTTPError:
+        return []
+    if response.status_code != 200:
+        return []
+    sitemaps = []
+    for line in response.text.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            sitemaps.append(urljoin(origin, value.strip()))
+    return list(dict.fromkeys(sitemaps))
+
+
+async def _fetch(client: httpx.AsyncClient, url: str) -> bytes:
+    """Lädt eine Sitemap und entpackt gzip (erkannt am Inhalt, nicht an Endung oder Header)."""
+    response = await client.get(url)
+    if response.status_code != 200:
+        raise ValueError(f"HTTP {response.status_code}")
+    data = response.content
+    if data[:2] == b"\x1f\x8b":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        data = decompressor.decompress(data, MAX_SITEMAP_BYTES)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Sitemap larger than {MAX_SITEMAP_BYTES // 1024 ** 2} MB")
+    return data
+
+
+def _parse(data: bytes):
+    """
+    Liest <url><loc> und <sitemap><loc> einer Sitemap (Namespace egal).
+
+    Returns:
+        (Seiten-URLs, Unter-Sitemap-URLs)
+    """
+    pages: List[str] = []
+    children: List[str] = []
+    loc = None
+    try:
+        for _, element in iterparse(io.BytesIO(data), events=("end",)):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "loc":
+                loc = (element.text or "").strip()
+            elif tag in ("url", "sitemap"):
+                if loc:
+                    (pages if tag == "url" else children).append(loc)
+                loc = None
+                element.clear()
+    except ParseError as e:
+        raise ValueError(f"Invalid sitemap XML: {e}")
+    return pages, children
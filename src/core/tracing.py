@@ -0,0 +1,202 @@
+"""Tracing: Spans pro Pipeline-Schritt und Tool-Aufruf, Kennzahlen pro Seite."""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+
+@dataclass
+class Span:
+    """Ein abgeschlossener oder laufender Abschnitt (Node, Tool, LLM-Aufruf, ...)."""
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start: float = field(default_factory=time.time)   # Unix-Zeit in Sekunden
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return round((self.end or time.time()) - self.start, 4)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id,
+            "name": self.name, "start": self.start, "end": self.end, "seconds": self.seconds,
+            "attributes": self.attributes, "error": self.error,
+        }
+
+
+class Tracer:
+    """
+    Sammelt die Spans eines Laufs (ein Trace pro Pipeline-Lauf bzw. Tool-Aufruf).
+
+    Aktiv ist der Tracer des aktuellen Kontexts (siehe use_tracer); ohne
+    aktiven Tracer sind span() und record() wirkungslos.
+    """
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid4().hex
+        self.spans: List[Span] = []
+
+    def stage_seconds(self) -> Dict[str, float]:
+        """Gesamtdauer pro Span-Name (z.B. node.crawl, tool.scan_site)."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = round(totals.get(span.name, 0.0) + span.seconds, 4)
+        return totals
+
+    def export_jsonl(self, path: str) -> str:
+        """Schreibt alle Spans als JSON Lines (ein Span pro Zeile)."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("a", encoding="utf-8") as f:
+            for span in self.spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+        return str(target)
+
+    def export_otlp(self, path: str, service: str = "andismcp") -> str:
+        """Schreibt alle Spans im OTLP/JSON-Format (lesbar z.B. vom OpenTelemetry-Collector file receiver)."""
+        spans = [{
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id or "",
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(span.start * 1e9)),
+            "endTimeUnixNano": str(int((span.end or span.start) * 1e9)),
+            "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        } for span in self.spans]
+        document = {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", service)]},
+            "scopeSpans": [{"scope": {"name": "src.core.tracing"}, "spans": spans}],
+        }]}
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(document) + "\n")
+        return str(target)
+
+    def export(self, fmt: Optional[str], directory: str) -> Optional[str]:
+        """Exportiert nach `directory` ("jsonl" oder "otlp", None = kein Export)."""
+        if fmt == "jsonl":
+            return self.export_jsonl(os.path.join(directory, f"{self.trace_id}.jsonl"))
+        if fmt == "otlp":
+            return self.export_otlp(os.path.join(directory, f"{self.trace_id}.otlp.json"))
+        if fmt:
+            raise ValueError(f"Unknown trace format: {fmt} (expected jsonl or otlp)")
+        return None
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# Aktiver Tracer, aktueller Span und Kennzahlen der gerade bearbeiteten Seite.
+# asyncio-Tasks und asyncio.to_thread übernehmen den Kontext automatisch.
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+_metrics: ContextVar[Optional[Dict[str, float]]] = ContextVar("metrics", default=None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Aktiver Tracer des aktuellen Kontexts (None = Tracing aus)."""
+    return _tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Aktiviert `tracer` für den aktuellen Kontext (und alle daraus gestarteten Tasks)."""
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Misst einen Abschnitt als Kind des aktuellen Spans.
+
+    Fehler werden am Span vermerkt und weitergereicht.
+    """
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+    parent = _span.get()
+    current = Span(name, tracer.trace_id, parent_id=parent.span_id if parent else None, attributes=attributes)
+    tracer.spans.append(current)
+    token = _span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"[:300]
+        raise
+    finally:
+        current.end = time.time()
+        _span.reset(token)
+
+
+@contextmanager
+def page_metrics(metrics: Dict[str, float]) -> Iterator[Dict[str, float]]:
+    """Alle record()-Aufrufe im Block zählen zusätzlich in `metrics` (z.B. PageJob.metrics)."""
+    token = _metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _metrics.reset(token)
+
+
+def record(**values: float) -> None:
+    """
+    Addiert Kennzahlen zum aktuellen Span und zu den Kennzahlen der aktuellen Seite.
+
+    Beispiel: record(llm_calls=1, prompt_tokens=812, llm_seconds=1.4)
+    """
+    current = _span.get()
+    metrics = _metrics.get()
+    for key, value in values.items():
+        if value is None:
+            continue
+        if current is not None:
+            current.attributes[key] = round(current.attributes.get(key, 0) + value, 4)
+        if metrics is not None:
+            metrics[key] = round(metrics.get(key, 0) + value, 4)
+
+
+@contextmanager
+def measure(metric: str) -> Iterator[None]:
+    """Zählt die Dauer des Blocks (Sekunden) als Kennzahl `metric`, z.B. measure("write_seconds")."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(**{metric: time.perf_counter() - start})
+
+
+def aggregate(metrics: List[Dict[str, float]]) -> Dict[str, float]:
+    """Summiert die Kennzahlen mehrerer Seiten."""
+    totals: Dict[str, float] = {}
+    for values in metrics:
+        for key, value in values.items():
+            totals[key] = round(totals.get(key, 0) + value, 4)
+    return totals
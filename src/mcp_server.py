@@ -1,4 +1,7 @@
+import asyncio
 import sys
+import time
+import uuid
 from pathlib import Path
 from typing import Any
 
@@ -12,21 +15,58 @@ from mcp.server.stdio import stdio_server
 
 # Importiere die Hauptpipeline und Hilfsfunktionen
 from src.core.pipeline import PlaywrightPipeline
-from src.core.colors import print_header, print_success, print_info
+from src.core.browser_pool import get_browser_pool
+from src.core.jobs import JobQueue, run_summary
+from src.core.tracing import Tracer, span, use_tracer
+from src.core.capture_cache import get_capture_cache
+from src.core.llm_cache import get_llm_cache
+from src.core.llm_clients import get_llm_registry
+from src.core.load_profile import DEFAULT_LOAD_PROFILE, LOAD_PROFILES
+from src.core.crawler import CRAWL_SOURCES
+from src.core.colors import print_header, print_success, print_info, print_error
 
 from src.tools.crawl_links import crawl_links
 from src.tools.scan_site import scan_site
-from src.tools.extract_model import extract_model
-from src.tools.generate_pom import generate_pom
-from src.tools.generate_tests_ts import generate_tests_ts
-from src.tools.verify_pom import verify_pom
-from src.tools.repair import repair_file
+from src.tools.extract_model import EXTRACTORS, aextract_model
+from src.tools.generate_pom import agenerate_pom
+from src.tools.verify_pom import format_diagnostics, is_valid, resolve_targets, verify_poms
+from src.tools.repair import arepair_file
 
 
 def main() -> int:
     """Haupteinstiegspunkt des MCP-Servers."""
+    # Ein Browser-Pool für den ganzen Server-Prozess (Pipeline + Einzel-Tools)
+    browser_pool = get_browser_pool()
+    capture_cache = get_capture_cache()
+    llm_cache = get_llm_cache()
+
+    # Ein Client pro Modell mit Keep-Alive-Verbindungen, geteilt von Pipeline und Tools
+    llm_registry = get_llm_registry()
+
     # Verbindet die Pipeline
-    pipeline = PlaywrightPipeline()
+    pipeline = PlaywrightPipeline(browser_pool=browser_pool)
+
+    async def run_job(params: dict, progress, cancel_event: asyncio.Event) -> dict:
+        """
+        Führt einen Hintergrund-Job (generate_tests_full bzw. resume_run mit background=true) aus.
+
+        Ein nach Neustart erneut eingereihter Job setzt seinen Lauf fort, statt neu zu beginnen.
+        """
+        run_id = params.get("run_id")
+        if run_id and pipeline.checkpointer is not None and pipeline.checkpointer.has_run(run_id):
+            result = await pipeline.resume_run(run_id, progress=progress, cancel_event=cancel_event)
+        else:
+            result = await pipeline.execute(
+                params["url"], params.get("max_pages", 10), params.get("stories", ""),
+                force=params.get("force", False), progress=progress, cancel_event=cancel_event,
+                run_id=run_id,
+            )
+        return run_summary(result)
+
+    # Warteschlange für Läufe, die sofort eine Job-ID zurückgeben (Zustand überlebt Neustarts)
+    job_queue = JobQueue(
+        run_job, workers=pipeline.config.job_workers, path=pipeline.config.job_store_path,
+    )
     
     # Erstellt den MCP-Server (AndisMCP)
     app = Server("AndisMCP")
@@ -56,6 +96,20 @@ def main() -> int:
                             "type": "string",
                             "description": "Optional user stories to guide test generation",
                         },
+                        "force": {
+                            "type": "boolean",
+                            "description": "Regenerate all pages, even if their structure did not change since the last run (default: false)",
+                            "default": False,
+                        },
+                        "timeout_seconds": {
+                            "type": "number",
+                            "description": "Stop after this many seconds and return the partial result (finished pages are kept)",
+                        },
+                        "background": {
+                            "type": "boolean",
+                            "description": "Queue the run and return a job ID immediately; poll with job_status / job_result (default: false)",
+                            "default": False,
+                        },
                     },
                     "required": ["url"],
                 },
@@ -63,7 +117,7 @@ def main() -> int:
             # Tool 2: Links auf einer Website crawlen
             types.Tool(
                 name="crawl_links",
-                description="Crawl and discover all links on a website",
+                description="Crawl a website breadth-first and discover its links (canonicalized, deduplicated)",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -71,6 +125,37 @@ def main() -> int:
                             "type": "string",
                             "description": "Base URL to start crawling from",
                         },
+                        "max_depth": {
+                            "type": "integer",
+                            "description": "Link depth to follow (1 = only links on the start page, default: 1)",
+                            "default": 1,
+                        },
+                        "max_pages": {
+                            "type": "integer",
+                            "description": "Maximum number of links to return (0 = unlimited)",
+                            "default": 0,
+                        },
+                        "include": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Glob patterns a URL or path must match (e.g. '/docs/*')",
+                        },
+                        "exclude": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Glob patterns for URLs or paths to skip (e.g. '*/logout*')",
+                        },
+                        "source": {
+                            "type": "string",
+                            "enum": list(CRAWL_SOURCES),
+                            "description": "Where URLs come from: crawl (follow links in the browser), sitemap (robots.txt / sitemap.xml only, no browser), auto (sitemap, falls back to crawl) (default: from config)",
+                        },
+                        "load_profile": {
+                            "type": "string",
+                            "enum": list(LOAD_PROFILES),
+                            "description": "How pages are loaded: full (everything, networkidle), fast (no media/trackers, DOM quiet period), minimal (also no styles/third-party) (default: fast)",
+                            "default": DEFAULT_LOAD_PROFILE,
+                        },
                     },
                     "required": ["base_url"],
                 },
@@ -86,6 +171,12 @@ def main() -> int:
                             "type": "string",
                             "description": "URL to scan",
                         },
+                        "load_profile": {
+                            "type": "string",
+                            "enum": list(LOAD_PROFILES),
+                            "description": "How pages are loaded: full (everything, networkidle), fast (no media/trackers, DOM quiet period), minimal (also no styles/third-party) (default: fast)",
+                            "default": DEFAULT_LOAD_PROFILE,
+                        },
                     },
                     "required": ["url"],
                 },
@@ -105,6 +196,31 @@ def main() -> int:
                             "type": "string",
                             "description": "Name for the page (e.g., 'LoginPage')",
                         },
+                        "use_cache": {
+                            "type": "boolean",
+                            "description": "Reuse cached LLM responses for identical prompts (default: true)",
+                            "default": True,
+                        },
+                        "token_budget": {
+                            "type": "integer",
+                            "description": "Max. estimated tokens of the reduced DOM per LLM call (default: 3000)",
+                            "default": 3000,
+                        },
+                        "max_chunks": {
+                            "type": "integer",
+                            "description": "Split large pages into up to this many landmark sections extracted in parallel (default: from config, 1 = truncate)",
+                        },
+                        "extractor": {
+                            "type": "string",
+                            "enum": list(EXTRACTORS),
+                            "description": "heuristic (rules only, no LLM, milliseconds), hybrid (rules, LLM refines names/purposes), llm (LLM reads the DOM outline) (default: from config)",
+                        },
+                        "load_profile": {
+                            "type": "string",
+                            "enum": list(LOAD_PROFILES),
+                            "description": "How pages are loaded: full (everything, networkidle), fast (no media/trackers, DOM quiet period), minimal (also no styles/third-party) (default: fast)",
+                            "default": DEFAULT_LOAD_PROFILE,
+                        },
                     },
                     "required": ["url", "name"],
                 },
@@ -124,6 +240,11 @@ def main() -> int:
                             "type": "object",
                             "description": "UI model extracted from page",
                         },
+                        "use_cache": {
+                            "type": "boolean",
+                            "description": "Reuse cached LLM responses for identical prompts (default: true)",
+                            "default": True,
+                        },
                     },
                     "required": ["name", "model"],
                 },
@@ -131,13 +252,13 @@ def main() -> int:
             # Tool 6: Page Object Model validieren
             types.Tool(
                 name="verify_pom",
-                description="Verify and validate a Page Object Model file",
+                description="Verify Page Object Model files (syntax, undefined self attributes, duplicate methods)",
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "pom_path": {
                             "type": "string",
-                            "description": "Path to the POM file to verify",
+                            "description": "POM file, directory (all *.py) or glob pattern, e.g. 'out/POMS/*.py'",
                         },
                     },
                     "required": ["pom_path"],
@@ -158,6 +279,11 @@ def main() -> int:
                             "type": "string",
                             "description": "Optional error message to help with repair",
                         },
+                        "use_cache": {
+                            "type": "boolean",
+                            "description": "Reuse cached LLM responses for identical prompts (default: true)",
+                            "default": True,
+                        },
                     },
                     "required": ["file_path"],
                 },
@@ -171,12 +297,200 @@ def main() -> int:
                     "properties": {},
                 },
             ),
+            # Tool 9: Statistiken des geteilten Browser-Pools
+            types.Tool(
+                name="browser_pool_stats",
+                description="Show size, browser launches and lease latency of the shared browser pool",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                },
+            ),
+            # Tool 10: Statistiken der Caches
+            types.Tool(
+                name="cache_stats",
+                description="Show hit/miss counters and size of the page capture cache and the LLM response cache, plus LLM client creation counts",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                },
+            ),
+            # Tool 11: Status von Hintergrund-Jobs
+            types.Tool(
+                name="job_status",
+                description="Show status and progress of a background job, or list all jobs if no job_id is given",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "job_id": {
+                            "type": "string",
+                            "description": "Job ID returned by generate_tests_full with background=true",
+                        },
+                    },
+                },
+            ),
+            # Tool 12: Ergebnis eines Hintergrund-Jobs
+            types.Tool(
+                name="job_result",
+                description="Get the result summary of a finished (or cancelled) background job",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "job_id": {
+                            "type": "string",
+                            "description": "Job ID",
+                        },
+                    },
+                    "required": ["job_id"],
+                },
+            ),
+            # Tool 13: Hintergrund-Job abbrechen
+            types.Tool(
+                name="job_cancel",
+                description="Cancel a background job: queued jobs are dropped, running jobs stop and keep their finished pages",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "job_id": {
+                            "type": "string",
+                            "description": "Job ID",
+                        },
+                    },
+                    "required": ["job_id"],
+                },
+            ),
+            # Tool 14: Abgebrochenen oder abgestürzten Lauf fortsetzen
+            types.Tool(
+                name="resume_run",
+                description="Continue a crashed, cancelled or timed-out generate_tests_full run from its last finished page (run ID from the run summary)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "run_id": {
+                            "type": "string",
+                            "description": "Run ID",
+                        },
+                        "timeout_seconds": {
+                            "type": "number",
+                            "description": "Stop after this many seconds and return the partial result (finished pages are kept)",
+                        },
+                        "background": {
+                            "type": "boolean",
+                            "description": "Queue the resumed run and return a job ID immediately (default: false)",
+                            "default": False,
+                        },
+                    },
+                    "required": ["run_id"],
+                },
+            ),
         ]
 
+    async def run_pipeline(url: str, max_pages: int, stories: str = "", force: bool = False,
+                           timeout: float | None = None, resume: str | None = None):
+        """
+        Führt die Pipeline mit Fortschrittsmeldungen und Abbruch aus (mit `resume`
+        wird der Lauf mit dieser ID fortgesetzt, url und Optionen stammen dann aus dem Checkpoint).
+
+        Schickt der Client ein progressToken, geht pro Schritt und Seite eine
+        Progress-Notification raus. Bricht der Client den Request ab, wird die
+        laufende Browser- und LLM-Arbeit gestoppt; fertige Seiten bleiben im
+        Manifest. Nach `timeout` Sekunden wird ebenso abgebrochen und das
+        Teilergebnis zurückgegeben.
+        """
+        ctx = app.request_context
+        token = ctx.meta.progressToken if ctx.meta else None
+        cancel_event = asyncio.Event()
+        client_cancelled = False
+
+        async def progress(done: float, total: float | None, message: str):
+            # Nach dem Abbruch durch den Client ist der Request beendet
+            if token is not None and not client_cancelled:
+                await ctx.session.send_progress_notification(
+                    token, done, total, message=message, related_request_id=str(ctx.request_id),
+                )
+
+        if resume:
+            work = pipeline.resume_run(resume, progress=progress, cancel_event=cancel_event)
+        else:
+            work = pipeline.execute(url, max_pages, stories, force=force, progress=progress, cancel_event=cancel_event)
+        task = asyncio.create_task(work)
+        timer = asyncio.get_running_loop().call_later(timeout, cancel_event.set) if timeout else None
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Client-Abbruch: Pipeline geordnet stoppen, damit fertige Seiten gespeichert werden
+            client_cancelled = True
+            cancel_event.set()
+            with anyio.CancelScope(shield=True):
+                result = await task
+                print_info(f"Cancelled by client, kept {result.total_processed} finished pages")
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def summary_text(title: str, summary: dict) -> str:
+        """Antworttext für einen abgeschlossenen Lauf."""
+        text = f"""{title}
+
+Summary:
+- Total pages processed: {summary['processed']}
+- Regenerated: {summary['regenerated']}
+- Reused (unchanged): {summary['reused']}
+- Errors encountered: {summary['errors']}
+- Output directory: out/
+- Run ID: {summary.get('run_id', 'n/a')} (continue with resume_run if cancelled) """
+        metrics = summary.get("metrics")
+        if metrics:
+            text += "\n\n" + metrics_text(metrics)
+        return text
+
+    def metrics_text(m: dict) -> str:
+        """Zeit pro Schritt und wohin sie ging (Browser, LLM, Reparatur)."""
+        stages = ", ".join(
+            f"{name[len('seconds.node.'):]} {m[name]:.1f}s" for name in m if name.startswith("seconds.node.")
+        )
+        return f"""Timing:
+- Stages: {stages or 'n/a'}
+- Browser: {m.get('nav_seconds', 0):.1f}s navigation, DOM {m.get('dom_bytes', 0) / 1024:.0f} KB -> {m.get('reduced_dom_bytes', 0) / 1024:.0f} KB reduced
+- LLM: {m.get('llm_calls', 0):.0f} calls ({m.get('llm_cache_hits', 0):.0f} cached), {m.get('llm_seconds', 0):.1f}s, {m.get('prompt_tokens', 0):.0f} prompt / {m.get('completion_tokens', 0):.0f} completion tokens
+- Retries: {m.get('retries', 0):.0f}, file writes {m.get('write_seconds', 0):.2f}s"""
+
+    def job_text(job) -> str:
+        """Einzeilige Statusangabe eines Jobs."""
+        elapsed = (job.finished_at or time.time()) - (job.started_at or job.created_at)
+        line = f"{job.id}  {job.status:<9}  {job.params.get('url')}  {elapsed:.0f}s"
+        if job.status == "running" and job.message:
+            line += f"  [{job.message}]"
+        if job.error:
+            line += f"  error: {job.error}"
+        return line
+
+    def require_job(arguments: dict):
+        job_id = arguments.get("job_id")
+        if not job_id:
+            raise ValueError("job_id is required")
+        job = job_queue.get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job: {job_id}")
+        return job
+
     # Führt die Logik der Tools aus 
     @app.call_tool()
     async def call_tool(name: str, arguments: dict[str, Any]) -> list[types.ContentBlock]:
-        """Behandelt alle Tool-Aufrufe und führt die entsprechende Logik aus."""
+        """Behandelt alle Tool-Aufrufe; jeder Aufruf ist ein eigener Trace (Export laut Config)."""
+        tracer = Tracer()
+        try:
+            with use_tracer(tracer), span(f"tool.{name}"):
+                return await dispatch(name, arguments)
+        finally:
+            try:
+                tracer.export(pipeline.config.trace_export, pipeline.config.trace_dir)
+            except (OSError, ValueError) as e:
+                print_error(f"Trace export error: {str(e)}")
+
+    async def dispatch(name: str, arguments: dict[str, Any]) -> list[types.ContentBlock]:
+        """Führt die Logik des jeweiligen Tools aus."""
         
         # 1: Vollständige Test-Generierung
         if name == "generate_tests_full":
@@ -188,16 +502,25 @@ def main() -> int:
             # Hole optionale Parameter mit Standardwerten
             max_pages = arguments.get("max_pages", 10)
             stories = arguments.get("stories", "")
+            force = arguments.get("force", False)
+            timeout = arguments.get("timeout_seconds")
 
-            # Führe die komplette Pipeline aus
-            result = await pipeline.execute(url, max_pages, stories)
-            
-            response_text = f"""Test Generation Complete ✅
+            # Im Hintergrund: sofort mit Job-ID antworten
+            if arguments.get("background", False):
+                job = job_queue.submit({
+                    "url": url, "max_pages": max_pages, "stories": stories,
+                    "force": force, "timeout_seconds": timeout,
+                    # Eigene Run-ID: nach einem Neustart setzt der Job diesen Lauf fort
+                    "run_id": uuid.uuid4().hex,
+                })
+                response_text = f"Job queued: {job.id}\nPoll with job_status / job_result, stop with job_cancel."
+                return [types.TextContent(type="text", text=response_text)]
 
-Summary:
-- Total pages processed: {result.total_processed}
-- Errors encountered: {result.total_errors}
-- Output directory: out/ """
+            # Führe die komplette Pipeline aus (unveränderte Seiten werden übernommen)
+            result = await run_pipeline(url, max_pages, stories, force=force, timeout=timeout)
+            
+            title = "Test Generation Cancelled (partial result) ⏹" if result.cancelled else "Test Generation Complete ✅"
+            response_text = summary_text(title, run_summary(result))
 
             return [types.TextContent(type="text", text=response_text)]
 
@@ -207,8 +530,17 @@ Summary:
             if not base_url:
                 raise ValueError("base_url is required")
             
-            # Crawle alle Links auf der Website
-            result = await crawl_links(base_url)
+            # Crawle die Links der Website per Breitensuche
+            result = await crawl_links(
+                base_url,
+                pool=browser_pool,
+                max_depth=arguments.get("max_depth", 1),
+                max_pages=arguments.get("max_pages", 0),
+                include=arguments.get("include"),
+                exclude=arguments.get("exclude"),
+                load_profile=arguments.get("load_profile"),
+                source=arguments.get("source", pipeline.config.crawl_source),
+            )
             links = result.get('links', [])
             
             # Erstelle eine übersichtliche Antwort (max. 15 Links anzeigen)
@@ -224,8 +556,19 @@ Summary:
                 raise ValueError("url is required")
             
             # Scanne die Website und extrahiere das DOM
-            result = await scan_site(url)
-            response_text = f"Scanned {url}\nDOM extracted: {len(result.get('dom', ''))} chars"
+            result = await scan_site(
+                url, pool=browser_pool, cache=capture_cache, load_profile=arguments.get("load_profile")
+            )
+            load = result.get("load", {})
+            response_text = (
+                f"Scanned {url}\nDOM extracted: {len(result.get('dom', ''))} chars\n"
+                f"Load: {load.get('profile', '?')} profile, ready after {load.get('time_to_ready_ms', '?')} ms "
+                f"({load.get('ready', '?')}), {load.get('blocked_requests', 0)} requests blocked\n"
+                f"Title: {result.get('title', '')}\n"
+                f"Buttons: {len(result.get('buttons', []))}, Links: {len(result.get('links', []))}, "
+                f"Headings: {len(result.get('headings', []))}, Inputs: {len(result.get('textboxes', []))}, "
+                f"Forms: {result.get('forms', 0)}"
+            )
             return [types.TextContent(type="text", text=response_text)]
 
         # 4: UI-Modell extrahieren
@@ -236,9 +579,33 @@ Summary:
                 raise ValueError("url and name are required")
             
             # Zuerst die Seite scannen, dann Modell extrahieren
-            page_data = await scan_site(url)
-            result = extract_model(url, page_data.get("dom", ""))
-            response_text = f"Extracted model for {name_arg}\nElements: {len(result.get('elements', []))}"
+            page_data = await scan_site(
+                url, pool=browser_pool, cache=capture_cache, load_profile=arguments.get("load_profile")
+            )
+            extractor = arguments.get("extractor", pipeline.config.extractor)
+            result = await aextract_model(
+                url, page_data.get("dom", ""),
+                llm=pipeline.llm_for("extract") if extractor != "heuristic" else None,
+                use_cache=arguments.get("use_cache", True),
+                token_budget=arguments.get("token_budget", 3000),
+                max_chunks=arguments.get("max_chunks", pipeline.config.extract_max_chunks),
+                extractor=extractor,
+            )
+            dom_stats = result.get("dom_stats", {})
+            if "extractor" in dom_stats:
+                # Regelbasiert (ggf. mit LLM-Verfeinerung)
+                response_text = (
+                    f"Extracted model for {name_arg}\nElements: {len(result.get('elements', []))}\n"
+                    f"Extractor: {dom_stats['extractor']}, rules took {dom_stats.get('heuristic_ms', 0)} ms, "
+                    f"LLM calls: {dom_stats.get('chunks', 0)}"
+                )
+                return [types.TextContent(type="text", text=response_text)]
+            response_text = (
+                f"Extracted model for {name_arg}\nElements: {len(result.get('elements', []))}\n"
+                f"DOM: {dom_stats.get('original_chars', 0)} -> {dom_stats.get('reduced_chars', 0)} chars "
+                f"(ratio {dom_stats.get('reduction_ratio', 1.0)}, ~{dom_stats.get('est_tokens', 0)} tokens)\n"
+                f"LLM calls: {dom_stats.get('chunks', 1)} chunk(s), ~{dom_stats.get('prompt_est_tokens', 0)} outline tokens"
+            )
             return [types.TextContent(type="text", text=response_text)]
 
         # 5: Page Object Model generieren 
@@ -249,7 +616,9 @@ Summary:
                 raise ValueError("name and model are required")
             
             # Generiere POM aus dem UI-Modell
-            result = generate_pom(name_arg, model)
+            result = await agenerate_pom(
+                name_arg, model, llm=pipeline.llm_for("pom"), use_cache=arguments.get("use_cache", True),
+            )
             response_text = f"Generated POM: {result}"
             return [types.TextContent(type="text", text=response_text)]
 
@@ -259,10 +628,18 @@ Summary:
             if not pom_path:
                 raise ValueError("pom_path is required")
             
-            # Überprüfe ob das POM syntaktisch korrekt ist
-            is_valid, message = verify_pom(pom_path)
-            status = "Valid" if is_valid else "Invalid"
-            response_text = f"{status}: {pom_path}\n{message}"
+            # Prüfe alle passenden POMs in einem Durchlauf
+            paths = resolve_targets(pom_path)
+            if not paths:
+                raise ValueError(f"No POM files found for: {pom_path}")
+            results = await anyio.to_thread.run_sync(verify_poms, paths)
+
+            valid = sum(1 for diagnostics in results.values() if is_valid(diagnostics))
+            lines = [f"Verified {len(results)} file(s): {valid} valid, {len(results) - valid} invalid"]
+            for path, diagnostics in results.items():
+                status = "Valid" if is_valid(diagnostics) else "Invalid"
+                lines.append(f"\n{status}: {path}\n{format_diagnostics(diagnostics)}")
+            response_text = "\n".join(lines)
             return [types.TextContent(type="text", text=response_text)]
 
         # 7: Datei reparieren
@@ -273,14 +650,16 @@ Summary:
                 raise ValueError("file_path is required")
             
             # Versuche Syntax-Fehler in der Datei zu beheben
-            result = repair_file(file_path, error_message)
+            result = await arepair_file(
+                file_path, error_message, llm=pipeline.llm_for("repair"), use_cache=arguments.get("use_cache", True),
+            )
             response_text = f"Repaired: {file_path}"
             return [types.TextContent(type="text", text=response_text)]
 
         # 8: Schnell-Demo 
         elif name == "quick_start":
             # Führe Demo mit vordefinierter URL und 2 Seiten aus
-            result = await pipeline.execute("https://the-internet.herokuapp.com", 2)
+            result = await run_pipeline("https://the-internet.herokuapp.com", 2)
             response_text = f"""Demo Complete ✅
 
 Summary:
@@ -290,18 +669,98 @@ Summary:
 """
             return [types.TextContent(type="text", text=response_text)]
 
+        # 9: Browser-Pool-Statistiken
+        elif name == "browser_pool_stats":
+            stats = browser_pool.stats()
+            response_text = "Browser Pool\n" + "\n".join(f"- {key}: {value}" for key, value in stats.items())
+            return [types.TextContent(type="text", text=response_text)]
+
+        # 10: Cache-Statistiken
+        elif name == "cache_stats":
+            sections = {
+                "Page Capture Cache": capture_cache.stats(),
+                "LLM Response Cache": llm_cache.stats(),
+                "LLM Clients": llm_registry.stats(),
+            }
+            response_text = "\n\n".join(
+                title + "\n" + "\n".join(f"- {key}: {value}" for key, value in stats.items())
+                for title, stats in sections.items()
+            )
+            return [types.TextContent(type="text", text=response_text)]
+
+        # 11: Job-Status
+        elif name == "job_status":
+            if arguments.get("job_id"):
+                response_text = job_text(require_job(arguments))
+            else:
+                jobs = job_queue.list()
+                response_text = "\n".join(job_text(job) for job in jobs) if jobs else "No jobs"
+            return [types.TextContent(type="text", text=response_text)]
+
+        # 12: Job-Ergebnis
+        elif name == "job_result":
+            job = require_job(arguments)
+            if job.status == "failed":
+                response_text = f"Job {job.id} failed: {job.error}"
+            elif job.result is None:
+                response_text = f"Job {job.id} is {job.status}, no result yet"
+            else:
+                title = f"Job {job.id} cancelled (partial result) ⏹" if job.status == "cancelled" else f"Job {job.id} complete ✅"
+                response_text = summary_text(title, job.result)
+                failed = {url: page["errors"] for url, page in job.result["pages"].items() if page["errors"]}
+                if failed:
+                    response_text += "\n\nFailed pages:\n" + "\n".join(f"- {url}: {errors[0]}" for url, errors in failed.items())
+            return [types.TextContent(type="text", text=response_text)]
+
+        # 13: Job abbrechen
+        elif name == "job_cancel":
+            job = job_queue.cancel(require_job(arguments).id)
+            response_text = f"Job {job.id}: {job.status}" + (" (stopping, finished pages are kept)" if job.status == "running" else "")
+            return [types.TextContent(type="text", text=response_text)]
+
+        # 14: Lauf fortsetzen
+        elif name == "resume_run":
+            run_id = arguments.get("run_id")
+            if not run_id:
+                raise ValueError("run_id is required")
+            if pipeline.checkpointer is None or not pipeline.checkpointer.has_run(run_id):
+                raise ValueError(f"Unknown or already completed run: {run_id}")
+
+            if arguments.get("background", False):
+                state = (await pipeline.graph.aget_state({"configurable": {"thread_id": run_id}})).values
+                job = job_queue.submit({
+                    "url": state.get("base_url"), "max_pages": state.get("max_pages"),
+                    "timeout_seconds": arguments.get("timeout_seconds"), "run_id": run_id,
+                })
+                response_text = f"Job queued: {job.id}\nPoll with job_status / job_result, stop with job_cancel."
+                return [types.TextContent(type="text", text=response_text)]
+
+            result = await run_pipeline("", 0, timeout=arguments.get("timeout_seconds"), resume=run_id)
+            title = "Resumed Run Cancelled (partial result) ⏹" if result.cancelled else "Resumed Run Complete ✅"
+            response_text = summary_text(title, run_summary(result))
+            return [types.TextContent(type="text", text=response_text)]
+
         # Unbekanntes Tool wurde aufgerufen
         raise ValueError(f"Unknown tool: {name}")
 
     # Asynchrone Funktion zum Starten des Servers
     async def arun():
         """Startet den MCP-Server mit stdio-Transport."""
-        async with stdio_server() as streams:
-            await app.run(
-                streams[0],  # Input-Stream
-                streams[1],  # Output-Stream
-                app.create_initialization_options()
-            )
+        # Gespeicherte Jobs übernehmen und Worker starten
+        await job_queue.start()
+        try:
+            async with stdio_server() as streams:
+                await app.run(
+                    streams[0],  # Input-Stream
+                    streams[1],  # Output-Stream
+                    app.create_initialization_options()
+                )
+        finally:
+            # Laufende Jobs bleiben gespeichert und starten beim nächsten Mal neu
+            await job_queue.close()
+            # Browser und LLM-Verbindungen beim Beenden des Servers sauber schließen
+            await browser_pool.close()
+            await llm_registry.aclose()
 
     # Server-Start mit Header-Ausgabe
     print_header("PLAYWRIGHT TEST GENERATOR MCP")
@@ -1,56 +1,58 @@
-"""Tool zum Crawlen aller Links auf einer Website."""
-
-from urllib.parse import urljoin, urlparse
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-
-
-async def crawl_links(base_url: str) -> dict:
+"""Tool zum Crawlen aller Links auf einer Website (Browser oder Sitemap)."""
+
+from contextlib import aclosing
+from typing import List, Optional
+
+from src.core.browser_pool import BrowserPool
+from src.core.crawler import SiteCrawler
+
+
+async def crawl_links(
+    base_url: str,
+    pool: Optional[BrowserPool] = None,
+    max_depth: int = 1,
+    max_pages: int = 0,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    per_host_concurrency: int = 2,
+    load_profile: Optional[str] = None,
+    source: str = "crawl",
+) -> dict:
     """
-    Crawlt alle Links von der Hauptseite einer Website.
+    Crawlt die Links einer Website per Breitensuche.
 
     Args:
         base_url: Basis-URL von der aus gecrawlt wird
+        pool: Browser-Pool (Standard: prozessweiter Pool)
+        max_depth: Link-Tiefe (1 = nur Links der Startseite)
+        max_pages: Maximale Anzahl Links (0 = unbegrenzt)
+        include: Optionale Glob-Muster, die URLs treffen müssen
+        exclude: Optionale Glob-Muster für ignorierte URLs
+        per_host_concurrency: Gleichzeitige Seitenaufrufe pro Host
+        load_profile: Lade-Profil ("full", "fast", "minimal"; Standard: "fast")
+        source: "crawl" (Links im Browser verfolgen), "sitemap" (robots.txt/sitemap.xml,
+            ohne Browser) oder "auto" (Sitemap, ohne Treffer Crawl)
 
     Returns:
-        dict mit Keys: base_url, links (Liste von absoluten URLs)
+        dict mit Keys: base_url, links (Liste von kanonischen absoluten URLs), errors
     """
-    links = []
-
-    # Starte Playwright Browser (headless = ohne sichtbares Fenster)
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        try:
-            # Navigiere zur Seite und warte bis alle Netzwerk-Requests fertig sind
-            await page.goto(base_url, wait_until="networkidle", timeout=30000)
-            html = await page.content()
-
-            # Parse HTML mit BeautifulSoup und extrahiere alle Links
-            soup = BeautifulSoup(html, "html.parser")
-            
-            for link in soup.find_all("a", href=True):
-                href = link.get("href")
-                # Ignoriere Anker-Links (die mit # beginnen)
-                if href and not href.startswith("#"):
-                    # Konvertiere relative URLs in absolute URLs
-                    absolute_url = urljoin(base_url, href)
-                    
-                    # Behalte nur Links von der gleichen Domain
-                    parsed_base = urlparse(base_url)
-                    parsed_link = urlparse(absolute_url)
-                    
-                    # Prüfe ob Domain übereinstimmt
-                    if parsed_link.netloc == parsed_base.netloc:
-                        # Vermeide Duplikate
-                        if absolute_url not in links:
-                            links.append(absolute_url)
-
-            return {
-                "base_url": base_url,
-                "links": links,
-            }
-        finally:
-            await page.close()
-            await browser.close()
+    crawler = SiteCrawler(
+        base_url,
+        pool=pool,
+        max_depth=max_depth,
+        max_pages=max_pages,
+        include=include,
+        exclude=exclude,
+        per_host_concurrency=per_host_concurrency,
+        load_profile=load_profile,
+        source=source,
+    )
+
+    async with aclosing(crawler.crawl()) as stream:
+        links = [link async for link in stream]
+
+    return {
+        "base_url": base_url,
+        "links": links,
+        "errors": crawler.errors,
+    }
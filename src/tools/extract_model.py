@@ -1,42 +1,207 @@
-"""Tool zum Extrahieren eines UI-Modells aus dem DOM mittels LLM."""
+"""Tool zum Extrahieren eines UI-Modells aus dem DOM (LLM, Regeln oder Regeln + LLM-Verfeinerung)."""
 
+import asyncio
 import json
-import os
-from typing import Optional, Dict, Any
+import re
+import time
+from typing import Optional, Dict, Any, List, Tuple
 
-from langchain_openai import ChatOpenAI
-from src.core.prompts import EXTRACT_INSTRUCTIONS
+from src.core.dom_reducer import OutlineChunk, ReducedDom, chunk_outline, reduce_dom
+from src.core.llm_cache import ainvoke_llm, invoke_llm
+from src.core.llm_clients import get_llm
+from src.core.prompts import EXTRACT_INSTRUCTIONS, REFINE_ELEMENTS_PROMPT
+from src.core.tracing import record
+from src.tools.heuristic_extract import heuristic_extract
 
 
-def extract_model(url: str, dom: str, hints: Optional[str] = None) -> Dict[str, Any]:
+EXTRACTORS = ("llm", "heuristic", "hybrid")
+REFINE_BATCH = 40  # Elemente pro Verfeinerungs-Aufruf
+
+
+def extract_model(url: str, dom: str, hints: Optional[str] = None, llm=None,
+                  use_cache: bool = True, token_budget: int = 3000, max_chunks: int = 1,
+                  extractor: str = "llm") -> Dict[str, Any]:
     """
-    Extrahiert ein PageModel aus dem DOM mithilfe eines LLM (KI).
+    Extrahiert ein PageModel aus dem DOM mithilfe eines LLM (KI) oder fester Regeln.
     
     Args:
         url: URL der Seite
         dom: HTML/DOM-Inhalt der Seite
         hints: Optionale Hinweise für die KI
+        llm: Optionaler LLM-Client (Standard: gpt-4o-mini)
+        use_cache: False = LLM-Antwort-Cache für diesen Aufruf umgehen
+        token_budget: Maximal geschätzte Tokens des reduzierten DOM pro LLM-Aufruf
+        max_chunks: Große Seiten in bis zu so viele Landmark-Abschnitte teilen und
+            einzeln extrahieren (1 = auf token_budget kürzen)
+        extractor: "llm" (KI liest die DOM-Gliederung), "heuristic" (nur Regeln, kein LLM)
+            oder "hybrid" (Regeln, KI verbessert nur Namen und Zweck)
     
     Returns:
-        Dict mit UI-Elementen und deren Locators
+        Dict mit UI-Elementen, deren Locators und Kennzahlen der DOM-Reduktion ("dom_stats")
+    """
+    if extractor != "llm":
+        model = _heuristic(url, dom, extractor)
+        if extractor == "heuristic":
+            return model
+        if model["elements"]:
+            llm = llm or _default_llm()
+            contents = [
+                invoke_llm(llm, _refine_prompt(url, batch), use_cache=use_cache) for batch in _refine_batches(model)
+            ]
+            return _apply_refinement(model, contents)
+        # Regeln finden nichts (z.B. nur Canvas/Custom-Widgets): volle KI-Extraktion
+
+    llm = llm or _default_llm()
+
+    # Reduziere DOM auf eine kompakte Gliederung (statt hartem Abschneiden)
+    reduced, chunks = _prepare(dom, token_budget, max_chunks)
+
+    # Rufe LLM auf (oder hole die Antwort aus dem Cache), bei großen Seiten pro Abschnitt
+    if not chunks:
+        content = invoke_llm(llm, _build_prompt(url, reduced.text, hints), use_cache=use_cache)
+        return _with_stats(_parse_response(content), reduced)
+    contents = [invoke_llm(llm, _chunk_prompt(url, chunks, i, hints), use_cache=use_cache) for i in range(len(chunks))]
+    return _with_stats(_merge(url, contents, chunks), reduced, chunks)
+
+
+async def aextract_model(url: str, dom: str, hints: Optional[str] = None, llm=None,
+                         use_cache: bool = True, token_budget: int = 3000, max_chunks: int = 1,
+                         extractor: str = "llm") -> Dict[str, Any]:
+    """Async-Variante von extract_model (Abschnitte und Verfeinerungen laufen gleichzeitig)."""
+    if extractor != "llm":
+        model = _heuristic(url, dom, extractor)
+        if extractor == "heuristic":
+            return model
+        if model["elements"]:
+            llm = llm or _default_llm()
+            contents = await asyncio.gather(*(
+                ainvoke_llm(llm, _refine_prompt(url, batch), use_cache=use_cache) for batch in _refine_batches(model)
+            ))
+            return _apply_refinement(model, contents)
+        # Regeln finden nichts (z.B. nur Canvas/Custom-Widgets): volle KI-Extraktion
+
+    llm = llm or _default_llm()
+    reduced, chunks = _prepare(dom, token_budget, max_chunks)
+
+    if not chunks:
+        content = await ainvoke_llm(llm, _build_prompt(url, reduced.text, hints), use_cache=use_cache)
+        return _with_stats(_parse_response(content), reduced)
+    contents = await asyncio.gather(*(
+        ainvoke_llm(llm, _chunk_prompt(url, chunks, i, hints), use_cache=use_cache) for i in range(len(chunks))
+    ))
+    return _with_stats(_merge(url, contents, chunks), reduced, chunks)
+
+
+def _prepare(dom: str, token_budget: int, max_chunks: int) -> Tuple[ReducedDom, List[OutlineChunk]]:
+    """
+    Reduziert das DOM und teilt es bei Bedarf in Abschnitte.
+
+    Returns:
+        (reduzierter DOM, Abschnitte) – keine Abschnitte = ein einziger Aufruf
+    """
+    if max_chunks <= 1:
+        reduced = reduce_dom(dom, token_budget)
+        record(reduced_dom_bytes=len(reduced.text.encode("utf-8")))
+        return reduced, []
+
+    # Gesamtbudget über alle Abschnitte, jeder Aufruf bleibt unter token_budget
+    reduced = reduce_dom(dom, token_budget * max_chunks)
+    record(reduced_dom_bytes=len(reduced.text.encode("utf-8")))
+    if reduced.est_tokens <= token_budget:
+        return reduced, []
+    chunks = chunk_outline(reduced, token_budget)
+    if len(chunks) > max_chunks:
+        # Verschnitt beim Packen: letzte Abschnitte fallen weg wie bei der Kürzung
+        chunks, reduced.truncated = chunks[:max_chunks], True
+    record(extract_chunks=len(chunks))
+    return reduced, chunks
+
+
+def _heuristic(url: str, dom: str, extractor: str) -> Dict[str, Any]:
+    """Regelbasierte Extraktion mit Kennzahlen in "dom_stats"."""
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor: {extractor} (expected one of {', '.join(EXTRACTORS)})")
+    start = time.perf_counter()
+    model = heuristic_extract(url, dom)
+    seconds = time.perf_counter() - start
+    record(heuristic_seconds=seconds)
+    model["dom_stats"] = {
+        "extractor": extractor,
+        "original_chars": len(dom),
+        "elements": len(model["elements"]),
+        "heuristic_ms": round(seconds * 1000, 2),
+        "chunks": 0,
+    }
+    return model
+
+
+def _refine_batches(model: Dict[str, Any]) -> List[List[Tuple[int, Dict[str, Any]]]]:
+    """Teilt die Elemente (mit Index) in Gruppen zu REFINE_BATCH für die Verfeinerung."""
+    indexed = list(enumerate(model["elements"]))
+    batches = [indexed[i:i + REFINE_BATCH] for i in range(0, len(indexed), REFINE_BATCH)]
+    model["dom_stats"]["chunks"] = len(batches)
+    return batches
+
+
+def _refine_prompt(url: str, batch: List[Tuple[int, Dict[str, Any]]]) -> str:
+    """Verfeinerungs-Prompt: eine Zeile pro Element (Index. Name | Locator | Zweck)."""
+    rows = []
+    for index, element in batch:
+        locator = element["locator"]
+        described = f'{locator["strategy"]}={locator["value"]}' + (f' name={locator["name"]}' if locator.get("name") else "")
+        rows.append(f"{index}. {element['name']} | {described} | {element['purpose']}")
+    return REFINE_ELEMENTS_PROMPT.format(url=url, elements="\n".join(rows))
+
+
+def _apply_refinement(model: Dict[str, Any], contents: List[str]) -> Dict[str, Any]:
+    """
+    Übernimmt verbesserte Namen und Zweck-Beschreibungen.
+
+    Locators und Aktionen bleiben unverändert; ungültige oder doppelte Namen
+    und unlesbare Antworten behalten die regelbasierten Werte.
     """
-    # Hole API-Key aus Umgebungsvariablen
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not set")
+    elements = model["elements"]
+    refined: Dict[int, Dict[str, Any]] = {}
+    errors = []
+    for content in contents:
+        try:
+            answer = _parse_response(content)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        for item in answer.get("elements", []) if isinstance(answer, dict) else []:
+            if isinstance(item, dict) and isinstance(item.get("index"), int) and 0 <= item["index"] < len(elements):
+                refined[item["index"]] = item
 
-    # Initialisiere OpenAI LLM (GPT-4o-mini)
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1, api_key=api_key)
+    names = {e["name"] for i, e in enumerate(elements) if i not in refined}
+    for index, element in enumerate(elements):
+        item = refined.get(index)
+        if item is None:
+            continue
+        name = str(item.get("name") or "")
+        if not (re.fullmatch(r"[a-z][A-Za-z0-9]*", name) and name not in names):
+            name = element["name"]
+        element["name"] = _unique_name(name, "", names)
+        if item.get("purpose"):
+            element["purpose"] = str(item["purpose"])[:200]
+    if errors:
+        model["refine_errors"] = errors
+    return model
 
-    # Kürze DOM falls zu lang (Token-Limit)
-    if len(dom) > 5000:
-        dom = dom[:5000]
 
-    # Baue Prompt für die KI
-    prompt = f"""{EXTRACT_INSTRUCTIONS}
+def _default_llm():
+    """Standard-Client (OpenAI GPT-4o-mini) aus der gemeinsamen Registry."""
+    return get_llm("openai", "gpt-4o-mini", 0.1)
+
+
+def _build_prompt(url: str, outline: str, hints: Optional[str], part: str = "") -> str:
+    """Baut den Extraktions-Prompt für die KI aus der reduzierten DOM-Gliederung."""
+    return f"""{EXTRACT_INSTRUCTIONS}
 
 URL: {url}
-DOM: {dom}
+{part}DOM outline (one element per line: tag#id[attributes] "text", indentation = nesting,
+"… +N more similar" = repeated siblings omitted):
+{outline}
 {f"Hints: {hints}" if hints else ""}
 
 Return JSON with:
@@ -49,9 +214,79 @@ Return JSON with:
 
 Return ONLY JSON, no markdown."""
 
-    # Rufe LLM auf und hole Antwort
-    response = llm.invoke(prompt)
-    content = response.content.strip()
+
+def _chunk_prompt(url: str, chunks: List[OutlineChunk], index: int, hints: Optional[str]) -> str:
+    """Extraktions-Prompt für einen Abschnitt der Seite."""
+    chunk = chunks[index]
+    part = (f"Part {index + 1} of {len(chunks)} of this page (starting at <{chunk.label}>); "
+            "extract only the elements in this part.\n")
+    return _build_prompt(url, chunk.text, hints, part)
+
+
+def _merge(url: str, contents: List[str], chunks: List[OutlineChunk]) -> Dict[str, Any]:
+    """
+    Führt die Element-Listen der Abschnitte zusammen.
+
+    Gleiche Locators (z.B. Navigation, die in zwei Teilen auftaucht) zählen
+    einmal; gleiche Namen mit verschiedenen Locators bekommen den Abschnitt
+    als Suffix (searchInput, searchInputMain, ...).
+    """
+    elements: List[Dict[str, Any]] = []
+    names, locators = set(), set()
+    errors = []
+    for content, chunk in zip(contents, chunks):
+        try:
+            model = _parse_response(content)
+        except ValueError as e:
+            errors.append(f"{chunk.label}: {e}")
+            continue
+        for element in model.get("elements", []) if isinstance(model, dict) else []:
+            if not isinstance(element, dict):
+                continue
+            locator = element.get("locator") or {}
+            key = (str(locator.get("strategy", "")).lower(), str(locator.get("value", "")).strip())
+            if key[1] and key in locators:
+                continue
+            locators.add(key)
+            element["name"] = _unique_name(str(element.get("name") or "element"), chunk.label, names)
+            elements.append(element)
+
+    # Ein einzelner unlesbarer Abschnitt kostet nur dessen Elemente
+    if errors and len(errors) == len(chunks):
+        raise ValueError(f"Parse error in all {len(chunks)} chunks: {errors[0]}")
+    model: Dict[str, Any] = {"url": url, "elements": elements}
+    if errors:
+        model["chunk_errors"] = errors
+    return model
+
+
+def _unique_name(name: str, label: str, names: set) -> str:
+    """Eindeutiger Elementname: erst mit Abschnitts-Suffix, dann mit Zähler."""
+    candidate = name
+    if candidate in names:
+        suffix = "".join(w.capitalize() for w in re.findall(r"[A-Za-z0-9]+", label))
+        candidate = name + suffix
+    n = 2
+    while candidate in names:
+        candidate, n = f"{name}{n}", n + 1
+    names.add(candidate)
+    return candidate
+
+
+def _with_stats(model: Dict[str, Any], reduced, chunks: Optional[List[OutlineChunk]] = None) -> Dict[str, Any]:
+    """Hängt die Kennzahlen der DOM-Reduktion (inkl. Anzahl Abschnitte und Prompt-Tokens) an das Modell an."""
+    if isinstance(model, dict):
+        model["dom_stats"] = {
+            **reduced.stats(),
+            "chunks": len(chunks) if chunks else 1,
+            "prompt_est_tokens": sum(c.est_tokens for c in chunks) if chunks else reduced.est_tokens,
+        }
+    return model
+
+
+def _parse_response(content: str) -> Dict[str, Any]:
+    """Parst die JSON-Antwort der KI."""
+    content = content.strip()
 
     # Entferne Markdown-Code-Blöcke falls vorhanden
     if content.startswith("```"):
@@ -1,12 +1,17 @@
 """Tool zum Generieren von Page Object Models (POMs) aus UI-Modellen."""
 
+import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from src.core.llm_cache import ainvoke_llm, invoke_llm
+from src.core.llm_clients import get_llm
 from src.core.prompts import IMPROVE_POM_PROMPT
+from src.core.tracing import measure
 
 
-def generate_pom(name: str, model: Dict[str, Any], use_ai: bool = True, llm=None) -> str:
+def generate_pom(name: str, model: Dict[str, Any], use_ai: bool = True, llm=None,
+                 use_cache: bool = True, components: Optional[Dict[str, str]] = None) -> str:
     """
     Generiert eine Python POM-Klassen-Datei aus einem PageModel.
     Nutzt optional KI um POMs mit Best Practices zu verbessern.
@@ -15,46 +20,79 @@ def generate_pom(name: str, model: Dict[str, Any], use_ai: bool = True, llm=None
         name: Klassenname (z.B. 'MainPage')
         model: PageModel-Instanz mit UI-Elementen
         use_ai: KI zur Verbesserung des POMs nutzen (Standard: True)
-        llm: LLM-Client aus der Pipeline (AzureChatOpenAI)
+        llm: LLM-Client (Standard: gemeinsamer Client aus der Registry)
+        use_cache: False = LLM-Antwort-Cache für diesen Aufruf umgehen
+        components: Gemeinsame Komponenten als Attributname -> Klassenname
+            (z.B. {"header": "HeaderComponent"}), werden importiert und im Konstruktor erzeugt
 
     Returns:
         Pfad zur generierten POM-Datei
     """
-    # Erstelle Output-Verzeichnis für POMs
-    poms_dir = Path("out/POMS")
-    poms_dir.mkdir(parents=True, exist_ok=True)
-
-    # Fallback falls kein Name angegeben
-    if not name:
-        name = "GeneratedPage"
-
-    # Konvertiere Name in CamelCase Klassenname
-    class_name = "".join(word.capitalize() for word in name.split("_"))
+    class_name = _class_name(name)
     
     # Generiere Basis-POM
-    basic_pom = _generate_basic_pom(class_name, model)
+    basic_pom = _generate_basic_pom(class_name, model, components)
     
     # Optional: Verbessere POM mit KI
     if use_ai:
         try:
-            enhanced_pom = _enhance_pom_with_ai(basic_pom, class_name, model, llm)
+            enhanced_pom = _enhance_pom_with_ai(basic_pom, class_name, model, llm, use_cache)
+        except Exception as e:
+            print(f"AI enhancement failed, using basic POM: {e}")
+            enhanced_pom = basic_pom
+    else:
+        enhanced_pom = basic_pom
+
+    return _write_pom(class_name, enhanced_pom)
+
+
+async def agenerate_pom(name: str, model: Dict[str, Any], use_ai: bool = True, llm=None,
+                        use_cache: bool = True, components: Optional[Dict[str, str]] = None) -> str:
+    """Async-Variante von generate_pom (KI-Verbesserung blockiert den Event-Loop nicht)."""
+    class_name = _class_name(name)
+    basic_pom = _generate_basic_pom(class_name, model, components)
+
+    if use_ai:
+        try:
+            enhanced_pom = await _aenhance_pom_with_ai(basic_pom, class_name, model, llm, use_cache)
         except Exception as e:
             print(f"AI enhancement failed, using basic POM: {e}")
             enhanced_pom = basic_pom
     else:
         enhanced_pom = basic_pom
 
+    return _write_pom(class_name, enhanced_pom)
+
+
+def _class_name(name: str) -> str:
+    """Konvertiert den Namen in einen CamelCase-Klassennamen."""
+    # Fallback falls kein Name angegeben
+    if not name:
+        name = "GeneratedPage"
+    return "".join(word.capitalize() for word in name.split("_"))
+
+
+def _write_pom(class_name: str, content: str) -> str:
+    """Schreibt die POM-Datei nach out/POMS und gibt den Pfad zurück."""
+    # Erstelle Output-Verzeichnis für POMs
+    poms_dir = Path("out/POMS")
+    poms_dir.mkdir(parents=True, exist_ok=True)
+
     # Schreibe POM-Datei
     filename = f"{class_name}.py"
     file_path = poms_dir / filename
-    file_path.write_text(enhanced_pom)
+    with measure("write_seconds"):
+        file_path.write_text(content)
 
     return str(file_path)
 
 
-def _generate_basic_pom(class_name: str, model: Dict[str, Any]) -> str:
+def _generate_basic_pom(class_name: str, model: Dict[str, Any], components: Optional[Dict[str, str]] = None) -> str:
     """Generiert ein Basis-POM-Template ohne KI-Verbesserung."""
-    locator_inits = []
+    # Gemeinsame Komponenten (Header, Navigation, ...) liegen als eigene POMs daneben
+    components = components or {}
+    component_imports = "".join(f"from {cls} import {cls}\n" for cls in sorted(set(components.values())))
+    locator_inits = [f"        self.{attr} = {cls}(page)" for attr, cls in components.items()]
     elements = model.get("elements", []) if isinstance(model, dict) else model.elements
     
     for elem in elements:
@@ -62,9 +100,9 @@ def _generate_basic_pom(class_name: str, model: Dict[str, Any]) -> str:
         locator = elem.get("locator") if isinstance(elem, dict) else elem.locator
         
         if isinstance(locator, dict):
-            loc_code = _build_locator_code(locator.get("strategy"), locator.get("value"))
+            loc_code = _build_locator_code(locator.get("strategy"), locator.get("value"), locator.get("name"))
         else:
-            loc_code = _build_locator_code(locator.strategy, locator.value)
+            loc_code = _build_locator_code(locator.strategy, locator.value, getattr(locator, "name", None))
         
         locator_inits.append(f"        self.{elem_name} = {loc_code}")
 
@@ -87,7 +125,7 @@ def _generate_basic_pom(class_name: str, model: Dict[str, Any]) -> str:
     pom_template = f"""\"\"\"Auto-generated Page Object Model for Playwright.\"\"\"
 
 from playwright.sync_api import Page, expect
-
+{component_imports}
 
 class {class_name}:
     \"\"\"Page Object for {model_url}\"\"\"
@@ -105,16 +143,25 @@ class {class_name}:
     return pom_template
 
 
-def _enhance_pom_with_ai(basic_pom: str, class_name: str, model: Dict[str, Any], llm=None) -> str:
+def _enhance_pom_with_ai(basic_pom: str, class_name: str, model: Dict[str, Any], llm=None,
+                         use_cache: bool = True) -> str:
     """Use AI to enhance POM with best practices."""
-    if llm is None:
-        from src.core.pipeline import PlaywrightPipeline
-        pipeline = PlaywrightPipeline()
-        llm = pipeline.llm_gpt5
-    
+    llm = llm or get_llm()
     prompt = IMPROVE_POM_PROMPT.format(current_pom=basic_pom)
-    response = llm.invoke(prompt)
-    improved_content = response.content.strip()
+    return _clean_enhanced_pom(invoke_llm(llm, prompt, use_cache=use_cache))
+
+
+async def _aenhance_pom_with_ai(basic_pom: str, class_name: str, model: Dict[str, Any], llm=None,
+                                use_cache: bool = True) -> str:
+    """Async variant of _enhance_pom_with_ai using ainvoke."""
+    llm = llm or get_llm()
+    prompt = IMPROVE_POM_PROMPT.format(current_pom=basic_pom)
+    return _clean_enhanced_pom(await ainvoke_llm(llm, prompt, use_cache=use_cache))
+
+
+def _clean_enhanced_pom(content: str) -> str:
+    """Strip markdown fences from the AI response."""
+    improved_content = content.strip()
     
     if improved_content.startswith("```"):
         improved_content = improved_content[improved_content.find("import"):]
@@ -124,17 +171,18 @@ def _enhance_pom_with_ai(basic_pom: str, class_name: str, model: Dict[str, Any],
     return improved_content
 
 
-def _build_locator_code(strategy: str, value: str) -> str:
-    """Build Playwright locator code."""
+def _build_locator_code(strategy: str, value: str, name: str = None) -> str:
+    """Build Playwright locator code (role optionally with accessible name)."""
+    q = json.dumps
     strategies = {
-        "role": lambda v: f'self.page.get_by_role("{v}")',
-        "label": lambda v: f'self.page.get_by_label("{v}")',
-        "placeholder": lambda v: f'self.page.get_by_placeholder("{v}")',
-        "testId": lambda v: f'self.page.get_by_test_id("{v}")',
-        "text": lambda v: f'self.page.get_by_text("{v}")',
-        "css": lambda v: f'self.page.locator("{v}")',
+        "role": lambda v: f'self.page.get_by_role({q(v)}, name={q(name)})' if name else f'self.page.get_by_role({q(v)})',
+        "label": lambda v: f'self.page.get_by_label({q(v)})',
+        "placeholder": lambda v: f'self.page.get_by_placeholder({q(v)})',
+        "testId": lambda v: f'self.page.get_by_test_id({q(v)})',
+        "text": lambda v: f'self.page.get_by_text({q(v)})',
+        "css": lambda v: f'self.page.locator({q(v)})',
     }
-    return strategies.get(strategy, lambda v: f'self.page.locator("{v}")')(value)
+    return strategies.get(strategy, lambda v: f'self.page.locator({q(v)})')(value)
 
 
 def _build_action_method(elem_name: str, action: str) -> str:
@@ -143,6 +191,8 @@ def _build_action_method(elem_name: str, action: str) -> str:
         "click": (f"self.{elem_name}.click()", ""),
         "fill": (f"self.{elem_name}.fill(value)", "value: str"),
         "check": (f"self.{elem_name}.check()", ""),
+        "select": (f"self.{elem_name}.select_option(value)", "value: str"),
     }
     code, param = actions.get(action, (f"# {action}", ""))
-    return f"    def {action}_{elem_name}({param}) -> None:\n        {code}"
+    params = f"self, {param}" if param else "self"
+    return f"    def {action}_{elem_name}({params}) -> None:\n        {code}"
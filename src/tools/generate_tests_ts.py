@@ -1,55 +1,219 @@
 """Tool zum Generieren von TypeScript Playwright-Tests mittels LLM."""
 
+import asyncio
 import os
 import json
+import re
 from pathlib import Path
-from src.core.prompts import GENERATE_TEST_PROMPT_TS, EXTRACT_TEST_SCENARIOS_PROMPT
+from typing import Collection, Dict, List, Optional, Set, Tuple
+from src.core.browser_pool import BrowserPool
+from src.core.capture_cache import CaptureCache
+from src.core.colors import print_info
+from src.core.llm_cache import ainvoke_llm
+from src.core.llm_clients import get_llm
+from src.tools.scan_site import scan_site
+from src.core.prompts import (
+    GENERATE_TEST_PROMPT_TS, EXTRACT_TEST_SCENARIOS_PROMPT,
+    GENERATE_SCENARIOS_AND_TESTS_PROMPT_TS, GENERATE_TESTS_BATCH_PROMPT_TS,
+)
+from src.core.tracing import measure, record
 
 
-def generate_tests_ts(pom_path: str, stories: str = "", llm=None) -> str:
+# Blöcke der strukturierten Antworten (Ein-Aufruf- und Batch-Modus)
+SCENARIOS_BLOCK = re.compile(r"<scenarios>\s*(.*?)\s*</scenarios>", re.S)
+CODE_BLOCK = re.compile(r"<code>\s*(.*?)\s*(?:</code>|$)", re.S)
+SPEC_BLOCK = re.compile(r'<spec page="([^"]+)">\s*(.*?)\s*</spec>', re.S)
+
+
+async def generate_tests_ts(pom_path: str, stories: str = "", llm=None,
+                            pool: Optional[BrowserPool] = None,
+                            cache: Optional[CaptureCache] = None, use_cache: bool = True,
+                            load_profile: Optional[str] = None, scenario_llm=None,
+                            single_call: bool = False, exclude_texts: Collection[str] = ()) -> str:
     """
     Generiert umfassende TypeScript Playwright-Tests mithilfe eines LLM.
     
     Args:
         pom_path: Pfad zur POM-Datei
         stories: Optionale User Stories zur Test-Generierung
-        llm: LLM-Client aus der Pipeline (AzureChatOpenAI)
+        llm: LLM-Client (Standard: gemeinsamer Client aus der Registry)
+        pool: Browser-Pool für den Seiten-Scan (Standard: prozessweiter Pool)
+        cache: Capture-Cache (Standard: prozessweiter Cache)
+        use_cache: False = LLM-Antwort-Cache für diesen Aufruf umgehen
+        load_profile: Lade-Profil des Seiten-Scans (gleiches Profil = Capture aus dem Cache)
+        scenario_llm: Eigener (schnellerer) Client für die Szenarien (Standard: llm)
+        single_call: Szenarien und Code in einem LLM-Aufruf statt zwei nacheinander
+        exclude_texts: Texte gemeinsamer Komponenten (Header, Navigation, ...), die
+            eigene Specs haben und im Prompt der Seite fehlen sollen
     
     Returns:
         Pfad zur generierten Test-Datei
     """
-    # Wenn kein LLM übergeben, verwende die Pipeline
-    if llm is None:
-        from src.core.pipeline import PlaywrightPipeline
-        pipeline = PlaywrightPipeline()
-        llm = pipeline.llm_gpt5
-    
-    # Lese POM-Datei
-    pom_file = Path(pom_path)
-    class_name = pom_file.stem
-    pom_content = pom_file.read_text()
+    # Wenn kein LLM übergeben, verwende den gemeinsamen Client
+    llm = llm or get_llm()
     
-    # Extrahiere URL und Elemente aus POM
-    url = _extract_url_from_pom(pom_content)
-    elements = _extract_elements_from_pom(pom_content)
+    # Lese POM-Datei und extrahiere Klassenname, URL und Elemente
+    class_name, url, elements = _read_pom(pom_path)
     
     # NEU: Scanne die echte Seite um die reale Struktur zu bekommen
-    page_snapshot = _scan_page_with_playwright(url)
-    
-    # Generiere Test-Szenarien mit LLM
-    scenarios = _generate_test_scenarios(url, elements, llm)
+    page_snapshot = _without_shared(await _scan_page_with_playwright(url, pool, cache, load_profile), exclude_texts)
     
-    # Generiere den finalen Test-Code
-    tests_content = _generate_test_code(
-        class_name=class_name,
-        url=url,
-        elements=elements,
-        scenarios=scenarios,
-        user_stories=stories,
-        page_snapshot=page_snapshot,
-        llm=llm
-    )
+    if single_call:
+        tests_content = await _generate_scenarios_and_code(
+            class_name, url, elements, stories, page_snapshot, llm, use_cache,
+        )
+    else:
+        # Generiere Test-Szenarien mit LLM
+        scenarios = await _generate_test_scenarios(url, elements, scenario_llm or llm, use_cache)
+        
+        # Generiere den finalen Test-Code
+        tests_content = await _generate_test_code(
+            class_name=class_name,
+            url=url,
+            elements=elements,
+            scenarios=scenarios,
+            user_stories=stories,
+            page_snapshot=page_snapshot,
+            llm=llm,
+            use_cache=use_cache
+        )
     
+    return _write_spec(class_name, tests_content)
+
+
+async def generate_tests_batch(pom_paths: List[str], stories: str = "", llm=None,
+                               pool: Optional[BrowserPool] = None,
+                               cache: Optional[CaptureCache] = None, use_cache: bool = True,
+                               load_profile: Optional[str] = None,
+                               exclude_texts: Collection[str] = ()) -> List[str]:
+    """
+    Generiert die Specs mehrerer (kleiner) Seiten mit einem einzigen LLM-Aufruf.
+
+    Seiten, deren Block in der Antwort fehlt oder leer ist, werden einzeln
+    nachgeneriert (Ein-Aufruf-Modus); schlägt der Batch-Aufruf ganz fehl, gilt
+    das für alle Seiten.
+
+    Returns:
+        Pfade der Test-Dateien in der Reihenfolge von `pom_paths`
+    """
+    llm = llm or get_llm()
+    pages = [_read_pom(path) for path in pom_paths]
+    snapshots = [
+        _without_shared(snapshot, exclude_texts)
+        for snapshot in await asyncio.gather(*(_scan_page_with_playwright(url, pool, cache, load_profile) for _, url, _ in pages))
+    ]
+
+    specs: Dict[str, str] = {}
+    if len(pages) > 1:
+        sections = "\n".join(
+            f"### Page: {class_name}\n- URL: {url}\n- Available elements: {elements[:15]}\n{_page_context(snapshot)}"
+            for (class_name, url, elements), snapshot in zip(pages, snapshots)
+        )
+        prompt = GENERATE_TESTS_BATCH_PROMPT_TS.format(
+            count=len(pages),
+            user_stories_section=f"\n## User Stories\n{stories}\n" if stories else "",
+            pages=sections,
+        )
+        try:
+            content = await ainvoke_llm(llm, prompt, use_cache=use_cache)
+            specs = {name: _strip_fences(code) for name, code in SPEC_BLOCK.findall(content) if code.strip()}
+        except Exception as e:
+            print_info(f"Batch test generation failed, falling back per page: {e}")
+        record(test_batches=1, test_batch_pages=len(pages))
+
+    async def one(pom_path: str, class_name: str) -> str:
+        if class_name in specs:
+            return _write_spec(class_name, specs[class_name])
+        if len(pages) > 1:
+            record(test_batch_fallbacks=1)
+        return await generate_tests_ts(
+            pom_path, stories, llm=llm, pool=pool, cache=cache, use_cache=use_cache,
+            load_profile=load_profile, single_call=True, exclude_texts=exclude_texts,
+        )
+
+    return list(await asyncio.gather(*(one(path, page[0]) for path, page in zip(pom_paths, pages))))
+
+
+class TestBatcher:
+    """
+    Sammelt Test-Aufträge kleiner Seiten aus nebenläufigen Workern und erzeugt
+    sie gebündelt mit generate_tests_batch.
+
+    Ein Bündel wird abgeschickt, sobald `batch_size` Seiten warten oder
+    `max_wait` Sekunden seit der ersten vergangen sind. Seiten mit mehr als
+    `max_elements` Elementen laufen direkt einzeln.
+    """
+
+    def __init__(self, stories: str = "", batch_size: int = 3, max_wait: float = 0.5, max_elements: int = 12,
+                 **options):
+        """`options` gehen unverändert an generate_tests_batch bzw. generate_tests_ts (llm, pool, cache, ...)."""
+        self.stories = stories
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.max_elements = max_elements
+        self.options = options
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()   # Laufende Bündel (der Event-Loop hält Tasks nur schwach)
+
+    async def generate(self, pom_path: str) -> str:
+        """Liefert den Pfad der Spec für `pom_path` (gebündelt oder einzeln)."""
+        _, _, elements = _read_pom(pom_path)
+        if self.batch_size <= 1 or len(elements) > self.max_elements:
+            return await generate_tests_ts(pom_path, self.stories, single_call=True, **self.options)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((pom_path, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def cancel(self) -> None:
+        """Bricht wartende und laufende Bündel ab (Lauf abgebrochen oder beendet)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        for _, future in batch:
+            future.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            paths = await generate_tests_batch([path for path, _ in batch], self.stories, **self.options)
+            for (_, future), path in zip(batch, paths):
+                if not future.done():
+                    future.set_result(path)
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+
+def _read_pom(pom_path: str) -> Tuple[str, str, list]:
+    """Klassenname, URL und Elementnamen aus einer POM-Datei."""
+    pom_file = Path(pom_path)
+    pom_content = pom_file.read_text()
+    return pom_file.stem, _extract_url_from_pom(pom_content), _extract_elements_from_pom(pom_content)
+
+
+def _write_spec(class_name: str, tests_content: str) -> str:
+    """Schreibt die Spec nach out/TESTS und gibt den Pfad zurück."""
     # Erstelle Output-Verzeichnis
     tests_dir = Path("out/TESTS")
     tests_dir.mkdir(parents=True, exist_ok=True)
@@ -57,12 +221,35 @@ def generate_tests_ts(pom_path: str, stories: str = "", llm=None) -> str:
     # Schreibe Test-Datei
     filename = f"{class_name.lower()}.spec.ts"
     file_path = tests_dir / filename
-    file_path.write_text(tests_content)
+    with measure("write_seconds"):
+        file_path.write_text(tests_content)
     
     return str(file_path)
 
 
-def _generate_test_scenarios(url: str, elements: list, llm) -> list:
+async def _generate_scenarios_and_code(class_name: str, url: str, elements: list, user_stories: str,
+                                       page_snapshot: dict, llm, use_cache: bool = True) -> str:
+    """Szenarien und Test-Code in einem LLM-Aufruf (strukturierte Antwort, nur der Code wird geschrieben)."""
+    prompt = GENERATE_SCENARIOS_AND_TESTS_PROMPT_TS.format(
+        page_name=class_name,
+        elements=elements[:15],
+        url=url,
+        user_stories_section=f"\n## User Stories\n{user_stories}" if user_stories else "",
+        page_context=_page_context(page_snapshot),
+    )
+    content = (await ainvoke_llm(llm, prompt, use_cache=use_cache)).strip()
+
+    scenarios = SCENARIOS_BLOCK.search(content)
+    try:
+        record(test_scenarios=len(json.loads(scenarios.group(1)).get("scenarios", [])) if scenarios else 0)
+    except ValueError:
+        pass
+    code = CODE_BLOCK.search(content)
+    # Ohne <code>-Block: Antwort ohne Szenarien-Block als Code nehmen
+    return _strip_fences(code.group(1) if code else SCENARIOS_BLOCK.sub("", content))
+
+
+async def _generate_test_scenarios(url: str, elements: list, llm, use_cache: bool = True) -> list:
     """Nutzt LLM um Test-Szenarien zu identifizieren basierend auf Seitentyp."""
     
     # Detect page type
@@ -74,8 +261,7 @@ def _generate_test_scenarios(url: str, elements: list, llm) -> list:
         elements=elements[:10]  # First 10 elements
     )
     
-    response = llm.invoke(prompt)
-    content = response.content.strip()
+    content = (await ainvoke_llm(llm, prompt, use_cache=use_cache)).strip()
     
     if content.startswith("```"):
 
@@ -88,82 +274,40 @@ def _generate_test_scenarios(url: str, elements: list, llm) -> list:
         return []
 
 
-def _scan_page_with_playwright(url: str) -> dict:
-    """Scan the actual page using Playwright to get real structure."""
+async def _scan_page_with_playwright(url: str, pool: Optional[BrowserPool] = None,
+                                     cache: Optional[CaptureCache] = None,
+                                     load_profile: Optional[str] = None) -> dict:
+    """Get the real page structure from the shared capture cache (scans on a miss)."""
     try:
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, timeout=10000)
-            
-            # Get page snapshot using accessibility tree
-            snapshot = page.accessibility.snapshot()
-            
-            # Extract useful information
-            page_info = {
-                "title": page.title(),
-                "url": page.url,
-                "snapshot": snapshot,
-                "buttons": _extract_elements_by_role(page, "button"),
-                "links": _extract_elements_by_role(page, "link"),
-                "headings": _extract_elements_by_role(page, "heading"),
-                "textboxes": _extract_elements_by_role(page, "textbox"),
-                "forms": page.locator("form").count()
-            }
-            
-            browser.close()
-            return page_info
+        capture = await scan_site(url, pool=pool, cache=cache, load_profile=load_profile)
+        return {
+            "title": capture.get("title", ""),
+            "url": capture.get("final_url", url),
+            "snapshot": capture.get("snapshot"),
+            "buttons": capture.get("buttons", []),
+            "links": capture.get("links", []),
+            "headings": capture.get("headings", []),
+            "textboxes": capture.get("textboxes", []),
+            "forms": capture.get("forms", 0),
+        }
     except Exception as e:
         print(f"Warning: Could not scan page with Playwright: {e}")
         return {"title": "", "url": url, "buttons": [], "links": [], "headings": [], "textboxes": [], "forms": 0}
 
 
-def _extract_elements_by_role(page, role: str) -> list:
-    """Extract elements by their ARIA role."""
-    try:
-        elements = []
-        locator = page.get_by_role(role)
-        count = locator.count()
-        
-        for i in range(min(count, 20)):  # Limit to 20 elements
-            try:
-                element = locator.nth(i)
-                text = element.text_content() or element.get_attribute("aria-label") or ""
-                if text:
-                    elements.append(text.strip()[:100])  # Limit text length
-            except:
-                pass
-        
-        return elements
-    except:
-        return []
-
-
-def _generate_test_code(class_name: str, url: str, elements: list, 
-                        scenarios: list, user_stories: str, page_snapshot: dict, llm) -> str:
+async def _generate_test_code(class_name: str, url: str, elements: list, 
+                        scenarios: list, user_stories: str, page_snapshot: dict, llm,
+                        use_cache: bool = True) -> str:
     """Generate TypeScript test code using LLM."""
     
     user_stories_section = f"\n## User Stories\n{user_stories}" if user_stories else ""
     
-    # NEW: Add page snapshot information to prompt
-    page_context = f"""
-## Real Page Structure (from Playwright scan)
-- Page Title: {page_snapshot.get('title', 'Unknown')}
-- Buttons found: {page_snapshot.get('buttons', [])}
-- Links found: {page_snapshot.get('links', [])}
-- Headings found: {page_snapshot.get('headings', [])}
-- Text inputs found: {page_snapshot.get('textboxes', [])}
-- Forms count: {page_snapshot.get('forms', 0)}
-"""
-    
     prompt = GENERATE_TEST_PROMPT_TS.format(
         page_name=class_name,
         elements=elements[:15],
         url=url,
         user_stories_section=user_stories_section,
-        page_context=page_context
+        page_context=_page_context(page_snapshot)
     )
     
     if scenarios:
@@ -173,18 +317,48 @@ def _generate_test_code(class_name: str, url: str, elements: list,
         )
         prompt += f"\n\n## Suggested Scenarios\n{scenarios_text}"
     
-    response = llm.invoke(prompt)
-    content = response.content.strip()
-    
+    content = (await ainvoke_llm(llm, prompt, use_cache=use_cache)).strip()
+    return _strip_fences(content)
+
+
+def _without_shared(page_snapshot: dict, exclude_texts: Collection[str]) -> dict:
+    """Entfernt Buttons und Links gemeinsamer Komponenten aus der Seitenstruktur."""
+    if not exclude_texts:
+        return page_snapshot
+    excluded = {t.strip() for t in exclude_texts}
+    snapshot = dict(page_snapshot)
+    for key in ("buttons", "links", "textboxes"):
+        snapshot[key] = [t for t in snapshot.get(key, []) if t.strip() not in excluded]
+    snapshot["shared_excluded"] = True
+    return snapshot
+
+
+def _page_context(page_snapshot: dict) -> str:
+    """Reale Seitenstruktur aus dem Playwright-Scan für den Prompt."""
+    shared = ("- Header, navigation and footer have their own specs: do NOT test them here\n"
+              if page_snapshot.get("shared_excluded") else "")
+    return f"""
+## Real Page Structure (from Playwright scan)
+- Page Title: {page_snapshot.get('title', 'Unknown')}
+- Buttons found: {page_snapshot.get('buttons', [])}
+- Links found: {page_snapshot.get('links', [])}
+- Headings found: {page_snapshot.get('headings', [])}
+- Text inputs found: {page_snapshot.get('textboxes', [])}
+- Forms count: {page_snapshot.get('forms', 0)}
+{shared}"""
+
+
+def _strip_fences(content: str) -> str:
+    """Entfernt Markdown-Code-Fences um den Code."""
+    content = content.strip()
     if content.startswith("```"):
         # Remove code fences
         lines = content.split('\n')
         if lines[0].startswith("```"):
             lines = lines[1:]
-        if lines[-1].strip() == "```":
+        if lines and lines[-1].strip() == "```":
             lines = lines[:-1]
         content = '\n'.join(lines)
-    
     return content
 
 
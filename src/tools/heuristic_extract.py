@@ -0,0 +1,225 @@
+"""Regelbasierte UI-Extraktion direkt aus dem DOM (ohne LLM)."""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from src.core.dom_reducer import TEST_ID_ATTRS, DomNode, parse_html
+
+
+MAX_ELEMENTS = 80   # Obergrenze pro Seite (Dokument-Reihenfolge)
+MAX_NAME = 60       # Maximale Länge von Namen im Locator
+
+# Implizite ARIA-Rollen der Eingabefelder
+INPUT_ROLES = {
+    "checkbox": "checkbox", "radio": "radio", "submit": "button", "button": "button", "reset": "button",
+    "image": "button", "range": "slider", "search": "searchbox", "number": "spinbutton",
+}
+# Eingabefelder ohne Interaktion bzw. ohne sinnvollen Locator
+SKIP_INPUT_TYPES = {"hidden"}
+# Rollen, die als eigenständige interaktive Elemente gelten
+INTERACTIVE_ROLES = {
+    "button", "link", "checkbox", "radio", "switch", "tab", "menuitem", "menuitemcheckbox",
+    "menuitemradio", "option", "combobox", "textbox", "searchbox", "slider", "spinbutton", "treeitem",
+}
+# Suffix des Elementnamens pro Rolle
+NAME_SUFFIX = {
+    "button": "Button", "link": "Link", "checkbox": "Checkbox", "radio": "Radio", "switch": "Switch",
+    "tab": "Tab", "combobox": "Select", "textbox": "Input", "searchbox": "Input", "slider": "Slider",
+    "spinbutton": "Input", "menuitem": "MenuItem", "form": "Form",
+}
+
+
+def heuristic_extract(url: str, dom: str) -> Dict[str, Any]:
+    """
+    Leitet das UI-Modell mit festen Regeln aus dem DOM ab.
+
+    Erkennt Links, Buttons, beschriftete Eingabefelder, Selects, Formulare,
+    Elemente mit ARIA-Rolle und Test-IDs. Locator-Priorität: testId, Rolle
+    mit Namen, Label, Placeholder, CSS.
+
+    Args:
+        url: URL der Seite
+        dom: HTML/DOM-Inhalt der Seite
+
+    Returns:
+        Dict im Format von extract_model: {"url", "title", "elements": [{name, purpose, locator, actions}]};
+        Links haben zusätzlich "href", Eingabefelder "input_type" und ggf. "required"
+    """
+    root = parse_html(dom)
+    labels = _label_texts(root)
+
+    elements: List[Dict[str, Any]] = []
+    names, locators = set(), set()
+    for node, role, wrapping_label in _candidates(root):
+        accessible = _accessible_name(node, labels, wrapping_label)
+        locator = _locator(node, role, accessible, labels, wrapping_label)
+        if locator is None:
+            continue
+        key = (locator["strategy"], locator["value"], locator.get("name"))
+        if key in locators:
+            continue
+        locators.add(key)
+        element = {
+            "name": _unique(_camel(accessible or _fallback_name(node)) + NAME_SUFFIX.get(role, ""), names),
+            "purpose": _purpose(node, role, accessible),
+            "locator": locator,
+            "actions": _actions(node, role),
+        }
+        element.update(_details(node, role))
+        elements.append(element)
+        if len(elements) >= MAX_ELEMENTS:
+            break
+    title = next((n.text_content() for n in root.iter() if n.tag == "title"), "")
+    return {"url": url, "title": re.sub(r"\s+", " ", title).strip(), "elements": elements}
+
+
+def _candidates(root: DomNode):
+    """Interaktive Elemente in Dokument-Reihenfolge: (Knoten, Rolle, umschließendes Label)."""
+    def walk(node: DomNode, label: Optional[DomNode]):
+        for child in node.children:
+            a = child.attrs
+            if "hidden" in a or a.get("aria-hidden") == "true":
+                continue
+            role = _role(child)
+            if role is not None:
+                yield child, role, label
+            # Innerhalb von Links und Buttons gibt es keine weiteren Ziele
+            if role not in ("link", "button"):
+                yield from walk(child, child if child.tag == "label" else label)
+
+    yield from walk(root, None)
+
+
+def _role(node: DomNode) -> Optional[str]:
+    """Explizite oder implizite Rolle; None = kein eigenes Element."""
+    a = node.attrs
+    if a.get("role") in INTERACTIVE_ROLES:
+        return a["role"]
+    if node.tag == "a" and a.get("href") not in (None, "", "#"):
+        return "link"
+    if node.tag == "button" or node.tag == "summary":
+        return "button"
+    if node.tag == "input":
+        kind = a.get("type", "text").lower()
+        return None if kind in SKIP_INPUT_TYPES else INPUT_ROLES.get(kind, "textbox")
+    if node.tag == "select":
+        return "combobox"
+    if node.tag == "textarea":
+        return "textbox"
+    if node.tag == "form" and (a.get("id") or a.get("name") or any(t in a for t in TEST_ID_ATTRS)):
+        return "form"
+    if any(t in a for t in TEST_ID_ATTRS) or "onclick" in a:
+        return "button"
+    return None
+
+
+def _label_texts(root: DomNode) -> Dict[str, str]:
+    """Texte von <label for="id"> nach Ziel-ID."""
+    return {
+        node.attrs["for"]: node.text_content()
+        for node in root.iter() if node.tag == "label" and node.attrs.get("for")
+    }
+
+
+def _accessible_name(node: DomNode, labels: Dict[str, str], wrapping_label: Optional[DomNode]) -> str:
+    """Zugänglicher Name (vereinfacht): aria-label, Label, Text, value, title, alt."""
+    a = node.attrs
+    name = a.get("aria-label") or labels.get(a.get("id", ""), "")
+    if not name and wrapping_label is not None and node.tag in ("input", "select", "textarea"):
+        name = wrapping_label.text_content()
+    if not name and node.tag not in ("input", "select", "textarea", "form"):
+        name = node.text_content()
+    if not name and node.tag == "input" and a.get("type") in ("submit", "button", "reset"):
+        name = a.get("value") or a.get("type", "").capitalize()
+    if not name:
+        name = a.get("title") or next((c.attrs.get("alt", "") for c in node.iter() if c.tag == "img"), "")
+    return re.sub(r"\s+", " ", name).strip()[:MAX_NAME]
+
+
+def _fallback_name(node: DomNode) -> str:
+    """Grundlage für den Elementnamen ohne zugänglichen Namen."""
+    a = node.attrs
+    return a.get("placeholder") or a.get("id") or a.get("name") or a.get("type") or node.tag
+
+
+def _locator(node: DomNode, role: str, accessible: str, labels: Dict[str, str],
+             wrapping_label: Optional[DomNode]) -> Optional[Dict[str, str]]:
+    """Robustester verfügbarer Locator: testId, Rolle+Name, Label, Placeholder, CSS."""
+    a = node.attrs
+    for attr in TEST_ID_ATTRS:
+        if a.get(attr):
+            # get_by_test_id nutzt data-testid, andere Attribute gehen per CSS
+            if attr == "data-testid":
+                return {"strategy": "testId", "value": a[attr]}
+            return {"strategy": "css", "value": f"[{attr}='{a[attr]}']"}
+
+    field = node.tag in ("input", "select", "textarea")
+    label = labels.get(a.get("id", "")) or (wrapping_label.text_content() if wrapping_label is not None else "")
+    if role != "form" and accessible and not (field and label):
+        return {"strategy": "role", "value": role, "name": accessible}
+    if field and label:
+        return {"strategy": "label", "value": re.sub(r"\s+", " ", label).strip()[:MAX_NAME]}
+    if a.get("placeholder"):
+        return {"strategy": "placeholder", "value": a["placeholder"]}
+    css = _css(node)
+    return {"strategy": "css", "value": css} if css else None
+
+
+def _css(node: DomNode) -> str:
+    """CSS-Selektor über id, name oder href."""
+    a = node.attrs
+    if a.get("id") and re.fullmatch(r"[A-Za-z][\w-]*", a["id"]):
+        return f"#{a['id']}"
+    for attr in ("name", "href", "action"):
+        if a.get(attr):
+            return f"{node.tag}[{attr}='{a[attr]}']"
+    return ""
+
+
+def _actions(node: DomNode, role: str) -> List[str]:
+    if role in ("textbox", "searchbox", "spinbutton"):
+        return ["fill"]
+    if role in ("checkbox", "radio", "switch"):
+        return ["check"]
+    if role == "combobox" and node.tag == "select":
+        return ["select"]
+    if role in ("form", "slider"):
+        return []
+    return ["click"]
+
+
+def _details(node: DomNode, role: str) -> Dict[str, Any]:
+    """Angaben für template-basierte Tests: Link-Ziel, Feldtyp, Pflichtfeld."""
+    a = node.attrs
+    if role == "link" and a.get("href"):
+        return {"href": a["href"]}
+    if node.tag in ("input", "textarea", "select"):
+        details: Dict[str, Any] = {"input_type": a.get("type", "text").lower() if node.tag == "input" else node.tag}
+        if "required" in a or a.get("aria-required") == "true":
+            details["required"] = True
+        return details
+    return {}
+
+
+def _purpose(node: DomNode, role: str, accessible: str) -> str:
+    a = node.attrs
+    if role == "link":
+        return f'Link "{accessible}" to {a.get("href", "")}'.strip()
+    if role == "form":
+        return f"Form {a.get('id') or a.get('name', '')} ({a.get('method', 'get').upper()} {a.get('action', '')})".strip()
+    kind = f" ({a['type']})" if node.tag == "input" and a.get("type") not in (None, role) else ""
+    return f"{role.capitalize()}{kind}" + (f' "{accessible}"' if accessible else "")
+
+
+def _camel(value: str) -> str:
+    words = re.findall(r"[A-Za-z0-9]+", value)[:4]
+    name = "".join(w.lower() if i == 0 else w.capitalize() for i, w in enumerate(words))
+    return ("el" + name.capitalize()) if name[:1].isdigit() else (name or "element")
+
+
+def _unique(name: str, names: set) -> str:
+    candidate, n = name, 2
+    while candidate in names:
+        candidate, n = f"{name}{n}", n + 1
+    names.add(candidate)
+    return candidate
@@ -1,27 +1,128 @@
-"""Tool zur automatischen Reparatur von Python-Code mittels LLM."""
+"""Tool zur automatischen Reparatur von Python- und TypeScript-Code mittels LLM."""
 
 import os
+import re
 from pathlib import Path
+from typing import List, Optional, Tuple
 
+from src.core.llm_cache import ainvoke_llm, invoke_llm
+from src.core.llm_clients import get_llm
+from src.core.schemas import Diagnostic
+from src.core.tracing import measure
 
-def repair_file(file_path: str, error_message: str = "", llm=None) -> str:
+
+# Zeilennummern, wie sie im Ausschnitt des Prompts stehen ("  12 | code")
+NUMBERED_LINE = re.compile(r"^\s*\d+ \| ?")
+
+
+def repair_file(file_path: str, error_message: str = "", llm=None, use_cache: bool = True) -> str:
     """
-    Repariert eine Python-Datei automatisch mithilfe eines LLM (KI).
+    Repariert eine Python- oder TypeScript-Datei automatisch mithilfe eines LLM (KI).
     
     Args:
         file_path: Pfad zur zu reparierenden Datei
         error_message: Optionale Fehlermeldung zur besseren Reparatur
-        llm: LLM-Client aus der Pipeline (AzureChatOpenAI)
+        llm: LLM-Client (Standard: gemeinsamer Client aus der Registry)
+        use_cache: False = LLM-Antwort-Cache für diesen Aufruf umgehen
     
     Returns:
         Der reparierte Code als String
     """
-    # Wenn kein LLM übergeben, verwende die Pipeline
-    if llm is None:
-        from src.core.pipeline import PlaywrightPipeline
-        pipeline = PlaywrightPipeline()
-        llm = pipeline.llm_gpt5
+    llm = llm or get_llm()
+    file_obj, prompt = _prepare(file_path, error_message)
+
+    # Rufe LLM auf (oder hole die Antwort aus dem Cache)
+    return _write_repaired(file_obj, invoke_llm(llm, prompt, use_cache=use_cache))
+
+
+async def arepair_file(file_path: str, error_message: str = "", llm=None, use_cache: bool = True) -> str:
+    """Async-Variante von repair_file (blockiert den Event-Loop nicht)."""
+    llm = llm or get_llm()
+    file_obj, prompt = _prepare(file_path, error_message)
+
+    return _write_repaired(file_obj, await ainvoke_llm(llm, prompt, use_cache=use_cache))
+
+
+async def arepair_region(file_path: str, diagnostics: List[Diagnostic], llm=None,
+                         context_lines: Optional[int] = 10, use_cache: bool = True) -> int:
+    """
+    Repariert nur die fehlerhaften Stellen einer Datei.
 
+    Pro Fehlerbereich (Zeile des Befunds ± `context_lines`, überlappende Bereiche
+    zusammengefasst) bekommt das LLM nur den Ausschnitt und die zugehörigen Befunde.
+    Die Antwort ersetzt genau diese Zeilen. Ohne Zeilenangaben oder mit
+    `context_lines=None` wird die ganze Datei repariert.
+
+    Returns:
+        Anzahl der an das LLM geschickten Bereiche
+    """
+    llm = llm or get_llm()
+    file_obj = Path(file_path)
+    if not file_obj.exists():
+        raise FileNotFoundError(f"Not found: {file_path}")
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    lines = file_obj.read_text().split("\n")
+    regions = _regions(errors, len(lines), context_lines) if context_lines is not None else []
+    if not regions:
+        await arepair_file(file_path, "\n".join(str(d) for d in errors), llm=llm, use_cache=use_cache)
+        return 1
+
+    language = _language(file_obj)
+    # Von hinten nach vorne, damit die Zeilennummern der vorderen Bereiche gültig bleiben
+    for start, end, region_diagnostics in reversed(regions):
+        excerpt = "\n".join(f"{n:>5} | {lines[n - 1]}" for n in range(start, end + 1))
+        prompt = f"""Fix this excerpt of a {language} file ({file_obj.name}, lines {start}-{end}):
+
+{excerpt}
+
+Errors:
+{chr(10).join(str(d) for d in region_diagnostics)}
+
+Return ONLY the corrected replacement for lines {start}-{end}: same indentation, no line numbers, no markdown.
+Do not add code from outside the excerpt."""
+        content = await ainvoke_llm(llm, prompt, use_cache=use_cache)
+        lines[start - 1:end] = _clean_region(content)
+
+    with measure("write_seconds"):
+        file_obj.write_text("\n".join(lines))
+    return len(regions)
+
+
+def _regions(diagnostics: List[Diagnostic], total: int,
+             context_lines: int) -> List[Tuple[int, int, List[Diagnostic]]]:
+    """Zeilenbereiche (1-basiert, inklusive) um die Befunde; überlappende werden zusammengefasst."""
+    if not diagnostics or any(d.line <= 0 for d in diagnostics):
+        return []  # Ohne Position lässt sich der Fehler nicht eingrenzen
+    regions: List[Tuple[int, int, List[Diagnostic]]] = []
+    for d in sorted(diagnostics, key=lambda d: d.line):
+        start, end = max(1, d.line - context_lines), min(total, d.line + context_lines)
+        if regions and start <= regions[-1][1] + 1:
+            prev_start, prev_end, prev_diagnostics = regions[-1]
+            regions[-1] = (prev_start, max(prev_end, end), prev_diagnostics + [d])
+        else:
+            regions.append((start, end, [d]))
+    return regions
+
+
+def _clean_region(content: str) -> List[str]:
+    """Entfernt Fences und mitkopierte Zeilennummern, Einrückung bleibt erhalten."""
+    lines = content.strip("\n").split("\n")
+    if lines and lines[0].lstrip().startswith("```"):
+        lines = lines[1:]
+    if lines and lines[-1].strip().startswith("```"):
+        lines = lines[:-1]
+    if lines and all(NUMBERED_LINE.match(line) for line in lines if line.strip()):
+        lines = [NUMBERED_LINE.sub("", line, count=1) for line in lines]
+    return lines
+
+
+def _language(file_obj: Path) -> str:
+    return "TypeScript" if file_obj.suffix in (".ts", ".tsx") else "Python"
+
+
+def _prepare(file_path: str, error_message: str) -> tuple[Path, str]:
+    """Liest die Datei und baut den Reparatur-Prompt."""
     # Prüfe ob Datei existiert
     file_obj = Path(file_path)
     if not file_obj.exists():
@@ -30,18 +131,21 @@ def repair_file(file_path: str, error_message: str = "", llm=None) -> str:
     # Lese aktuellen (fehlerhaften) Inhalt
     current_content = file_obj.read_text()
 
-    # Baue Reparatur-Prompt
-    prompt = f"""Fix this Python code:
+    # Baue Reparatur-Prompt (Sprache nach Dateiendung)
+    language = _language(file_obj)
+    prompt = f"""Fix this {language} code:
 
 {current_content}
 
 Error: {error_message}
 
-Return ONLY corrected Python code, no markdown."""
+Return ONLY corrected {language} code, no markdown."""
+    return file_obj, prompt
+
 
-    # Rufe LLM auf
-    response = llm.invoke(prompt)
-    repaired = response.content.strip()
+def _write_repaired(file_obj: Path, content: str) -> str:
+    """Entfernt Markdown-Fences und schreibt den reparierten Code zurück."""
+    repaired = content.strip()
 
     # Entferne Markdown-Code-Blöcke falls vorhanden
     if repaired.startswith("```"):
@@ -50,5 +154,6 @@ Return ONLY corrected Python code, no markdown."""
         repaired = repaired[:repaired.rfind("```")]
 
     # Schreibe reparierten Code zurück in Datei
-    file_obj.write_text(repaired.strip())
+    with measure("write_seconds"):
+        file_obj.write_text(repaired.strip())
     return repaired
@@ -1,35 +1,118 @@
 """Tool zum Scannen einer Website und Extrahieren des DOM."""
 
-from playwright.async_api import async_playwright
+import asyncio
+from typing import Optional, Union
 
+from src.core.browser_pool import BrowserPool, get_browser_pool
+from src.core.capture_cache import CaptureCache, get_capture_cache
+from src.core.load_profile import LoadProfile, get_load_profile, load_page
 
-async def scan_site(url: str) -> dict:
+
+# Rollen, deren Texte für die Test-Generierung gesammelt werden
+CAPTURED_ROLES = {
+    "buttons": "button",
+    "links": "link",
+    "headings": "heading",
+    "textboxes": "textbox",
+}
+
+# Link-Ziele im Browser sammeln: vom Browser aufgelöst (inkl. <base href>), ohne reine Anker, ohne Duplikate
+HARVEST_LINKS_JS = """() => {
+    const seen = new Set();
+    for (const a of document.querySelectorAll('a[href], area[href]')) {
+        const raw = a.getAttribute('href');
+        if (!raw || raw.startsWith('#')) continue;
+        try {
+            seen.add(typeof a.href === 'string' ? a.href : new URL(raw, document.baseURI).href);
+        } catch (e) {}
+    }
+    return [...seen];
+}"""
+
+
+async def scan_site(url: str, pool: Optional[BrowserPool] = None,
+                    cache: Optional[CaptureCache] = None, use_cache: bool = True,
+                    load_profile: Union[str, LoadProfile, None] = None) -> dict:
     """
-    Scannt eine URL mit Playwright und extrahiert das DOM.
+    Scannt eine URL mit Playwright und extrahiert DOM und Seitenstruktur.
+
+    Alle Daten werden in einer einzigen Navigation erfasst und über den
+    Capture-Cache geteilt, sodass weitere Stufen die Seite nicht neu laden.
 
     Args:
         url: Ziel-URL die gescannt werden soll
+        pool: Browser-Pool (Standard: prozessweiter Pool)
+        cache: Capture-Cache (Standard: prozessweiter Cache)
+        use_cache: False = Seite immer neu laden (Ergebnis wird trotzdem gecacht)
+        load_profile: Lade-Profil ("full", "fast", "minimal"; Standard: "fast")
 
     Returns:
-        dict mit Keys: url, dom (HTML-Inhalt der Seite)
+        dict mit Keys: url, dom (HTML-Inhalt der Seite), title, final_url,
+        snapshot (Accessibility-Baum), buttons, links, headings, textboxes, forms,
+        hrefs (absolute Link-Ziele in Dokument-Reihenfolge),
+        load (Profil, time_to_ready_ms, blockierte Requests)
     """
-    # Starte Playwright Browser
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        try:
-            # Navigiere zur Seite und warte bis alle Netzwerk-Requests fertig sind
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Hole den kompletten HTML-Inhalt der Seite
-            dom = await page.content()
-
-            return {
-                "url": url,
-                "dom": dom,  # Das komplette HTML/DOM
-            }
-        finally:
-            # Schließe Browser und Seite (auch bei Fehler)
-            await page.close()
-            await browser.close()
+    pool = pool or get_browser_pool()
+    cache = cache or get_capture_cache()
+    profile = get_load_profile(load_profile)
+    return await cache.get_or_capture(
+        url, lambda: _capture_page(url, pool, profile), refresh=not use_cache, variant=profile.name
+    )
+
+
+async def _capture_page(url: str, pool: BrowserPool, profile: LoadProfile) -> dict:
+    """Lädt die Seite einmal und erfasst alles, was die Pipeline-Stufen brauchen."""
+    # Leihe eine Page aus dem geteilten Browser (wird danach automatisch geschlossen)
+    async with pool.page() as page:
+        # Navigiere zur Seite; Profil bestimmt blockierte Ressourcen und Bereitschafts-Kriterium
+        load = await load_page(page, url, profile)
+
+        # Hole den kompletten HTML-Inhalt der Seite
+        dom = await page.content()
+
+        roles = await asyncio.gather(
+            *(_extract_elements_by_role(page, role) for role in CAPTURED_ROLES.values())
+        )
+
+        return {
+            "url": url,
+            "dom": dom,  # Das komplette HTML/DOM
+            "title": await page.title(),
+            "final_url": page.url,
+            "snapshot": await _accessibility_snapshot(page),
+            **dict(zip(CAPTURED_ROLES.keys(), roles)),
+            "forms": await page.locator("form").count(),
+            "hrefs": await page.evaluate(HARVEST_LINKS_JS),
+            "load": load,
+        }
+
+
+async def _accessibility_snapshot(page):
+    """Accessibility-Baum der Seite (ältere Playwright-Versionen: accessibility.snapshot)."""
+    try:
+        if hasattr(page, "accessibility"):
+            return await page.accessibility.snapshot()
+        return await page.locator("body").aria_snapshot()
+    except Exception:
+        return None
+
+
+async def _extract_elements_by_role(page, role: str) -> list:
+    """Extract elements by their ARIA role."""
+    try:
+        elements = []
+        locator = page.get_by_role(role)
+        count = await locator.count()
+        
+        for i in range(min(count, 20)):  # Limit to 20 elements
+            try:
+                element = locator.nth(i)
+                text = await element.text_content() or await element.get_attribute("aria-label") or ""
+                if text:
+                    elements.append(text.strip()[:100])  # Limit text length
+            except:
+                pass
+        
+        return elements
+    except:
+        return []
@@ -0,0 +1,198 @@
+"""Template-basierte TypeScript Playwright-Tests aus dem UI-Modell (ohne LLM, ohne Seiten-Scan)."""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.tracing import record
+from src.tools.generate_tests_ts import _write_spec
+
+
+# Beispielwerte für Eingabefelder (nach Feldtyp bzw. Name)
+SAMPLE_VALUES = {
+    "email": "test@example.com", "password": "Test1234!", "number": "42", "tel": "+49123456789",
+    "url": "https://example.com", "search": "test", "date": "2024-01-15", "time": "12:00",
+}
+# Ungültige Werte, die der Browser ablehnt (number: fill() akzeptiert keinen Text)
+INVALID_VALUES = {"email": "not-an-email", "url": "not a url"}
+# Typ aus Name/Zweck, falls das Modell (LLM-Extraktion) keinen input_type hat
+TYPE_HINTS = [
+    ("email", re.compile(r"e-?mail", re.I)), ("password", re.compile(r"passw|kennwort", re.I)),
+    ("tel", re.compile(r"phone|tel(efon)?\b", re.I)), ("search", re.compile(r"search|such|query", re.I)),
+    ("number", re.compile(r"number|amount|quantity|anzahl|menge", re.I)),
+]
+SUBMIT = re.compile(r"submit|send|save|login|log in|sign|search|absenden|senden|speichern|anmelden|suchen", re.I)
+
+
+def generate_template_tests(class_name: str, model: Dict[str, Any], include_happy_path: bool = True,
+                            include_error_cases: bool = False, max_tests: int = 5) -> str:
+    """
+    Erzeugt eine Spec deterministisch aus dem UI-Modell.
+
+    Happy Path: Navigation und Titel, Sichtbarkeit aller Elemente, Link-Ziele,
+    Formular ausfüllen und absenden. Fehlerfälle: ungültige Werte und leere
+    Pflichtfelder werden vom Browser abgelehnt.
+
+    Args:
+        class_name: Klassenname des POMs (Name der Spec)
+        model: UI-Modell aus extract_model
+        include_happy_path: Tests der normalen Benutzung
+        include_error_cases: Tests mit ungültigen Eingaben
+        max_tests: Maximale Anzahl Tests
+
+    Returns:
+        Pfad zur generierten Test-Datei
+    """
+    return _write_spec(class_name, render_template_tests(class_name, model, include_happy_path,
+                                                         include_error_cases, max_tests))
+
+
+def render_template_tests(class_name: str, model: Dict[str, Any], include_happy_path: bool = True,
+                          include_error_cases: bool = False, max_tests: int = 5) -> str:
+    """Spec-Code zu generate_template_tests (ohne Datei)."""
+    url = model.get("url", "")
+    elements = [e for e in model.get("elements", []) if isinstance(e, dict) and e.get("locator")]
+
+    builders: List[Callable[[str, List[Dict[str, Any]], Dict[str, Any]], Optional[str]]] = []
+    if include_happy_path:
+        builders += [_test_navigation, _test_visibility, _test_links, _test_form]
+    if include_error_cases:
+        builders += [_test_invalid_values, _test_required]
+    tests = [t for t in (build(url, elements, model) for build in builders) if t][:max(1, max_tests)]
+    if not tests:
+        tests = [_test_navigation(url, elements, model)]
+    record(test_scenarios=len(tests))
+
+    body = "\n\n".join(tests)
+    return f"""import {{ test, expect }} from '@playwright/test';
+
+const URL = {_q(url)};
+
+test.describe({_q(class_name + " Page")}, () => {{
+{body}
+}});
+"""
+
+
+def _test_navigation(url: str, elements: List[Dict[str, Any]], model: Dict[str, Any]) -> str:
+    title = model.get("title")
+    check = f"\n    await expect(page).toHaveTitle({_q(title)});" if title else ""
+    return f"""  test('loads the page', async ({{ page }}) => {{
+    const response = await page.goto(URL);
+    expect(response?.status() ?? 200).toBeLessThan(400);{check}
+  }});"""
+
+
+def _test_visibility(url: str, elements: List[Dict[str, Any]], model: Dict[str, Any]) -> Optional[str]:
+    if not elements:
+        return None
+    checks = "\n".join(f"    await expect({_locator(e)}).toBeVisible();" for e in elements)
+    return f"""  test('shows all elements', async ({{ page }}) => {{
+    await page.goto(URL);
+{checks}
+  }});"""
+
+
+def _test_links(url: str, elements: List[Dict[str, Any]], model: Dict[str, Any]) -> Optional[str]:
+    links = [e for e in elements if e.get("href")]
+    if not links:
+        return None
+    checks = "\n".join(f"    await expect({_locator(e)}).toHaveAttribute('href', {_q(e['href'])});" for e in links)
+    return f"""  test('links point to their targets', async ({{ page }}) => {{
+    await page.goto(URL);
+{checks}
+  }});"""
+
+
+def _test_form(url: str, elements: List[Dict[str, Any]], model: Dict[str, Any]) -> Optional[str]:
+    fields = [e for e in elements if "fill" in e.get("actions", []) or "check" in e.get("actions", [])]
+    if not fields:
+        return None
+    steps = []
+    for e in fields:
+        if "check" in e.get("actions", []):
+            steps.append(f"    await {_locator(e)}.check();")
+        else:
+            value = _q(SAMPLE_VALUES.get(_input_type(e), "Test"))
+            steps.append(f"    await {_locator(e)}.fill({value});")
+            steps.append(f"    await expect({_locator(e)}).toHaveValue({value});")
+    submit = _submit_button(elements)
+    if submit is not None:
+        steps.append(f"    await {_locator(submit)}.click();")
+    return f"""  test('fills and submits the form', async ({{ page }}) => {{
+    await page.goto(URL);
+{chr(10).join(steps)}
+  }});"""
+
+
+def _test_invalid_values(url: str, elements: List[Dict[str, Any]], model: Dict[str, Any]) -> Optional[str]:
+    fields = [e for e in elements if "fill" in e.get("actions", []) and e.get("input_type") in INVALID_VALUES]
+    if not fields:
+        return None
+    steps = []
+    for e in fields:
+        steps.append(f"    await {_locator(e)}.fill({_q(INVALID_VALUES[e['input_type']])});")
+        steps.append(f"    expect(await {_locator(e)}.evaluate((el) => (el as HTMLInputElement).checkValidity())).toBe(false);")
+    return f"""  test('rejects invalid values', async ({{ page }}) => {{
+    await page.goto(URL);
+{chr(10).join(steps)}
+  }});"""
+
+
+def _test_required(url: str, elements: List[Dict[str, Any]], model: Dict[str, Any]) -> Optional[str]:
+    fields = [e for e in elements if e.get("required") and "fill" in e.get("actions", [])]
+    if not fields:
+        return None
+    steps = [f"    await {_locator(e)}.fill('');\n"
+             f"    expect(await {_locator(e)}.evaluate((el) => (el as HTMLInputElement).checkValidity())).toBe(false);"
+             for e in fields]
+    return f"""  test('requires mandatory fields', async ({{ page }}) => {{
+    await page.goto(URL);
+{chr(10).join(steps)}
+  }});"""
+
+
+def _submit_button(elements: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Absende-Button: erster Button mit passendem Namen, sonst der erste Button nach dem letzten Feld."""
+    buttons = [
+        (i, e) for i, e in enumerate(elements)
+        if e["locator"].get("value") == "button" or e.get("input_type") == "submit"
+        or "button" in e.get("name", "").lower()
+    ]
+    for _, e in buttons:
+        if SUBMIT.search(f"{e.get('name', '')} {e['locator'].get('name', '')} {e.get('purpose', '')}"):
+            return e
+    last_field = max((i for i, e in enumerate(elements) if "fill" in e.get("actions", [])), default=-1)
+    return next((e for i, e in buttons if i > last_field), None)
+
+
+def _input_type(element: Dict[str, Any]) -> str:
+    if element.get("input_type"):
+        return element["input_type"]
+    text = f"{element.get('name', '')} {element.get('purpose', '')}"
+    return next((kind for kind, pattern in TYPE_HINTS if pattern.search(text)), "text")
+
+
+def _locator(element: Dict[str, Any]) -> str:
+    """Playwright-Locator (TypeScript) zum Locator des UI-Modells; .first() wie im Smoke-Test üblich."""
+    locator = element["locator"]
+    strategy, value = locator.get("strategy"), str(locator.get("value", ""))
+    if strategy == "role":
+        name = f", {{ name: {_q(locator['name'])}, exact: true }}" if locator.get("name") else ""
+        code = f"page.getByRole({_q(value)}{name})"
+    elif strategy == "label":
+        code = f"page.getByLabel({_q(value)})"
+    elif strategy == "placeholder":
+        code = f"page.getByPlaceholder({_q(value)})"
+    elif strategy == "testId":
+        code = f"page.getByTestId({_q(value)})"
+    elif strategy == "text":
+        code = f"page.getByText({_q(value)})"
+    else:
+        code = f"page.locator({_q(value)})"
+    return code + ".first()"
+
+
+def _q(value: str) -> str:
+    """String-Literal für TypeScript."""
+    return json.dumps(value, ensure_ascii=False)
@@ -1,38 +1,176 @@
-"""Tool zur Validierung von POM-Dateien auf Syntax-Fehler."""
+"""Tool zur Validierung von POM-Dateien auf Syntax-Fehler und typische Generierungsfehler."""
 
-import subprocess
+import ast
+import glob
 from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+from src.core.schemas import Diagnostic
 
 
 def verify_pom(pom_path: str) -> tuple[bool, str]:
     """
-    Überprüft die Syntax einer POM-Datei mit Python-Compiler.
-    
+    Überprüft eine POM-Datei im selben Prozess (ohne Python-Subprozess).
+
     Args:
         pom_path: Pfad zur zu überprüfenden POM-Datei
-    
+
     Returns:
         Tuple mit (ist_valid, fehlermeldung_oder_ok)
     """
-    pom_file = Path(pom_path)
-    
-    # Prüfe ob Datei existiert
-    if not pom_file.exists():
-        return False, f"File not found: {pom_path}"
+    diagnostics = verify_poms([pom_path])[pom_path]
+    return is_valid(diagnostics), format_diagnostics(diagnostics)
+
+
+def verify_poms(pom_paths: Iterable[str]) -> Dict[str, List[Diagnostic]]:
+    """
+    Prüft mehrere POM-Dateien in einem Durchlauf.
+
+    Args:
+        pom_paths: Pfade der POM-Dateien
+
+    Returns:
+        Dict Pfad -> Liste der Befunde (leer = alles in Ordnung)
+    """
+    results: Dict[str, List[Diagnostic]] = {}
+    for path in pom_paths:
+        try:
+            source = Path(path).read_text()
+        except FileNotFoundError:
+            results[path] = [Diagnostic(file=path, code="not-found", message=f"File not found: {path}")]
+            continue
+        except Exception as e:
+            results[path] = [Diagnostic(file=path, code="read-error", message=str(e))]
+            continue
+        results[path] = check_source(source, path)
+    return results
+
+
+def resolve_targets(target: str) -> List[str]:
+    """Löst eine Datei, ein Verzeichnis (alle *.py) oder ein Glob-Muster in Dateipfade auf."""
+    path = Path(target)
+    if path.is_dir():
+        return sorted(str(p) for p in path.rglob("*.py") if "__pycache__" not in p.parts)
+    if any(ch in target for ch in "*?["):
+        return sorted(p for p in glob.glob(target, recursive=True) if Path(p).is_file())
+    return [target]
+
+
+def is_valid(diagnostics: List[Diagnostic]) -> bool:
+    """Gültig, wenn kein Befund mit Schweregrad "error" vorliegt."""
+    return not any(d.severity == "error" for d in diagnostics)
+
 
+def format_diagnostics(diagnostics: List[Diagnostic]) -> str:
+    """Formatiert Befunde zeilenweise ("OK" wenn keine vorhanden)."""
+    return "\n".join(str(d) for d in diagnostics) if diagnostics else "OK"
+
+
+def check_source(source: str, filename: str) -> List[Diagnostic]:
+    """Syntax-Prüfung per ast/compile plus statische Checks für POM-Klassen."""
     try:
-        # Nutze Python's py_compile um Syntax zu prüfen
-        result = subprocess.run(
-            ["python", "-m", "py_compile", str(pom_file)],
-            capture_output=True,  # Fange stdout/stderr ab
-            text=True,            # Text statt Bytes
-            timeout=10,           # Max 10 Sekunden
-        )
-        
-        # Prüfe Exit-Code (0 = Erfolg, != 0 = Fehler)
-        if result.returncode != 0:
-            return False, f"Syntax error: {result.stderr}"
-        
-        return True, "OK"
-    except Exception as e:
-        return False, f"Error: {e}"
+        tree = ast.parse(source, filename)
+        # compile() findet zusätzlich Fehler, die der Parser durchlässt (z.B. return außerhalb einer Funktion)
+        compile(tree, filename, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return [Diagnostic(
+            file=filename, line=e.lineno or 0, column=e.offset or 0,
+            code="syntax", message=e.msg,
+        )]
+
+    diagnostics: List[Diagnostic] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            diagnostics.extend(_check_class(node, filename))
+    return diagnostics
+
+
+def _check_class(cls: ast.ClassDef, filename: str) -> List[Diagnostic]:
+    """Doppelte Methoden und self-Attribute, die nie in __init__ definiert werden."""
+    diagnostics: List[Diagnostic] = []
+    methods = [n for n in cls.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+
+    # Doppelte Methodennamen (Property-Setter/Deleter und overloads ausgenommen)
+    seen: Dict[str, int] = {}
+    for method in methods:
+        if any(_is_accessor_decorator(d) for d in method.decorator_list):
+            continue
+        if method.name in seen:
+            diagnostics.append(Diagnostic(
+                file=filename, line=method.lineno, column=method.col_offset + 1,
+                code="duplicate-method",
+                message=f"{cls.name}.{method.name} is defined twice (first at line {seen[method.name]})",
+            ))
+        else:
+            seen[method.name] = method.lineno
+
+    # Was über self.<name> erreichbar ist: Klassenattribute, Methoden, Zuweisungen
+    class_level = {m.name for m in methods} | _assigned_names(cls.body)
+    init = next((m for m in methods if m.name == "__init__"), None)
+    in_init = _self_assignments(init) if init else set()
+    elsewhere: Set[str] = set()
+    for method in methods:
+        if method is not init:
+            elsewhere |= _self_assignments(method)
+
+    # Bei Basisklassen können Attribute geerbt sein: dann nur warnen
+    severity = "warning" if cls.bases else "error"
+    reported: Set[str] = set()
+    for method in methods:
+        if method is init:
+            continue
+        for node in ast.walk(method):
+            if not (_is_self_attribute(node) and isinstance(node.ctx, ast.Load)):
+                continue
+            name = node.attr
+            if name in in_init or name in class_level or name in reported:
+                continue
+            reported.add(name)
+            if name in elsewhere:
+                diagnostics.append(Diagnostic(
+                    file=filename, line=node.lineno, column=node.col_offset + 1,
+                    code="attribute-outside-init", severity="warning",
+                    message=f"self.{name} is used in {method.name}() but only assigned outside __init__",
+                ))
+            else:
+                diagnostics.append(Diagnostic(
+                    file=filename, line=node.lineno, column=node.col_offset + 1,
+                    code="undefined-attribute", severity=severity,
+                    message=f"self.{name} is used in {method.name}() but never defined in {cls.name}.__init__",
+                ))
+    return diagnostics
+
+
+def _is_accessor_decorator(decorator: ast.expr) -> bool:
+    """@x.setter, @x.deleter, @x.getter und @overload erlauben denselben Methodennamen mehrfach."""
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr in ("setter", "deleter", "getter")
+    return isinstance(decorator, ast.Name) and decorator.id == "overload"
+
+
+def _is_self_attribute(node: ast.AST) -> bool:
+    return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"
+
+
+def _self_assignments(func: ast.AST) -> Set[str]:
+    """Alle self.<name>, denen in der Funktion etwas zugewiesen wird."""
+    return {
+        node.attr for node in ast.walk(func)
+        if _is_self_attribute(node) and isinstance(node.ctx, ast.Store)
+    }
+
+
+def _assigned_names(body: List[ast.stmt]) -> Set[str]:
+    """Namen, die direkt im Klassenkörper zugewiesen werden."""
+    names: Set[str] = set()
+    for stmt in body:
+        targets = []
+        if isinstance(stmt, ast.Assign):
+            targets = stmt.targets
+        elif isinstance(stmt, (ast.AnnAssign, ast.AugAssign)):
+            targets = [stmt.target]
+        for target in targets:
+            for node in ast.walk(target):
+                if isinstance(node, ast.Name):
+                    names.add(node.id)
+    return names
@@ -0,0 +1,156 @@
+"""Tool zur Typprüfung der generierten TypeScript-Tests mit einem einzigen tsc-Aufruf."""
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.core.schemas import Diagnostic
+
+
+# Ausgabe von `tsc --pretty false`: datei(zeile,spalte): error TS1234: Nachricht
+TSC_LINE = re.compile(r"^(?P<file>.+?)\((?P<line>\d+),(?P<column>\d+)\): (?P<severity>error|warning) (?P<code>TS\d+): (?P<message>.*)$")
+# Fehler ohne Datei, z.B. "error TS2688: Cannot find type definition file for 'node'."
+TSC_GLOBAL = re.compile(r"^(?P<severity>error|warning) (?P<code>TS\d+): (?P<message>.*)$")
+
+
+def find_tsc() -> Optional[List[str]]:
+    """Sucht den TypeScript-Compiler (lokales node_modules, dann PATH)."""
+    local = Path("node_modules/.bin/tsc")
+    if local.exists():
+        return [str(local)]
+    if shutil.which("tsc"):
+        return ["tsc"]
+    return None
+
+
+def write_tsconfig(tests_dir: str = "out/TESTS", base_tsconfig: str = "tsconfig.json",
+                   build_dir: str = "out/.cache/tsc") -> Path:
+    """
+    Schreibt eine abgeleitete tsconfig, die die Projekt-tsconfig erweitert.
+
+    Compiler-Optionen kommen aus `base_tsconfig`, geprüft werden nur die
+    generierten Specs. Die .tsbuildinfo liegt in `build_dir` und bleibt über
+    Läufe erhalten, sodass unveränderte Dateien nicht erneut geprüft werden.
+    """
+    build = Path(build_dir).resolve()
+    build.mkdir(parents=True, exist_ok=True)
+    config = {
+        "extends": os.path.relpath(Path(base_tsconfig).resolve(), build),
+        "compilerOptions": {
+            "noEmit": True,
+            "incremental": True,
+            "tsBuildInfoFile": "./specs.tsbuildinfo",
+        },
+        "include": [os.path.relpath(Path(tests_dir).resolve() / "**" / "*.ts", build)],
+    }
+    path = build / "tsconfig.specs.json"
+    content = json.dumps(config, indent=2)
+    # Nur bei Änderung schreiben, sonst verwirft tsc den inkrementellen Stand
+    if not path.exists() or path.read_text() != content:
+        path.write_text(content)
+    return path
+
+
+def parse_tsc_output(output: str, config_dir: Optional[str] = None) -> tuple[Dict[str, List[Diagnostic]], List[Diagnostic]]:
+    """
+    Parst die tsc-Ausgabe.
+
+    Relative Pfade gelten zum Arbeitsverzeichnis; existiert die Datei dort
+    nicht, zum Verzeichnis der tsconfig (`config_dir`).
+
+    Returns:
+        (Befunde pro absolutem Dateipfad, Befunde ohne Datei)
+    """
+    by_file: Dict[str, List[Diagnostic]] = {}
+    general: List[Diagnostic] = []
+    last: Optional[Diagnostic] = None
+    for raw in output.splitlines():
+        if not raw.strip():
+            continue
+        match = TSC_LINE.match(raw)
+        if match:
+            path = _resolve(match["file"], config_dir)
+            last = Diagnostic(
+                file=path, line=int(match["line"]), column=int(match["column"]),
+                code=match["code"], message=match["message"], severity=match["severity"],
+            )
+            by_file.setdefault(path, []).append(last)
+            continue
+        match = TSC_GLOBAL.match(raw.strip())
+        if match:
+            last = Diagnostic(file="", code=match["code"], message=match["message"], severity=match["severity"])
+            general.append(last)
+        elif last is not None:
+            # Eingerückte Folgezeilen gehören zur vorherigen Meldung
+            last.message += "\n" + raw.strip()
+    return by_file, general
+
+
+def _resolve(file: str, config_dir: Optional[str]) -> str:
+    """Absoluter Pfad einer Datei aus der tsc-Ausgabe."""
+    path = Path(file).resolve()
+    if config_dir and not Path(file).is_absolute() and not path.exists():
+        candidate = (Path(config_dir) / file).resolve()
+        if candidate.exists():
+            return str(candidate)
+    return str(path)
+
+
+async def verify_tests_ts(spec_paths: Iterable[str], tests_dir: str = "out/TESTS",
+                          base_tsconfig: str = "tsconfig.json", build_dir: str = "out/.cache/tsc",
+                          timeout: float = 300) -> dict:
+    """
+    Prüft alle generierten Specs mit einem einzigen `tsc --noEmit --incremental`.
+
+    Args:
+        spec_paths: Specs, denen Befunde zugeordnet werden sollen
+        tests_dir: Verzeichnis der generierten Tests
+        base_tsconfig: Projekt-tsconfig, deren Optionen übernommen werden
+        build_dir: Ablage für abgeleitete tsconfig und .tsbuildinfo
+        timeout: Maximale Laufzeit des Compilers in Sekunden
+
+    Returns:
+        dict mit Keys: checked (False wenn tsc fehlt), files (Spec-Pfad -> Befunde),
+        other (Befunde ohne oder mit fremder Datei), seconds, message
+    """
+    spec_paths = list(spec_paths)
+    result = {"checked": False, "files": {p: [] for p in spec_paths}, "other": [], "seconds": 0.0, "message": ""}
+
+    tsc = find_tsc()
+    if tsc is None:
+        result["message"] = "TypeScript compiler not found (npm install), type check skipped"
+        return result
+
+    tsconfig = write_tsconfig(tests_dir, base_tsconfig, build_dir)
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *tsc, "-p", str(tsconfig), "--pretty", "false",
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        process.kill()
+        await process.wait()
+        raise
+    result["seconds"] = round(time.perf_counter() - start, 2)
+
+    by_file, general = parse_tsc_output(stdout.decode("utf-8", errors="replace"), str(tsconfig.parent))
+    resolved = {str(Path(p).resolve()): p for p in spec_paths}
+    for path, diagnostics in by_file.items():
+        if path in resolved:
+            # Pfade so zurückgeben, wie sie übergeben wurden
+            result["files"][resolved[path]] = [d.model_copy(update={"file": resolved[path]}) for d in diagnostics]
+        else:
+            result["other"].extend(diagnostics)
+    result["other"].extend(general)
+
+    result["checked"] = True
+    failed = sum(1 for d in result["files"].values() if any(x.severity == "error" for x in d))
+    result["message"] = f"tsc checked {len(spec_paths)} specs in {result['seconds']}s, {failed} with errors"
+    return result
@@ -15,6 +15,7 @@ from src.tools.scan_site import scan_site
 from src.tools.extract_model import extract_model
 from src.tools.generate_pom import generate_pom
 from src.tools.generate_tests_ts import generate_tests_ts
+from src.core.browser_pool import get_browser_pool
 
 
 async def main():
@@ -53,7 +54,7 @@ async def main():
         from pathlib import Path as PathlibPath
         pom_path = PathlibPath(pom_result) if pom_result else None
         if pom_path and pom_path.exists():
-            test_result = generate_tests_ts(str(pom_path))
+            test_result = await generate_tests_ts(str(pom_path))
             print_success(f"Test file generated: {test_result}")
         else:
             print_success("POM file created successfully (test generation skipped)")
@@ -65,6 +66,9 @@ async def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        # Geteilten Browser schließen
+        await get_browser_pool().close()
     
     return 0
 
@@ -0,0 +1,87 @@
+"""Tests für den Capture-Cache."""
+
+import asyncio
+import threading
+
+from src.core.capture_cache import CaptureCache
+
+
+def test_disk_access_runs_off_the_event_loop(tmp_path):
+    cache = CaptureCache(directory=str(tmp_path))
+    threads = []
+    load, store = cache._load, cache._store
+    cache._load = lambda *a: threads.append(threading.current_thread()) or load(*a)
+    cache._store = lambda *a: threads.append(threading.current_thread()) or store(*a)
+
+    async def capture():
+        return {"dom": "<html></html>"}
+
+    async def main():
+        first = await cache.get_or_capture("https://example.com/", capture)
+        second = await cache.get_or_capture("https://example.com/", capture)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == second == {"dom": "<html></html>"}
+    assert len(threads) == 3 and threading.main_thread() not in threads
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_requests_share_one_capture(tmp_path):
+    cache = CaptureCache(directory=str(tmp_path))
+    calls = []
+
+    async def capture():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"dom": "x"}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_capture("https://example.com/", capture) for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"dom": "x"}] * 5
+    assert len(calls) == 1
+
+
+def test_cancelling_the_only_caller_cancels_the_capture(tmp_path):
+    cache = CaptureCache(directory=str(tmp_path))
+    started, cancelled = asyncio.Event(), []
+
+    async def capture():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return {"dom": "x"}
+
+    async def main():
+        caller = asyncio.create_task(cache.get_or_capture("https://example.com/", capture))
+        await started.wait()
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return list(cancelled)   # Vor dem Ende des Loops (der bricht offene Tasks selbst ab)
+
+    assert asyncio.run(main()) == [True]
+    assert not cache._inflight and not list(tmp_path.glob("*.json.gz"))
+
+
+def test_capture_keeps_running_while_other_callers_wait(tmp_path):
+    cache = CaptureCache(directory=str(tmp_path))
+    started = asyncio.Event()
+
+    async def capture():
+        started.set()
+        await asyncio.sleep(0.05)
+        return {"dom": "x"}
+
+    async def main():
+        first = asyncio.create_task(cache.get_or_capture("https://example.com/", capture))
+        second = asyncio.create_task(cache.get_or_capture("https://example.com/", capture))
+        await started.wait()
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == {"dom": "x"}
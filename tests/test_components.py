@@ -0,0 +1,28 @@
+"""Tests für gemeinsame Seiten-Komponenten."""
+
+from src.core.components import ComponentDetector, to_html
+from src.core.dom_reducer import parse_html
+
+
+def test_to_html_keeps_mixed_content_in_order():
+    html = '<p>Hello <b>world</b> and <a href="/x">link</a> bye</p>'
+    assert to_html(parse_html(html)) == html
+
+
+def test_to_html_round_trip_with_nested_and_void_elements():
+    html = ('<div>Name: <label for="n">Your <em>full</em> name</label><input id="n" name="n"> '
+            '(required)<ul><li>One</li><li>Two <b>2</b> end</li></ul>after</div>')
+    assert to_html(parse_html(html)) == html
+
+
+def test_strip_keeps_text_around_removed_components():
+    page = ('<body>Intro <header><a href="/">Home</a></header> middle '
+            '<main><p>See <a href="/a">this</a> now</p></main> end</body>')
+    detector = ComponentDetector(sample_pages=2)
+    detector.observe("https://example.com/a", page)
+    detector.observe("https://example.com/b", page)
+
+    dom, used = detector.strip(page)
+    assert [c.class_name for c in used] == ["HeaderComponent"]
+    assert used[0].html == '<header><a href="/">Home</a></header>'
+    assert dom == '<body>Intro  middle <main><p>See <a href="/a">this</a> now</p></main> end</body>'
@@ -0,0 +1,94 @@
+"""Tests für URL-Kanonisierung und Crawl-Grenzen."""
+
+import asyncio
+
+import pytest
+
+from src.core.crawler import SiteCrawler, canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://Example.COM/a#section", "https://example.com/a"),
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("https://example.com:8443/a", "https://example.com:8443/a"),
+    ("https://example.com/a/", "https://example.com/a"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/", "https://example.com/"),
+    ("https://example.com//a//b/", "https://example.com/a/b"),
+    ("https://example.com/s?b=2&a=1", "https://example.com/s?a=1&b=2"),
+    ("https://example.com/s?q=x&utm_source=mail&gclid=1", "https://example.com/s?q=x"),
+    ("https://user:pw@example.com/a", "https://example.com/a"),
+])
+def test_canonicalize(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["mailto:a@example.com", "javascript:void(0)", "ftp://example.com/", "https://"])
+def test_canonicalize_rejects_non_http(url):
+    assert canonicalize_url(url) is None
+
+
+def test_query_order_and_fragment_give_the_same_key():
+    assert canonicalize_url("https://example.com/p?b=2&a=1#top") == canonicalize_url("https://EXAMPLE.com:443/p/?a=1&b=2")
+
+
+# Kleine Website: jede Seite verlinkt zwei Unterseiten (Baum), dazu Duplikate und fremde Hosts
+SITE = {
+    "https://example.com/": ["/a", "/b", "/a#x", "https://other.com/", "mailto:x@example.com"],
+    "https://example.com/a": ["/a/1", "/a/2", "/"],
+    "https://example.com/b": ["/b/1", "/b/2?utm_source=x"],
+    "https://example.com/a/1": ["/deep"],
+    "https://example.com/a/2": [],
+    "https://example.com/b/1": [],
+    "https://example.com/b/2": [],
+}
+
+
+class FakeCrawler(SiteCrawler):
+    """Crawler ohne Browser: Links kommen aus SITE."""
+
+    def __init__(self, **kwargs):
+        super().__init__("https://example.com/", pool=object(), **kwargs)
+        self.fetched = []
+
+    async def _fetch_links(self, url):
+        self.fetched.append(url)
+        self.pages_fetched += 1
+        return [f"https://example.com{link}" if link.startswith("/") else link for link in SITE[url]]
+
+
+def _crawl(**kwargs):
+    crawler = FakeCrawler(**kwargs)
+
+    async def collect():
+        return [url async for url in crawler.crawl()]
+
+    return asyncio.run(collect()), crawler
+
+
+def test_depth_one_reports_only_links_of_the_start_page():
+    urls, crawler = _crawl(max_depth=1)
+    assert urls == ["https://example.com/a", "https://example.com/b"]
+    assert crawler.fetched == ["https://example.com/"]
+
+
+def test_depth_two_follows_links_level_by_level():
+    urls, crawler = _crawl(max_depth=2)
+    assert urls == [
+        "https://example.com/a", "https://example.com/b",
+        "https://example.com/a/1", "https://example.com/a/2", "https://example.com/", "https://example.com/b/1",
+        "https://example.com/b/2",
+    ]
+    assert crawler.fetched == ["https://example.com/", "https://example.com/a", "https://example.com/b"]
+
+
+def test_max_pages_stops_the_crawl():
+    urls, crawler = _crawl(max_depth=3, max_pages=3)
+    assert urls == ["https://example.com/a", "https://example.com/b", "https://example.com/a/1"]
+    assert "https://example.com/a/1" not in crawler.fetched
+
+
+def test_include_and_exclude_patterns():
+    urls, _ = _crawl(max_depth=2, include=["/a*", "/b*"], exclude=["*/2"])
+    assert urls == ["https://example.com/a", "https://example.com/b", "https://example.com/a/1", "https://example.com/b/1"]
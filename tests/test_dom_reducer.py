@@ -0,0 +1,45 @@
+"""Tests für den strukturellen Fingerabdruck (inkrementelle Läufe)."""
+
+from src.core.dom_reducer import reduce_dom, structure_fingerprint
+
+
+def _form(fields):
+    rows = "".join(
+        f'<div><label for="{name}">{name.title()}</label><input id="{name}" name="{name}" type="text"></div>'
+        for name in fields
+    )
+    return f"<html><head><title>Kontakt</title></head><body><main><form>{rows}<button>Senden</button></form></main></body></html>"
+
+
+def test_fingerprint_changes_when_third_and_fourth_field_are_added():
+    two = structure_fingerprint(_form(["name", "email"]))
+    three = structure_fingerprint(_form(["name", "email", "phone"]))
+    four = structure_fingerprint(_form(["name", "email", "phone", "company"]))
+    assert len({two, three, four}) == 3
+
+
+def test_fingerprint_changes_when_field_is_renamed():
+    assert structure_fingerprint(_form(["name", "email", "phone"])) != \
+        structure_fingerprint(_form(["name", "email", "mobile1"]))
+
+
+def test_fingerprint_changes_when_link_target_changes():
+    nav = '<nav><ul>' + "".join(f'<li><a href="/p{i}">Seite</a></li>' for i in range(4)) + '</ul></nav>'
+    assert structure_fingerprint(nav) != structure_fingerprint(nav.replace("/p3", "/p4"))
+
+
+def test_fingerprint_ignores_numbers_in_headings():
+    page = "<main><h2>{} Ergebnisse</h2><a href='/x'>Mehr</a></main>"
+    assert structure_fingerprint(page.format(12)) == structure_fingerprint(page.format(13))
+
+
+def test_outline_keeps_distinct_form_rows():
+    reduced = reduce_dom(_form(["name", "email", "phone", "company"]))
+    for name in ("name", "email", "phone", "company"):
+        assert f"input#{name}" in reduced.text
+    assert "more similar" not in reduced.text
+
+
+def test_outline_collapses_identical_rows():
+    rows = "".join("<li><a href='/item'>Details</a></li>" for _ in range(6))
+    assert "+4 more similar <li>" in reduce_dom(f"<ul>{rows}</ul>").text
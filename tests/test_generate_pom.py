@@ -0,0 +1,24 @@
+"""Tests für die POM-Generierung."""
+
+from pathlib import Path
+
+from src.tools.generate_pom import generate_pom
+
+
+MODEL = {
+    "url": "https://example.com/",
+    "elements": [{"name": "searchInput", "locator": {"strategy": "placeholder", "value": "Search"}, "actions": ["fill"]}],
+}
+
+
+def test_sync_pom_composes_shared_components(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = generate_pom("home_page", MODEL, use_ai=False,
+                        components={"header": "HeaderComponent", "footer": "FooterComponent"})
+
+    content = Path(path).read_text()
+    assert "from HeaderComponent import HeaderComponent" in content
+    assert "from FooterComponent import FooterComponent" in content
+    assert "self.header = HeaderComponent(page)" in content
+    assert "self.footer = FooterComponent(page)" in content
+    assert "self.searchInput" in content
@@ -0,0 +1,16 @@
+"""Tests für die regelbasierte UI-Extraktion."""
+
+from src.tools.heuristic_extract import heuristic_extract
+
+
+def test_keeps_all_fields_and_links():
+    rows = "".join(
+        f'<div><label for="{name}">{name.title()}</label><input id="{name}" name="{name}"></div>'
+        for name in ("name", "email", "phone", "company")
+    )
+    links = "".join(f'<li><a href="/{page}">{page.title()}</a></li>' for page in ("home", "shop", "blog", "about", "help"))
+    model = heuristic_extract("https://example.com/", f"<nav><ul>{links}</ul></nav><form>{rows}</form>")
+
+    names = [e["name"] for e in model["elements"]]
+    assert names[:5] == ["homeLink", "shopLink", "blogLink", "aboutLink", "helpLink"]
+    assert names[5:9] == ["nameInput", "emailInput", "phoneInput", "companyInput"]
@@ -0,0 +1,104 @@
+"""Tests für die Bereichs-Reparatur und die begrenzten Reparatur-Runden."""
+
+import asyncio
+from types import SimpleNamespace
+
+import src.core.pipeline as pipeline_module
+from src.core.config import TestGenerationConfig as GenerationConfig
+from src.core.pipeline import PlaywrightPipeline
+from src.core.schemas import Ctx, Diagnostic, PageJob
+from src.tools.repair import _clean_region, _regions, arepair_region
+
+
+def _error(line):
+    return Diagnostic(file="a.ts", line=line, column=1, code="TS2304", message=f"error in {line}")
+
+
+class ReplyLLM:
+    """LLM-Stub: liefert die Antworten der Reihe nach und merkt sich die Prompts."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=self.replies.pop(0))
+
+
+def _file(tmp_path, count=30):
+    path = tmp_path / "a.spec.ts"
+    path.write_text("\n".join(f"line{n}" for n in range(1, count + 1)))
+    return path
+
+
+def test_regions_merge_overlapping_and_adjacent():
+    regions = _regions([_error(10), _error(14), _error(30)], 60, 2)
+    assert [(start, end, [d.line for d in ds]) for start, end, ds in regions] == [(8, 16, [10, 14]), (28, 32, [30])]
+    # 8-12 und 13-17 grenzen aneinander
+    assert [(s, e) for s, e, _ in _regions([_error(10), _error(15)], 60, 2)] == [(8, 17)]
+    # Mit einer Zeile Abstand bleiben sie getrennt
+    assert [(s, e) for s, e, _ in _regions([_error(10), _error(16)], 60, 2)] == [(8, 12), (14, 18)]
+
+
+def test_regions_are_clamped_at_first_and_last_line():
+    assert [(s, e) for s, e, _ in _regions([_error(1), _error(30)], 30, 3)] == [(1, 4), (27, 30)]
+
+
+def test_regions_need_line_numbers():
+    assert _regions([Diagnostic(file="a.ts", code="TS1", message="x")], 30, 3) == []
+
+
+def test_clean_region_strips_fences_and_line_numbers():
+    assert _clean_region("```ts\n  const a = 1;\n```") == ["  const a = 1;"]
+    assert _clean_region("   12 |   const a = 1;\n   13 | }") == ["  const a = 1;", "}"]
+
+
+def test_splice_replaces_only_the_regions(tmp_path):
+    path = _file(tmp_path)
+    # Bereiche werden von hinten nach vorne repariert: zuerst 28-30, dann 1-3
+    llm = ReplyLLM("```ts\nfixed28\nfixed29\nfixed30\n```", "fixed1\nextra\nfixed2\nfixed3")
+    sent = asyncio.run(arepair_region(str(path), [_error(1), _error(30)], llm=llm, context_lines=2, use_cache=False))
+
+    assert sent == 2
+    assert "lines 28-30" in llm.prompts[0] and "lines 1-3" in llm.prompts[1]
+    lines = path.read_text().split("\n")
+    assert lines[:4] == ["fixed1", "extra", "fixed2", "fixed3"]
+    assert lines[4:-3] == [f"line{n}" for n in range(4, 28)]
+    assert lines[-3:] == ["fixed28", "fixed29", "fixed30"]
+
+
+def test_splice_merged_region_is_sent_once(tmp_path):
+    path = _file(tmp_path)
+    llm = ReplyLLM("merged")
+    sent = asyncio.run(arepair_region(str(path), [_error(10), _error(13)], llm=llm, context_lines=1, use_cache=False))
+
+    assert sent == 1 and "lines 9-14" in llm.prompts[0]
+    lines = path.read_text().split("\n")
+    assert lines[7:10] == ["line8", "merged", "line15"]
+    assert len(lines) == 30 - 6 + 1
+
+
+def test_repair_stops_after_max_attempts(tmp_path, monkeypatch):
+    config = GenerationConfig(repair_max_attempts=3, repair_context_lines=5, checkpoint_path=None)
+    pipeline = PlaywrightPipeline(config, llm=object())
+    calls = []
+
+    async def fake_repair(path, diagnostics, llm=None, context_lines=None, use_cache=True):
+        calls.append((context_lines, use_cache))
+        return 1
+
+    async def still_broken(state, paths):
+        return {path: [_error(5)] for path in paths}
+
+    monkeypatch.setattr(pipeline_module, "arepair_region", fake_repair)
+    monkeypatch.setattr(pipeline, "_reverify", still_broken)
+    state = Ctx(base_url="https://example.com/", jobs={"u": PageJob(url="u", errors=["Type check failed"])})
+
+    asyncio.run(pipeline._repair_jobs(state, {"u": {"a.spec.ts": [_error(5)]}}))
+
+    # Kontext verdoppelt sich, der letzte Versuch repariert die ganze Datei; nur der erste nutzt den Cache
+    assert calls == [(5, config.use_llm_cache), (10, False), (None, False)]
+    job = state.jobs["u"]
+    assert job.repair_attempts == 3
+    assert job.errors[-1].startswith("Repair failed after 3 attempts")
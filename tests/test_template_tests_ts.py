@@ -0,0 +1,28 @@
+"""Tests für die template-basierten Specs (ohne LLM)."""
+
+from src.tools.heuristic_extract import heuristic_extract
+from src.tools.template_tests_ts import render_template_tests
+
+
+FIELDS = (("name", "text"), ("email", "email"), ("phone", "tel"), ("company", "text"), ("website", "url"))
+
+
+def _model():
+    rows = "".join(
+        f'<div><label for="{name}">{name.title()}</label><input id="{name}" name="{name}" type="{kind}" required></div>'
+        for name, kind in FIELDS
+    )
+    html = f"<html><head><title>Kontakt</title></head><body><form>{rows}<button type='submit'>Senden</button></form></body></html>"
+    return heuristic_extract("https://example.com/contact", html)
+
+
+def test_spec_visits_and_fills_every_field():
+    spec = render_template_tests("ContactPage", _model(), include_error_cases=True, max_tests=10)
+
+    for name, _ in FIELDS:
+        locator = f"page.getByLabel(\"{name.title()}\").first()"
+        assert f"await expect({locator}).toBeVisible();" in spec
+        assert f"await {locator}.fill(" in spec
+        assert f"await {locator}.fill('');" in spec
+    assert "test@example.com" in spec and "+49123456789" in spec
+    assert spec.count("checkValidity()") == len(FIELDS) + 2   # Pflichtfelder + ungültige E-Mail/URL
@@ -0,0 +1,57 @@
+"""Tests für die Zuordnung der tsc-Befunde zu den Specs."""
+
+import asyncio
+import sys
+
+from src.tools import verify_tests_ts as verify
+from src.tools.verify_tests_ts import parse_tsc_output, verify_tests_ts
+
+
+# Ausgabe von `tsc -p out/.cache/tsc/tsconfig.specs.json --noEmit --pretty false`
+TSC_OUTPUT = """\
+out/TESTS/loginpage.spec.ts(12,9): error TS2339: Property 'submitButon' does not exist on type 'LoginPage'.
+out/TESTS/loginpage.spec.ts(20,5): error TS2345: Argument of type 'number' is not assignable to parameter of type 'string'.
+../../TESTS/homepage.spec.ts(3,1): error TS2304: Cannot find name 'describe'.
+node_modules/@playwright/test/index.d.ts(1,1): warning TS6133: 'x' is declared but its value is never read.
+error TS2688: Cannot find type definition file for 'node'.
+  The file is in the program because:
+    Entry point for implicit type library 'node'
+"""
+
+
+def _project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "out" / "TESTS").mkdir(parents=True)
+    for name in ("loginpage", "homepage", "searchpage"):
+        (tmp_path / "out" / "TESTS" / f"{name}.spec.ts").write_text("import { test } from '@playwright/test';\n")
+    (tmp_path / "tsconfig.json").write_text("{}")
+    return [f"out/TESTS/{name}.spec.ts" for name in ("loginpage", "homepage", "searchpage")]
+
+
+def test_parse_maps_paths_relative_to_cwd_and_to_derived_tsconfig(tmp_path, monkeypatch):
+    _project(tmp_path, monkeypatch)
+    by_file, general = parse_tsc_output(TSC_OUTPUT, str(tmp_path / "out" / ".cache" / "tsc"))
+
+    login = str(tmp_path / "out" / "TESTS" / "loginpage.spec.ts")
+    home = str(tmp_path / "out" / "TESTS" / "homepage.spec.ts")
+    assert [(d.line, d.column, d.code) for d in by_file[login]] == [(12, 9, "TS2339"), (20, 5, "TS2345")]
+    assert [d.code for d in by_file[home]] == ["TS2304"]
+    assert [d.code for d in general] == ["TS2688"]
+    assert general[0].message.endswith("Entry point for implicit type library 'node'")
+
+
+def test_verify_assigns_diagnostics_to_the_right_spec(tmp_path, monkeypatch):
+    specs = _project(tmp_path, monkeypatch)
+    script = tmp_path / "fake_tsc.py"
+    script.write_text(f"print({TSC_OUTPUT!r}, end='')\nraise SystemExit(2)\n")
+    monkeypatch.setattr(verify, "find_tsc", lambda: [sys.executable, str(script)])
+
+    result = asyncio.run(verify_tests_ts(specs))
+
+    assert result["checked"]
+    login, home, search = (result["files"][p] for p in specs)
+    assert [d.code for d in login] == ["TS2339", "TS2345"] and all(d.file == specs[0] for d in login)
+    assert [d.code for d in home] == ["TS2304"] and home[0].file == specs[1]
+    assert search == []
+    assert sorted(d.code for d in result["other"]) == ["TS2688", "TS6133"]
+    assert "2 with errors" in result["message"]